@@ -0,0 +1,78 @@
+"""
+Benchmark: full parse + aggregation of a large time_log.txt,
+pure-Python line parser vs. the NumPy bulk path.
+
+Run from the repository root:
+    python benchmarks/bench_log_parsing.py [number_of_lines]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.time_logger import TimeLogger
+from src import log_numpy
+
+
+class BenchSettings:
+    """
+    The subset of AppSettings that TimeLogger needs, pointing at a temporary folder.
+    """
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.standart_work_day = 450
+        self.standart_days_in_week = 5
+
+
+def write_log(path, n_lines, n_tasks=500):
+    random.seed(42)
+    tasks = [f"Task {i}" for i in range(n_tasks)]
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n_lines):
+            start = random.randrange(0, 23 * 4) * 15
+            f.write(
+                f"20{random.randint(18, 25)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d} "
+                f"{start // 60:02d}:{start % 60:02d} - {(start + 15) // 60:02d}:{(start + 15) % 60:02d} "
+                f"| {random.choice(tasks)}\n"
+            )
+
+
+def time_parse(data_folder, use_numpy):
+    snapshot_path = os.path.join(data_folder, "time_log.cache")
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+    TimeLogger.use_numpy = use_numpy
+    started = time.perf_counter()
+    logger = TimeLogger(BenchSettings(data_folder))
+    logger.get_logged_minutes_per_week()
+    return time.perf_counter() - started, logger
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as data_folder:
+        write_log(os.path.join(data_folder, "time_log.txt"), n_lines)
+
+        python_seconds, python_logger = time_parse(data_folder, use_numpy=False)
+        print(f"{n_lines} lines, pure Python: {python_seconds:.2f}s")
+
+        if not log_numpy.is_available():
+            print("NumPy is not installed; skipping the bulk path.")
+            return
+
+        numpy_seconds, numpy_logger = time_parse(data_folder, use_numpy=True)
+        print(f"{n_lines} lines, NumPy:       {numpy_seconds:.2f}s ({python_seconds / numpy_seconds:.1f}x faster)")
+
+        same = (
+            python_logger.get_logged_minutes_per_week() == numpy_logger.get_logged_minutes_per_week()
+            and python_logger._index.task_minutes == numpy_logger._index.task_minutes
+            and python_logger._index.date_task_minutes == numpy_logger._index.date_task_minutes
+        )
+        print("Results identical:", same)
+
+
+if __name__ == "__main__":
+    main()
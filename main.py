@@ -1,15 +1,19 @@
+import time
 import tkinter as tk
-import datetime
+import multiprocessing
 from PIL import Image, ImageTk
 
 from src.time_logger import TimeLogger
+from src.sqlite_time_logger import SqliteTimeLogger
+from src.partitioned_time_logger import PartitionedTimeLogger
 from src.main_ui import MainUI
+from src.log_watcher import LogWatcher
+from src.popup_scheduler import PopupScheduler
 from src.popup_window import PopupWindow
 from src.utils import next_quarter_hour, resource_path
 from src.settings_manager import AppSettings
 from src.settings_window import SettingsWindow
 import winsound
-from croniter import croniter
 
 """
 The main entry point for the wogger application.
@@ -33,7 +37,21 @@ class WoggerApp:
         self.settings = AppSettings()
 
         # Create the time-logger
-        self.logger = TimeLogger(self.settings)
+        if self.settings.storage_backend == "sqlite":
+            self.logger = SqliteTimeLogger(self.settings)
+        elif self.settings.log_layout == "monthly":
+            self.logger = PartitionedTimeLogger(self.settings)
+        else:
+            self.logger = TimeLogger(self.settings)
+
+        # The popup is built once, hidden, and only shown when an interval ends
+        self.popup = PopupWindow(
+            parent=self.root,
+            suggest_tasks=self.logger.suggest_tasks,
+            on_submit=self._on_popup_submit
+        )
+        # Build the task suggestion index once the window is up, not when the first popup shows
+        self.root.after_idle(self.logger.suggest_tasks)
 
         # Create the main UI
         self.ui = MainUI(
@@ -44,11 +62,16 @@ class WoggerApp:
             app_settings=self.settings
         )
 
+        # Pick up hand edits of the log file without the refresh button; the UI follows the logger's events
+        self.watcher = LogWatcher(self.root, self.logger)
+        self.watcher.start()
+
         # Update the Wogger GIF based on the current setting
         self.update_wogger_gif()
 
-        # Schedule the first popup
-        self.schedule_next_popup()
+        # Show a popup for every interval of the popup cron expression, catching up after sleep
+        self.scheduler = PopupScheduler(self.root, lambda: self.settings.popup_cron, on_fire=self.show_popup)
+        self.scheduler.start()
 
     def update_wogger_gif(self):
         """
@@ -110,11 +133,10 @@ class WoggerApp:
 
     def on_reset_log(self):
         """
-        When the trash button is clicked, reset the log in the logger
-        and refresh the UI.
+        When the trash button is clicked, reset the log in the logger.
+        The UI refreshes itself on the LogReset event.
         """
         self.logger.reset_time_log()
-        self.ui.refresh_main_tree()
     
     def on_settings_click(self):
         """
@@ -122,49 +144,31 @@ class WoggerApp:
         """
         SettingsWindow(self, self.settings, self.ui)
 
-    def schedule_next_popup(self):
-        """
-        Schedules the next popup based on the cron expression in settings.popup_cron.
+    def show_popup(self, interval_start, interval_end):
         """
-        now = datetime.datetime.now()
-        cron_expr = self.settings.popup_cron  # e.g., "0,15,30,45 * * * *"
-        cron_iter = croniter(cron_expr, now)
-        next_popup_time = cron_iter.get_next(datetime.datetime)
-        delta_ms = int((next_popup_time - now).total_seconds() * 1000)
-        self.root.after(delta_ms, lambda: self.show_popup_and_reschedule(next_popup_time))
-
-    def show_popup_and_reschedule(self, interval_end):
+        Shows a popup for the interval from interval_start to interval_end. After a suspend
+        the scheduler reports all missed intervals as one range. If the last popup is still
+        unanswered, the interval is added to it instead of opening another one.
         """
-        Shows a popup for the interval from the previous scheduled time up to interval_end,
-        then schedules the next popup.
-        """
-        # Schedule the next popup immediately (so it's always queued)
-        self.schedule_next_popup()
-
-        # Compute the previous scheduled time using croniter.
-        cron_expr = self.settings.popup_cron
-        cron_iter = croniter(cron_expr, interval_end)
-        interval_start = cron_iter.get_prev(datetime.datetime)
-
-        PopupWindow(
-            parent=self.root,
-            interval_start=interval_start,
-            interval_end=interval_end,
-            known_tasks=self.logger.get_all_tasks(),
-            on_submit=self._on_popup_submit
-        )
+        fired_at = time.perf_counter()
+        # The single intervals of a catch-up range, so the popup can split it
+        interval_ends = self.scheduler.interval_ends(interval_start, interval_end)
+        self.popup.show(interval_start, interval_ends, fired_at=fired_at)
 
     def _on_popup_submit(self, task_name, interval_start, interval_end):
         """
         Handler when user clicks "Submit" in the popup.
         """
         self.logger.log_work_item(task_name, interval_start, interval_end)
-        self.ui.refresh_main_tree()
 
     def on_main_window_close(self):
         """
         Closes the main window and stops the entire application (including popups).
         """
+        self.scheduler.stop()
+        self.watcher.stop()
+        self.ui.cancel_export(wait=True)
+        self.logger.close()
         self.root.destroy()
 
     def run(self):
@@ -172,5 +176,7 @@ class WoggerApp:
 
 
 if __name__ == "__main__":
+    # Needed for the worker processes of the parallel log parser in the PyInstaller build.
+    multiprocessing.freeze_support()
     app = WoggerApp()
     app.run()
@@ -0,0 +1,125 @@
+import tkinter as tk
+from tkinter import filedialog
+
+# Delay (ms) after the last keystroke before the pasted lines are validated again.
+VALIDATE_DELAY_MS = 300
+# How many bad lines are listed in the window; the rest are only counted.
+MAX_LISTED_BAD_LINES = 20
+
+
+class BulkImportWindow:
+    """
+    A window for importing many lines at once (pasted or loaded from a file), each in the format:
+       YYYY-MM-DD HH:MM - HH:MM | Task Name
+    All lines are validated together and the bad ones are listed; the valid ones are
+    written with one append via TimeLogger.import_lines().
+    """
+    def __init__(self, parent, time_logger, on_save_callback):
+        """
+        :param parent: The parent (a Tk or Toplevel)
+        :param time_logger: An instance of TimeLogger
+        :param on_save_callback: A function that receives True/False indicating whether lines were imported
+        """
+        self.parent = parent
+        self.time_logger = time_logger
+        self.on_save_callback = on_save_callback
+        self._validate_job = None
+
+        self.top = tk.Toplevel(self.parent)
+        self.top.title("Import Log Lines")
+
+        self._build_ui()
+        self._validate()
+
+    def _build_ui(self):
+        tk.Label(
+            self.top,
+            text="Paste or load lines in the format:\nYYYY-MM-DD HH:MM - HH:MM | Some Task",
+            justify="left"
+        ).pack(anchor="w", padx=10, pady=(10, 5))
+
+        text_frame = tk.Frame(self.top)
+        text_frame.pack(fill="both", expand=True, padx=10)
+
+        self.text = tk.Text(text_frame, width=60, height=15, wrap="none", undo=True)
+        self.text.pack(side="left", fill="both", expand=True)
+        scrollbar = tk.Scrollbar(text_frame, orient="vertical", command=self.text.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.text.configure(yscrollcommand=scrollbar.set)
+        self.text.bind("<<Modified>>", self._on_text_modified)
+        self.text.focus_set()
+
+        self.status_label = tk.Label(self.top, text="", justify="left", anchor="w", fg="red")
+        self.status_label.pack(fill="x", padx=10, pady=(5, 0))
+
+        btn_frame = tk.Frame(self.top)
+        btn_frame.pack(padx=10, pady=10, fill="x")
+
+        self.import_btn = tk.Button(btn_frame, text="Import", command=self.on_import, state=tk.DISABLED)
+        self.import_btn.pack(side="left")
+
+        load_btn = tk.Button(btn_frame, text="Load File...", command=self.on_load_file)
+        load_btn.pack(side="left", padx=(10, 0))
+
+        cancel_btn = tk.Button(btn_frame, text="Cancel", command=self.on_cancel)
+        cancel_btn.pack(side="left", padx=(10, 0))
+
+    def _get_lines(self):
+        return self.text.get("1.0", "end-1c").splitlines()
+
+    def _on_text_modified(self, event=None):
+        """
+        Re-validates shortly after the text stops changing, so typing stays fast for long texts.
+        """
+        self.text.edit_modified(False)
+        if self._validate_job is not None:
+            self.top.after_cancel(self._validate_job)
+        self._validate_job = self.top.after(VALIDATE_DELAY_MS, self._validate)
+
+    def _validate(self):
+        self._validate_job = None
+        valid, bad = self.time_logger.validate_lines(self._get_lines())
+
+        status_lines = [f"Line {line_number}: {reason}  ({line})" for line_number, line, reason in bad[:MAX_LISTED_BAD_LINES]]
+        if len(bad) > MAX_LISTED_BAD_LINES:
+            status_lines.append(f"... and {len(bad) - MAX_LISTED_BAD_LINES} more bad lines")
+        self.status_label.config(text="\n".join(status_lines))
+
+        if valid:
+            label = f"Import {len(valid)} line{'s' if len(valid) != 1 else ''}"
+            if bad:
+                label += f" (skip {len(bad)} bad)"
+            self.import_btn.config(text=label, state=tk.NORMAL)
+        else:
+            self.import_btn.config(text="Import", state=tk.DISABLED)
+
+    def on_load_file(self):
+        """
+        Replaces the text with the content of a file chosen by the user.
+        """
+        path = filedialog.askopenfilename(
+            parent=self.top,
+            title="Load Log Lines",
+            filetypes=[("Text files", "*.txt *.log *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read()
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", content)
+
+    def on_import(self):
+        """
+        Imports the valid lines with one append and closes.
+        """
+        imported, _ = self.time_logger.import_lines(self._get_lines())
+        self.on_save_callback(imported > 0)
+        self.top.destroy()
+
+    def on_cancel(self):
+        """
+        Close without importing.
+        """
+        self.on_save_callback(False)
+        self.top.destroy()
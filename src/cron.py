@@ -0,0 +1,224 @@
+"""
+A small cron evaluator for the popup schedule (settings.popup_cron).
+An expression is compiled once into one bitset per field; next and previous fire
+times are then found with a few bit operations per day instead of stepping minute by minute.
+Supports the five standard fields with *, lists, ranges, steps (*/15, 8-17/2) and
+month/weekday names (jan, mon). Like vixie cron, a fire time must match both the
+day-of-month and the day-of-week field, unless both are restricted: then either may match.
+"""
+import datetime
+import functools
+
+FIELD_NAMES = ("minute", "hour", "day-of-month", "month", "day-of-week")
+_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+_MONTH_NAMES = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+)}
+_WEEKDAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+# Longest days per month (February counts 29), used to reject dates that never exist.
+_MAX_MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# How many days next() and prev() search before giving up (covers a leap day).
+_MAX_SEARCH_DAYS = 366 * 8
+_ONE_MINUTE = datetime.timedelta(minutes=1)
+
+
+class CronError(ValueError):
+    """
+    Raised for an invalid cron expression; the message says which field is wrong and why.
+    """
+
+
+def _is_number(text):
+    # str.isdigit() alone also accepts digits like "²" that int() cannot parse.
+    return text.isascii() and text.isdigit()
+
+
+def _parse_value(text, field_index):
+    names = _MONTH_NAMES if field_index == 3 else _WEEKDAY_NAMES if field_index == 4 else {}
+    if text.lower() in names:
+        return names[text.lower()]
+    if not _is_number(text):
+        raise CronError(f"{FIELD_NAMES[field_index]}: '{text}' is not a number")
+    low, high = _FIELD_RANGES[field_index]
+    value = int(text)
+    if not low <= value <= high:
+        raise CronError(f"{FIELD_NAMES[field_index]}: {value} is out of range {low}-{high}")
+    return value
+
+
+def _parse_field(text, field_index):
+    """
+    Returns the bitset of one field: bit n is set if the field matches value n.
+    """
+    low, high = _FIELD_RANGES[field_index]
+    bits = 0
+    for part in text.split(","):
+        if not part:
+            raise CronError(f"{FIELD_NAMES[field_index]}: empty list item in '{text}'")
+        base, _, step_text = part.partition("/")
+        step = 1
+        if step_text:
+            if not _is_number(step_text) or int(step_text) == 0:
+                raise CronError(f"{FIELD_NAMES[field_index]}: step '{step_text}' must be a positive number")
+            step = int(step_text)
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, _, end_text = base.partition("-")
+            start, end = _parse_value(start_text, field_index), _parse_value(end_text, field_index)
+            if start > end:
+                raise CronError(f"{FIELD_NAMES[field_index]}: range {base} goes backwards")
+        else:
+            start = _parse_value(base, field_index)
+            end = high if step_text else start  # "5/10" means from 5 to the end in steps of 10
+        for value in range(start, end + 1, step):
+            bits |= 1 << value
+    if field_index == 4 and bits & (1 << 7):
+        bits = (bits | 1) & ~(1 << 7)  # 7 is Sunday, like 0
+    return bits
+
+
+def _lowest_bit_from(bits, value):
+    """
+    Returns the smallest set bit >= value, or None.
+    """
+    bits >>= value
+    if not bits:
+        return None
+    return value + (bits & -bits).bit_length() - 1
+
+
+def _highest_bit_upto(bits, value):
+    """
+    Returns the largest set bit <= value, or None.
+    """
+    bits &= (2 << value) - 1
+    if not bits:
+        return None
+    return bits.bit_length() - 1
+
+
+class CronSchedule:
+    """
+    A compiled cron expression. Use parse_cron() to get one.
+    """
+
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise CronError(
+                f"Expected 5 fields ({' '.join(FIELD_NAMES)}), got {len(fields)}"
+            )
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(text, i) for i, text in enumerate(fields)
+        )
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+        if not self._any_day and self._any_weekday and not any(
+            self.months & (1 << month) and _lowest_bit_from(self.days, 1) <= _MAX_MONTH_DAYS[month - 1]
+            for month in range(1, 13)
+        ):
+            raise CronError("day-of-month: none of the days exists in any of the months, so it never fires")
+
+    def matches_day(self, date):
+        if not self.months & (1 << date.month):
+            return False
+        day_ok = self.days & (1 << date.day)
+        weekday_ok = self.weekdays & (1 << (date.weekday() + 1) % 7)  # cron counts from Sunday = 0
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def _first_time_from(self, hour, minute):
+        """
+        Returns the first (hour, minute) on a matching day at or after hour:minute, or None.
+        """
+        h = _lowest_bit_from(self.hours, hour)
+        if h == hour:
+            m = _lowest_bit_from(self.minutes, minute)
+            if m is not None:
+                return h, m
+            h = _lowest_bit_from(self.hours, hour + 1)
+        if h is None:
+            return None
+        return h, _lowest_bit_from(self.minutes, 0)
+
+    def _last_time_upto(self, hour, minute):
+        """
+        Returns the last (hour, minute) on a matching day at or before hour:minute, or None.
+        """
+        h = _highest_bit_upto(self.hours, hour)
+        if h == hour:
+            m = _highest_bit_upto(self.minutes, minute)
+            if m is not None:
+                return h, m
+            h = _highest_bit_upto(self.hours, hour - 1) if hour else None
+        if h is None:
+            return None
+        return h, _highest_bit_upto(self.minutes, 59)
+
+    def next(self, after):
+        """
+        Returns the first fire time strictly after the datetime after.
+        """
+        t = after.replace(second=0, microsecond=0) + _ONE_MINUTE
+        date, hour, minute = t.date(), t.hour, t.minute
+        for _ in range(_MAX_SEARCH_DAYS):
+            if self.matches_day(date):
+                found = self._first_time_from(hour, minute)
+                if found is not None:
+                    return datetime.datetime.combine(date, datetime.time(*found))
+            date += datetime.timedelta(days=1)
+            hour = minute = 0
+        raise CronError(f"'{self.expr}' does not fire within {_MAX_SEARCH_DAYS} days")
+
+    def prev(self, before):
+        """
+        Returns the last fire time strictly before the datetime before.
+        """
+        t = before.replace(second=0, microsecond=0)
+        if t == before:
+            t -= _ONE_MINUTE
+        date, hour, minute = t.date(), t.hour, t.minute
+        for _ in range(_MAX_SEARCH_DAYS):
+            if self.matches_day(date):
+                found = self._last_time_upto(hour, minute)
+                if found is not None:
+                    return datetime.datetime.combine(date, datetime.time(*found))
+            date -= datetime.timedelta(days=1)
+            hour, minute = 23, 59
+        raise CronError(f"'{self.expr}' did not fire within {_MAX_SEARCH_DAYS} days")
+
+    def fire_times(self, start, end):
+        """
+        Yields every fire time t with start < t <= end, in order.
+        """
+        t = self.next(start)
+        while t <= end:
+            yield t
+            t = self.next(t)
+
+    def count_fire_times(self, start, end):
+        """
+        Returns how many fire times there are with start < t <= end.
+        """
+        return sum(1 for _ in self.fire_times(start, end))
+
+    def fires_per_week(self):
+        """
+        Returns the expected number of popups per week: the fire times of the
+        week starting next Monday.
+        """
+        today = datetime.date.today()
+        monday = datetime.datetime.combine(today + datetime.timedelta(days=7 - today.weekday()), datetime.time())
+        return self.count_fire_times(monday - _ONE_MINUTE, monday + datetime.timedelta(days=7) - _ONE_MINUTE)
+
+
+@functools.lru_cache(maxsize=16)
+def parse_cron(expr):
+    """
+    Compiles expr into a CronSchedule (cached). Raises CronError if it is invalid.
+    """
+    return CronSchedule(expr)
@@ -0,0 +1,56 @@
+import threading
+from src.log_export import ExportCancelled
+
+
+class ExportJob:
+    """
+    Runs TimeLogger.export_time_log() on a worker thread so the Tk event loop stays responsive.
+    The Tk thread polls rows_written, bytes_written and done (e.g. with root.after) instead of
+    waiting; cancel() stops the export at its next progress report and removes the partial file.
+    """
+
+    def __init__(self, time_logger, **export_kwargs):
+        """
+        :param time_logger: A TimeLogger instance
+        :param export_kwargs: passed on to time_logger.export_time_log()
+        """
+        self.time_logger = time_logger
+        self.export_kwargs = export_kwargs
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.export_path = None  # set once the export finished
+        self.error = None        # the exception that ended the export, if any
+        self.cancelled = False
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="wogger-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def done(self):
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def _progress(self, rows_written, bytes_written):
+        if self._cancel_event.is_set():
+            raise ExportCancelled()
+        self.rows_written = rows_written
+        self.bytes_written = bytes_written
+
+    def _run(self):
+        try:
+            self.export_path = self.time_logger.export_time_log(progress=self._progress, **self.export_kwargs)
+        except ExportCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
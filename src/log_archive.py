@@ -0,0 +1,202 @@
+"""
+The archived time logs that reset_time_log() leaves behind (time_log.txt.bakYYYYMMDDHHMM,
+and time_log-YYYY-MM.txt.bak... in the monthly layout), indexed for "all history" queries.
+The archives are only parsed when all-history queries are first made. Parsed archives are cached in
+time_log_archive.cache, keyed by file size and mtime, so later starts do not parse them again.
+"""
+import os
+import re
+from itertools import chain
+from src.log_index import LogIndex
+from src.log_line_parser import parse_log_line
+from src import log_parallel
+from src import log_snapshot
+
+ARCHIVE_CACHE_FILE_NAME = "time_log_archive.cache"
+ARCHIVE_CACHE_VERSION = 2
+ARCHIVE_CACHE_MAGIC = b"WOGARCH"
+_ARCHIVE_PATTERN = re.compile(r"time_log(?:-[0-9]{4}-[0-9]{2})?\.txt\.bak([0-9]*)")
+
+
+def find_archive_files(data_folder):
+    """
+    Returns the names of the archived logs in data_folder, oldest backup first.
+    """
+    try:
+        names = os.listdir(data_folder)
+    except OSError:
+        return []
+    archives = []
+    for name in names:
+        match = _ARCHIVE_PATTERN.fullmatch(name)
+        if match:
+            archives.append((match.group(1), name))
+    return [name for _, name in sorted(archives)]
+
+
+class LogArchive:
+    """
+    One LogIndex over every archived log in data_folder, built on first use.
+    """
+
+    use_numpy = True
+    use_parallel_parse = True
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self._index = None  # merged LogIndex, None until needed or after invalidate()
+
+    def _get_cache_path(self):
+        return os.path.join(self.data_folder, ARCHIVE_CACHE_FILE_NAME)
+
+    def invalidate(self):
+        """
+        Forgets the merged index; the next query looks for added or removed archives.
+        Unchanged archives are taken from the cache and not parsed again.
+        """
+        self._index = None
+
+    def get_index(self):
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def _load_cache(self):
+        """
+        Returns { file name: (size, mtime, to_snapshot() data) } from the cache file,
+        or {} if there is none or it is damaged.
+        """
+        try:
+            files, index_datas = log_snapshot.read_data_file(
+                self._get_cache_path(), ARCHIVE_CACHE_MAGIC + bytes([ARCHIVE_CACHE_VERSION])
+            )
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(files, list) or len(files) != len(index_datas):
+            return {}
+        cache = {}
+        for record, data in zip(files, index_datas):
+            if not (isinstance(record, list) and len(record) == 3 and isinstance(record[0], str)
+                    and type(record[1]) is int and type(record[2]) is int):
+                return {}
+            name, size, mtime = record
+            cache[name] = (size, mtime, data)
+        return cache
+
+    def _save_cache(self, cache):
+        files = [[name, size, mtime] for name, (size, mtime, _) in cache.items()]
+        try:
+            log_snapshot.write_data_file(
+                self._get_cache_path(),
+                ARCHIVE_CACHE_MAGIC + bytes([ARCHIVE_CACHE_VERSION]),
+                files,
+                [data for _, _, data in cache.values()]
+            )
+        except OSError:
+            pass
+
+    def _build_index(self):
+        """
+        Merges the cached or freshly parsed index of every archive, oldest first.
+        """
+        cache = self._load_cache()  # { file name: (size, mtime, to_snapshot() data) }
+        keys = {}
+        for name in find_archive_files(self.data_folder):
+            try:
+                st = os.stat(os.path.join(self.data_folder, name))
+            except OSError:
+                continue
+            keys[name] = (st.st_size, st.st_mtime_ns)
+
+        stale = [name for name, key in keys.items() if cache.get(name, (None, None))[:2] != key]
+        if stale:
+            for name, data in zip(stale, self._parse_files(stale)):
+                cache[name] = keys[name] + (data,)
+        if stale or set(cache) != set(keys):
+            cache = {name: cache[name] for name in keys}
+            self._save_cache(cache)
+
+        index = LogIndex()
+        for name in keys:
+            index.merge_snapshot(cache[name][2])
+        return index
+
+    def _parse_files(self, names):
+        """
+        Returns the to_snapshot() data of every named archive, parsed in worker processes when there are several.
+        """
+        paths = [os.path.join(self.data_folder, name) for name in names]
+        if self.use_parallel_parse and len(paths) > 1 and log_parallel.worker_count() > 1:
+            results = log_parallel.parse_files_parallel(paths, parse_log_line, self.use_numpy)
+            if results is not None:
+                return results
+        return [
+            log_parallel.parse_chunk(path, 0, os.path.getsize(path), parse_log_line, self.use_numpy)
+            for path in paths
+        ]
+
+
+class HistoryIndex:
+    """
+    Answers the LogIndex queries over several indexes at once (the archives and the live log),
+    adding up their totals.
+    """
+
+    def __init__(self, indexes):
+        self._indexes = indexes
+
+    def tasks(self):
+        tasks = {}
+        for index in self._indexes:
+            tasks.update(dict.fromkeys(index.tasks()))
+        return tasks.keys()
+
+    def total_minutes(self):
+        return sum(index.total_minutes() for index in self._indexes)
+
+    def minutes_for_task(self, task_name):
+        return sum(index.minutes_for_task(task_name) for index in self._indexes)
+
+    def task_totals(self):
+        totals = {}
+        for index in self._indexes:
+            for name, minutes in index.task_totals().items():
+                totals[name] = totals.get(name, 0) + minutes
+        return totals
+
+    def task_last_dates(self):
+        last_dates = {}
+        for index in self._indexes:
+            for name, date_ordinal in index.task_last_dates().items():
+                if date_ordinal > last_dates.get(name, date_ordinal - 1):
+                    last_dates[name] = date_ordinal
+        return last_dates
+
+    def minutes_for_task_ci(self, task_name):
+        return sum(index.minutes_for_task_ci(task_name) for index in self._indexes)
+
+    def minutes_for_date(self, date_str):
+        return sum(index.minutes_for_date(date_str) for index in self._indexes)
+
+    def tasks_for_date(self, date_str):
+        return set().union(*(index.tasks_for_date(date_str) for index in self._indexes))
+
+    def minutes_for_date_and_task(self, date_str, task_name):
+        return sum(index.minutes_for_date_and_task(date_str, task_name) for index in self._indexes)
+
+    def minutes_by_date(self, first_ordinal, last_ordinal):
+        days = {}
+        for index in self._indexes:
+            for date_ordinal, minutes in index.minutes_by_date(first_ordinal, last_ordinal).items():
+                days[date_ordinal] = days.get(date_ordinal, 0) + minutes
+        return days
+
+    def minutes_by_week(self):
+        weeks = {}
+        for index in self._indexes:
+            for monday, minutes in index.minutes_by_week().items():
+                weeks[monday] = weeks.get(monday, 0) + minutes
+        return weeks
+
+    def iter_entries(self):
+        return chain.from_iterable(index.iter_entries() for index in self._indexes)
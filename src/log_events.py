@@ -0,0 +1,28 @@
+"""
+Change events that TimeLogger publishes to its subscribers (see TimeLogger.subscribe).
+"""
+from collections import namedtuple
+
+
+class EntriesAppended(namedtuple("EntriesAppended", ["entries"])):
+    """
+    New entries were written (by a popup, a manual entry or an import).
+    entries is a list of LogEntry objects in the order they were written.
+    """
+    __slots__ = ()
+
+
+class LogReloaded(namedtuple("LogReloaded", ["appended"], defaults=[None])):
+    """
+    The log was re-read from disk (e.g. after a hand edit).
+    If lines were only appended to it, appended is the list of LogEntry objects read from them;
+    otherwise appended is None and the log may have changed in any way.
+    """
+    __slots__ = ()
+
+
+class LogReset(namedtuple("LogReset", [])):
+    """
+    The log was moved to a backup by reset_time_log(); it is empty now.
+    """
+    __slots__ = ()
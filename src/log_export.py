@@ -0,0 +1,280 @@
+"""
+Streaming export of time log entries.
+Entries are read from the log files line by line, filtered and written one row at a time,
+so memory use does not grow with the size of the log.
+Incremental exports remember in a watermark file how far every log file was exported
+and only write the rows added since; every combination of filters has a watermark of its own.
+"""
+import os
+import io
+import csv
+import gzip
+import json
+import hashlib
+import datetime
+from src.log_line_parser import parse_log_line, date_str_to_ordinal
+from src.log_snapshot import prefix_hash
+
+# Export format -> file extension
+EXPORT_FORMATS = {
+    "csv": "csv",
+    "csv.gz": "csv.gz",
+    "jsonl": "jsonl",
+}
+
+CSV_HEADER = ["Date", "Day", "Start Time", "End Time", "Duration (min)", "Task"]
+JSON_KEYS = ["date", "day", "start_time", "end_time", "duration", "task"]
+
+# How often (in rows) write_rows() reports progress.
+PROGRESS_EVERY_ROWS = 1000
+
+WATERMARK_FILE_NAME = "time_log_export.watermark"
+WATERMARK_VERSION = 2
+# How many bytes before a watermark offset are hashed to notice edits just before it.
+WATERMARK_TAIL_BYTES = 4096
+
+
+def iter_file_entries(log_paths):
+    """
+    Yields a LogEntry for every valid line of the given log files, in order.
+    Missing files are skipped.
+    """
+    for log_path in log_paths:
+        try:
+            f = open(log_path, "rb")
+        except OSError:
+            continue
+        with f:
+            for raw_line in f:
+                entry = parse_log_line(raw_line.decode("utf-8", errors="replace"))
+                if entry is not None:
+                    yield entry
+
+
+def iter_file_range_entries(log_ranges):
+    """
+    Yields a LogEntry for every valid line in the given (log_path, start, end) byte ranges, in order.
+    """
+    for log_path, start, end in log_ranges:
+        with open(log_path, "rb") as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                raw_line = f.readline(remaining)
+                if not raw_line:
+                    break
+                remaining -= len(raw_line)
+                entry = parse_log_line(raw_line.decode("utf-8", errors="replace"))
+                if entry is not None:
+                    yield entry
+
+
+def filter_entries(entries, start_date=None, end_date=None, tasks=None):
+    """
+    Yields the entries within [start_date, end_date] ("YYYY-MM-DD", both inclusive, None = open)
+    whose task is one of tasks (compared case-insensitively, None = every task).
+    Raises ValueError for a date that is not a valid "YYYY-MM-DD".
+    """
+    first = last = None
+    if start_date:
+        first = date_str_to_ordinal(start_date)
+        if first is None:
+            raise ValueError(f"Invalid start date: {start_date!r}")
+    if end_date:
+        last = date_str_to_ordinal(end_date)
+        if last is None:
+            raise ValueError(f"Invalid end date: {end_date!r}")
+    task_keys = None if tasks is None else {task.lower() for task in tasks}
+
+    for entry in entries:
+        if first is not None and entry.date_ordinal < first:
+            continue
+        if last is not None and entry.date_ordinal > last:
+            continue
+        if task_keys is not None and entry.task.lower() not in task_keys:
+            continue
+        yield entry
+
+
+def iter_export_rows(entries):
+    """
+    Yields (date, day, start time, end time, duration, task) for every entry.
+    """
+    day_names = {}  # { date_ordinal: (date, weekday name) }, so each date is only formatted once
+    for entry in entries:
+        day = day_names.get(entry.date_ordinal)
+        if day is None:
+            if len(day_names) > 4096:
+                day_names.clear()
+            date = datetime.date.fromordinal(entry.date_ordinal)
+            day = day_names[entry.date_ordinal] = (date.isoformat(), date.strftime("%A"))
+        yield (day[0], day[1], entry.start_time, entry.end_time, entry.duration, entry.task)
+
+
+class ExportCancelled(Exception):
+    """
+    Raised from a progress callback to stop an export.
+    """
+    pass
+
+
+def write_rows(rows, export_path, export_format="csv", progress=None):
+    """
+    Writes rows from iter_export_rows() to export_path as "csv", "csv.gz" or "jsonl".
+    :param progress: optional callable(rows_written, bytes_written), called every
+        PROGRESS_EVERY_ROWS rows and once at the end. It may raise ExportCancelled to stop the export.
+    If the export is cancelled or fails, the partly written file is removed and the exception is re-raised.
+    Returns the number of rows written.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format!r}")
+
+    raw = open(export_path, "wb")
+    binary = f = None
+    try:
+        binary = gzip.GzipFile(fileobj=raw, mode="wb") if export_format == "csv.gz" else raw
+        if export_format == "jsonl":
+            f = io.TextIOWrapper(binary, encoding="utf-8")
+            write_row = lambda row: f.write(json.dumps(dict(zip(JSON_KEYS, row)), ensure_ascii=False) + "\n")
+        else:
+            f = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            write_row = writer.writerow
+
+        count = 0
+        for row in rows:
+            write_row(row)
+            count += 1
+            if progress is not None and count % PROGRESS_EVERY_ROWS == 0:
+                progress(count, raw.tell())
+        f.close()  # also closes binary, but a GzipFile leaves the raw file open
+        raw.close()
+        if progress is not None:
+            progress(count, os.path.getsize(export_path))
+    except BaseException:
+        # Close the wrappers before the file below them, so none of them flushes into a closed file later.
+        for stream in (f, binary, raw):
+            if stream is not None:
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+        try:
+            os.remove(export_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def complete_lines_end(log_path):
+    """
+    Returns the offset right after the last newline of log_path (0 if there is none),
+    so a line that is still being written is left for the next export.
+    """
+    with open(log_path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            block_start = max(0, end - 65536)
+            f.seek(block_start)
+            block = f.read(end - block_start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return block_start + newline + 1
+            end = block_start
+    return 0
+
+
+def file_fingerprint(log_path, offset):
+    """
+    Returns a fingerprint of the first offset bytes of log_path: a hash of its beginning
+    and a hash of the bytes right before offset.
+    """
+    with open(log_path, "rb") as f:
+        f.seek(max(0, offset - WATERMARK_TAIL_BYTES))
+        tail_hash = hashlib.sha1(f.read(min(offset, WATERMARK_TAIL_BYTES))).hexdigest()
+    return f"{prefix_hash(log_path, offset)}:{tail_hash}"
+
+
+def watermark_key(start_date=None, end_date=None, tasks=None):
+    """
+    Returns the key of the watermark for an incremental export with these filters (see filter_entries).
+    Rows skipped by one filter are still due for another, so each filter keeps its own watermark;
+    the unfiltered export uses "".
+    """
+    if not start_date and not end_date and tasks is None:
+        return ""
+    task_keys = None if tasks is None else sorted({task.lower() for task in tasks})
+    return json.dumps([start_date or None, end_date or None, task_keys])
+
+
+def _load_watermarks(watermark_path):
+    """
+    Returns { watermark key: { log file name: record } } from the watermark file, or {} if there is none.
+    """
+    try:
+        with open(watermark_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if data.get("version") == 1:
+        return {"": data.get("files", {})}  # written before filters had watermarks of their own
+    if data.get("version") != WATERMARK_VERSION:
+        return {}
+    return data.get("watermarks", {})
+
+
+def load_watermark(watermark_path, key=""):
+    """
+    Returns { log file name: {"offset": ..., "fingerprint": ...} } stored under key
+    (see watermark_key()) in the watermark file, or {} if there is none.
+    """
+    return _load_watermarks(watermark_path).get(key, {})
+
+
+def save_watermark(watermark_path, files, key=""):
+    """
+    Stores files under key in the watermark file, keeping the watermarks of other filters.
+    """
+    watermarks = _load_watermarks(watermark_path)
+    watermarks[key] = files
+    tmp_path = watermark_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": WATERMARK_VERSION, "watermarks": watermarks}, f)
+    os.replace(tmp_path, watermark_path)
+
+
+def plan_incremental_export(log_paths, watermark):
+    """
+    Works out what an incremental export has to read.
+    :param log_paths: the live log files, in order
+    :param watermark: the output of load_watermark()
+    Returns (log_ranges, new_watermark, is_full): the (log_path, start, end) byte ranges
+    holding the complete lines added since the watermark, the watermark to store once they
+    are exported, and whether a full export is needed because a file was rewritten
+    (e.g. truncated, edited before the watermark, or replaced after reset_time_log()).
+    """
+    log_ranges = []
+    new_watermark = {}
+    is_full = False
+    for log_path in log_paths:
+        if not os.path.isfile(log_path):
+            continue
+        name = os.path.basename(log_path)
+        end = complete_lines_end(log_path)
+        start = 0
+        record = watermark.get(name)
+        if record is not None:
+            start = record.get("offset", 0)
+            if start > end or file_fingerprint(log_path, start) != record.get("fingerprint"):
+                is_full = True
+        log_ranges.append([log_path, start, end])
+        new_watermark[name] = {"offset": end, "fingerprint": file_fingerprint(log_path, end)}
+
+    if is_full:
+        for log_range in log_ranges:
+            log_range[1] = 0
+    return [tuple(log_range) for log_range in log_ranges], new_watermark, is_full
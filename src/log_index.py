@@ -0,0 +1,252 @@
+from array import array
+from src.log_line_parser import LogEntry, date_str_to_ordinal
+from src import log_numpy
+
+
+class LogIndex:
+    """
+    In-memory index over the entries of a time log file.
+    Keeps running totals by task, by date and by date+task so that
+    queries never need to re-read the file.
+
+    The entries themselves are stored column-wise in compact arrays, with
+    every task name stored once in an intern table and referenced by id.
+    """
+    def __init__(self):
+        self.task_minutes = {}        # { task_name: minutes }
+        self.task_minutes_ci = {}     # { task_name.lower(): minutes }
+        self.date_minutes = {}        # { date_ordinal: minutes }
+        self.date_task_minutes = {}   # { date_ordinal: { task_name: minutes } }
+
+        # Entry columns, one element per entry in file order.
+        self.dates = array("i")       # date ordinals
+        self.starts = array("H")      # start, minutes since midnight
+        self.ends = array("H")        # end, minutes since midnight
+        self.task_ids = array("I")    # ids into task_names
+
+        self.task_names = []          # intern table: task id -> task name
+        self._task_name_ids = {}      # task name -> task id
+
+    def clear(self):
+        """
+        Drops every indexed entry.
+        """
+        self.task_minutes.clear()
+        self.task_minutes_ci.clear()
+        self.date_minutes.clear()
+        self.date_task_minutes.clear()
+        del self.dates[:]
+        del self.starts[:]
+        del self.ends[:]
+        del self.task_ids[:]
+        self.task_names.clear()
+        self._task_name_ids.clear()
+
+    def _intern_task(self, task_name):
+        """
+        Returns the id of task_name in the intern table, adding it if needed.
+        """
+        task_id = self._task_name_ids.get(task_name)
+        if task_id is None:
+            task_id = self._task_name_ids[task_name] = len(self.task_names)
+            self.task_names.append(task_name)
+        return task_id
+
+    def add(self, entry):
+        """
+        Indexes one LogEntry. Runs in O(1).
+        """
+        date_ordinal, start, end, task_name = entry
+        minutes = end - start
+
+        self.task_minutes[task_name] = self.task_minutes.get(task_name, 0) + minutes
+
+        task_key = task_name.lower()
+        self.task_minutes_ci[task_key] = self.task_minutes_ci.get(task_key, 0) + minutes
+
+        self.date_minutes[date_ordinal] = self.date_minutes.get(date_ordinal, 0) + minutes
+
+        day_tasks = self.date_task_minutes.get(date_ordinal)
+        if day_tasks is None:
+            day_tasks = self.date_task_minutes[date_ordinal] = {}
+        day_tasks[task_name] = day_tasks.get(task_name, 0) + minutes
+
+        self.dates.append(date_ordinal)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.task_ids.append(self._intern_task(task_name))
+
+    def add_entries(self, entries):
+        """
+        Indexes many LogEntry objects.
+        """
+        for entry in entries:
+            self.add(entry)
+
+    def add_columns(self, dates, starts, ends, task_ids, task_names):
+        """
+        Indexes many entries at once, as produced by log_numpy.parse_log_bytes().
+        The totals are computed with NumPy instead of one add() call per entry.
+        """
+        # Map the ids of the parsed batch onto ids in this index's intern table.
+        id_map = [self._intern_task(name) for name in task_names]
+        np = log_numpy.np
+        local_ids = np.asarray(id_map, dtype=np.int64)[task_ids] if len(task_ids) else task_ids
+
+        task_totals, date_totals, date_task_totals = log_numpy.aggregate_columns(
+            dates, starts, ends, task_ids, len(task_names)
+        )
+        for name, minutes in zip(task_names, task_totals):
+            self.task_minutes[name] = self.task_minutes.get(name, 0) + minutes
+            task_key = name.lower()
+            self.task_minutes_ci[task_key] = self.task_minutes_ci.get(task_key, 0) + minutes
+        for date_ordinal, minutes in date_totals.items():
+            self.date_minutes[date_ordinal] = self.date_minutes.get(date_ordinal, 0) + minutes
+        for (date_ordinal, task_id), minutes in date_task_totals.items():
+            day_tasks = self.date_task_minutes.get(date_ordinal)
+            if day_tasks is None:
+                day_tasks = self.date_task_minutes[date_ordinal] = {}
+            name = task_names[task_id]
+            day_tasks[name] = day_tasks.get(name, 0) + minutes
+
+        self.dates.frombytes(np.asarray(dates, dtype=np.int32).tobytes())
+        self.starts.frombytes(np.asarray(starts, dtype=np.uint16).tobytes())
+        self.ends.frombytes(np.asarray(ends, dtype=np.uint16).tobytes())
+        self.task_ids.frombytes(np.asarray(local_ids, dtype=np.uint32).tobytes())
+
+    def to_snapshot(self):
+        """
+        Returns the index as plain data for log_snapshot.
+        """
+        return {
+            "task_minutes": self.task_minutes,
+            "task_minutes_ci": self.task_minutes_ci,
+            "date_minutes": self.date_minutes,
+            "date_task_minutes": self.date_task_minutes,
+            "task_names": self.task_names,
+            "columns": (self.dates, self.starts, self.ends, self.task_ids),
+        }
+
+    def load_snapshot(self, data):
+        """
+        Replaces the content of the index with data from to_snapshot().
+        """
+        self.clear()
+        self.merge_snapshot(data)
+
+    def merge_snapshot(self, data):
+        """
+        Adds the entries of another index, given as its to_snapshot() data,
+        after the existing entries and adds up the totals.
+        """
+        for name, minutes in data["task_minutes"].items():
+            self.task_minutes[name] = self.task_minutes.get(name, 0) + minutes
+        for task_key, minutes in data["task_minutes_ci"].items():
+            self.task_minutes_ci[task_key] = self.task_minutes_ci.get(task_key, 0) + minutes
+        for date_ordinal, minutes in data["date_minutes"].items():
+            self.date_minutes[date_ordinal] = self.date_minutes.get(date_ordinal, 0) + minutes
+        for date_ordinal, other_day_tasks in data["date_task_minutes"].items():
+            day_tasks = self.date_task_minutes.get(date_ordinal)
+            if day_tasks is None:
+                self.date_task_minutes[date_ordinal] = dict(other_day_tasks)
+                continue
+            for name, minutes in other_day_tasks.items():
+                day_tasks[name] = day_tasks.get(name, 0) + minutes
+
+        id_map = [self._intern_task(name) for name in data["task_names"]]
+        dates, starts, ends, task_ids = data["columns"]
+        self.dates.extend(dates)
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        if id_map == list(range(len(id_map))):
+            self.task_ids.extend(task_ids)
+        elif log_numpy.is_available():
+            np = log_numpy.np
+            remapped = np.asarray(id_map, dtype=np.uint32)[np.frombuffer(task_ids, dtype=np.uint32)]
+            self.task_ids.frombytes(remapped.tobytes())
+        else:
+            self.task_ids.extend(id_map[task_id] for task_id in task_ids)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def tasks(self):
+        """
+        Returns every task name that has at least one entry.
+        """
+        return self.task_minutes.keys()
+
+    def total_minutes(self):
+        return sum(self.task_minutes.values())
+
+    def task_totals(self):
+        """
+        Returns { task_name: minutes } for every task.
+        """
+        return dict(self.task_minutes)
+
+    def task_last_dates(self):
+        """
+        Returns { task_name: date ordinal of its last entry } for every task.
+        """
+        last_dates = {}
+        for date_ordinal in sorted(self.date_task_minutes):
+            last_dates.update(dict.fromkeys(self.date_task_minutes[date_ordinal], date_ordinal))
+        return last_dates
+
+    def minutes_for_task(self, task_name):
+        return self.task_minutes.get(task_name, 0)
+
+    def minutes_for_task_ci(self, task_name):
+        """
+        Returns the minutes logged for task_name, compared case-insensitively.
+        """
+        return self.task_minutes_ci.get(task_name.lower(), 0)
+
+    def minutes_for_date(self, date_str):
+        return self.date_minutes.get(date_str_to_ordinal(date_str), 0)
+
+    def tasks_for_date(self, date_str):
+        return set(self.date_task_minutes.get(date_str_to_ordinal(date_str), ()))
+
+    def minutes_for_date_and_task(self, date_str, task_name):
+        """
+        Returns the minutes logged on date_str for task_name (case-insensitive).
+        """
+        day_tasks = self.date_task_minutes.get(date_str_to_ordinal(date_str))
+        if not day_tasks:
+            return 0
+        task_key = task_name.lower()
+        return sum(m for name, m in day_tasks.items() if name.lower() == task_key)
+
+    def minutes_by_date(self, first_ordinal, last_ordinal):
+        """
+        Returns { date_ordinal: minutes } for the days from first_ordinal to last_ordinal
+        (inclusive) that have entries. Costs one dict lookup per day in the range.
+        """
+        date_minutes = self.date_minutes
+        return {
+            date_ordinal: date_minutes[date_ordinal]
+            for date_ordinal in range(first_ordinal, last_ordinal + 1)
+            if date_ordinal in date_minutes
+        }
+
+    def minutes_by_week(self):
+        """
+        Returns { monday_ordinal: minutes } over all entries.
+        """
+        if log_numpy.is_available():
+            return log_numpy.weekly_totals(self.dates, self.starts, self.ends)
+        weeks = {}
+        for date_ordinal, minutes in self.date_minutes.items():
+            monday = date_ordinal - (date_ordinal - 1) % 7
+            weeks[monday] = weeks.get(monday, 0) + minutes
+        return weeks
+
+    def iter_entries(self):
+        """
+        Yields a LogEntry for every entry, in file order.
+        """
+        task_names = self.task_names
+        for date_ordinal, start, end, task_id in zip(self.dates, self.starts, self.ends, self.task_ids):
+            yield LogEntry(date_ordinal, start, end, task_names[task_id])
@@ -0,0 +1,146 @@
+"""
+The one place where time_log.txt lines are parsed.
+
+A line looks like "YYYY-MM-DD HH:MM - HH:MM | Some Task". parse_log_line() accepts exactly
+the lines that datetime.strptime-based validation used to accept: at least four whitespace
+separated fields before the first "|", the third one being "-", a valid date, two valid
+times (one or two digits per part) and a non-empty task. The one addition is "24:00" as an
+end time, which the part of an entry before midnight ends with. It avoids strptime by matching
+the line with one precompiled pattern and looking the times up in a precomputed table.
+"""
+import re
+import datetime
+from collections import namedtuple
+
+# date, start, end, and the task after the first "|". Fields cannot contain "|" or whitespace.
+_LINE_PATTERN = re.compile(r"\s*([^\s|]+)\s+([^\s|]+)\s+-\s+([^\s|]+)(?:\s[^|]*)?\|(.*)", re.DOTALL)
+_DATE_PATTERN = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")
+
+
+def _build_minute_of_day_table():
+    """
+    Maps every spelling of a time that strptime("%H:%M") accepts ("9:5", "09:05", ...)
+    to its minute of the day.
+    """
+    table = {}
+    for hour in range(24):
+        for minute in range(60):
+            for hour_str in {str(hour), "%02d" % hour}:
+                for minute_str in {str(minute), "%02d" % minute}:
+                    table[f"{hour_str}:{minute_str}"] = hour * 60 + minute
+    return table
+
+
+MINUTE_OF_DAY = _build_minute_of_day_table()
+
+# The end of the day: an entry that runs until midnight ends at "24:00" on its own date.
+END_OF_DAY = 24 * 60
+# MINUTE_OF_DAY plus "24:00", for end times.
+END_MINUTE_OF_DAY = dict(MINUTE_OF_DAY, **{"24:00": END_OF_DAY})
+
+# date string -> ordinal (None for invalid dates); bounded so odd input cannot grow it forever.
+_date_cache = {}
+_DATE_CACHE_LIMIT = 100000
+
+
+class LogEntry(namedtuple("LogEntry", ["date_ordinal", "start", "end", "task"])):
+    """
+    One time log entry: the date as a proleptic Gregorian ordinal,
+    start and end as minutes since midnight, and the task name.
+    """
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    @property
+    def date(self):
+        return ordinal_to_date_str(self.date_ordinal)
+
+    @property
+    def start_time(self):
+        return minute_of_day_to_hhmm(self.start)
+
+    @property
+    def end_time(self):
+        return minute_of_day_to_hhmm(self.end)
+
+
+def date_str_to_ordinal(date_str):
+    """
+    Given a string in 'YYYY-MM-DD' format, return its proleptic Gregorian ordinal,
+    or None if it is not a valid date.
+    """
+    try:
+        return _date_cache[date_str]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+
+    ordinal = None
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if match:
+        try:
+            ordinal = datetime.date(*map(int, match.groups())).toordinal()
+        except ValueError:
+            ordinal = None
+    if len(_date_cache) >= _DATE_CACHE_LIMIT:
+        _date_cache.clear()
+    _date_cache[date_str] = ordinal
+    return ordinal
+
+
+def ordinal_to_date_str(date_ordinal):
+    """
+    Inverse of date_str_to_ordinal: returns the date as 'YYYY-MM-DD'.
+    """
+    return datetime.date.fromordinal(date_ordinal).isoformat()
+
+
+def hhmm_to_minute_of_day(hhmm):
+    """
+    Given a string in 'HH:MM' format, return the number of minutes since midnight
+    ('24:00', the end of the day, gives END_OF_DAY).
+    Raises ValueError if the string is not a valid time.
+    """
+    try:
+        return END_MINUTE_OF_DAY[hhmm]
+    except (KeyError, TypeError):
+        raise ValueError(f"time data {hhmm!r} does not match format '%H:%M'")
+
+
+def minute_of_day_to_hhmm(minute_of_day):
+    """
+    Inverse of hhmm_to_minute_of_day: 615 -> '10:15', END_OF_DAY -> '24:00'.
+    """
+    return "%02d:%02d" % divmod(minute_of_day, 60)
+
+
+def parse_log_line(line):
+    """
+    Parses one line like "2025-02-05 12:00 - 12:15 | Some Task".
+    Returns a LogEntry, or None if the line is not a valid log line.
+    A negative duration (end before start) is still a valid line. The end may be "24:00".
+    """
+    match = _LINE_PATTERN.match(line)
+    if match is None:
+        return None
+    date_str, start_str, end_str, task_part = match.groups()
+
+    start = MINUTE_OF_DAY.get(start_str)
+    end = END_MINUTE_OF_DAY.get(end_str)
+    if start is None or end is None:
+        return None
+
+    date_ordinal = _date_cache.get(date_str)
+    if date_ordinal is None:
+        date_ordinal = date_str_to_ordinal(date_str)
+        if date_ordinal is None:
+            return None
+
+    task_name = task_part.strip()
+    if not task_name:
+        return None
+    return LogEntry(date_ordinal, start, end, task_name)
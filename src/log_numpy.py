@@ -0,0 +1,190 @@
+"""
+Optional NumPy fast path for parsing and aggregating large time logs.
+Everything here is only used when NumPy is installed; TimeLogger falls back
+to its line-by-line parser otherwise.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+# Lines laid out exactly as "YYYY-MM-DD HH:MM - HH:MM | Task" (the format wogger writes)
+# are decoded with array operations. The fixed-width prefix up to and including "|" is 26 bytes.
+_PREFIX_LEN = 26
+_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 19, 20, 22, 23]
+_LITERAL_POSITIONS = {4: "-", 7: "-", 10: " ", 13: ":", 16: " ", 17: "-", 18: " ", 21: ":", 24: " ", 25: "|"}
+_DAYS_BEFORE_MONTH = [0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+_DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def is_available():
+    return np is not None
+
+
+def _split_lines(buf):
+    """
+    Returns (line_starts, line_ends) of every line in buf, excluding the newline byte.
+    """
+    newlines = np.flatnonzero(buf == 10)
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.concatenate((newlines, [len(buf)]))
+    if line_starts[-1] == len(buf):
+        # The file ends with a newline; there is no last line after it.
+        line_starts = line_starts[:-1]
+        line_ends = line_ends[:-1]
+    return line_starts, line_ends
+
+
+def _date_ordinals(year, month, day):
+    """
+    Vectorized datetime.date(year, month, day).toordinal().
+    Also returns a mask of the combinations that are real calendar dates.
+    """
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_ok = (month >= 1) & (month <= 12)
+    safe_month = np.where(month_ok, month, 1)
+    days_in_month = np.asarray(_DAYS_IN_MONTH)[safe_month] + (leap & (safe_month == 2))
+    valid = (year >= 1) & month_ok & (day >= 1) & (day <= days_in_month)
+
+    y1 = year - 1
+    ordinals = (
+        y1 * 365 + y1 // 4 - y1 // 100 + y1 // 400
+        + np.asarray(_DAYS_BEFORE_MONTH)[safe_month] + (leap & (safe_month > 2))
+        + day
+    )
+    return ordinals, valid
+
+
+def parse_log_bytes(data, parse_line):
+    """
+    Parses the raw bytes of a time log in bulk.
+    Lines in the canonical layout are decoded with vectorized NumPy operations; every other line
+    is decoded and handed to parse_line (str -> LogEntry or None), so the result is the same as
+    calling parse_line on every line.
+
+    Returns (dates, starts, ends, task_ids, task_names): four int NumPy arrays in file order
+    and the list of task names that task_ids point into.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    line_starts, line_ends = _split_lines(buf)
+    n_lines = len(line_starts)
+    if n_lines == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty, []
+
+    # Which lines are in the canonical layout?
+    canonical = (line_ends - line_starts) >= _PREFIX_LEN
+    last_byte = len(buf) - 1
+    for pos, char in _LITERAL_POSITIONS.items():
+        canonical &= buf[np.minimum(line_starts + pos, last_byte)] == ord(char)
+
+    canon_starts = line_starts[canonical]
+    digits = buf[canon_starts[:, None] + np.asarray(_DIGIT_POSITIONS)].astype(np.int64) - 48
+    digits_ok = ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    start_h = digits[:, 8] * 10 + digits[:, 9]
+    start_m = digits[:, 10] * 10 + digits[:, 11]
+    end_h = digits[:, 12] * 10 + digits[:, 13]
+    end_m = digits[:, 14] * 10 + digits[:, 15]
+
+    ordinals, date_ok = _date_ordinals(year, month, day)
+    fields_ok = (
+        digits_ok & date_ok
+        & (start_h <= 23) & (start_m <= 59) & (end_h <= 23) & (end_m <= 59)
+    )
+    # Lines that look canonical but carry impossible values go through parse_line like any other line.
+    canonical[np.flatnonzero(canonical)[~fields_ok]] = False
+
+    dates = np.zeros(n_lines, dtype=np.int64)
+    starts = np.zeros(n_lines, dtype=np.int64)
+    ends = np.zeros(n_lines, dtype=np.int64)
+    task_ids = np.zeros(n_lines, dtype=np.int64)
+    valid = canonical.copy()
+
+    dates[canonical] = ordinals[fields_ok]
+    starts[canonical] = (start_h * 60 + start_m)[fields_ok]
+    ends[canonical] = (end_h * 60 + end_m)[fields_ok]
+
+    task_names = []
+    name_ids = {}   # task name -> id
+    raw_ids = {}    # raw task bytes -> id, so repeated tasks are decoded only once
+
+    def task_id_for(name):
+        task_id = name_ids.get(name)
+        if task_id is None:
+            task_id = name_ids[name] = len(task_names)
+            task_names.append(name)
+        return task_id
+
+    canonical_list = canonical.tolist()
+    for i, (start, end) in enumerate(zip(line_starts.tolist(), line_ends.tolist())):
+        if canonical_list[i]:
+            raw = data[start + _PREFIX_LEN:end]
+            task_id = raw_ids.get(raw)
+            if task_id is None:
+                name = raw.decode("utf-8", errors="replace").strip()
+                task_id = raw_ids[raw] = task_id_for(name) if name else -1
+            if task_id < 0:
+                valid[i] = False  # a line without a task is not a valid log line
+            task_ids[i] = task_id
+        else:
+            entry = parse_line(data[start:end].decode("utf-8", errors="replace"))
+            if entry is None:
+                continue
+            dates[i], starts[i], ends[i] = entry.date_ordinal, entry.start, entry.end
+            task_ids[i] = task_id_for(entry.task)
+            valid[i] = True
+
+    return dates[valid], starts[valid], ends[valid], task_ids[valid], task_names
+
+
+def aggregate_columns(dates, starts, ends, task_ids, n_tasks):
+    """
+    Computes the LogIndex totals for the given entry columns with bincount.
+    Returns (task_totals, date_totals, date_task_totals):
+      - task_totals: list of minutes per task id
+      - date_totals: { date_ordinal: minutes }
+      - date_task_totals: { (date_ordinal, task_id): minutes }
+    Every date and date+task pair that has an entry is present, even if its total is 0.
+    """
+    dates = np.asarray(dates, dtype=np.int64)
+    task_ids = np.asarray(task_ids, dtype=np.int64)
+    minutes = np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+    if len(dates) == 0:
+        return [0] * n_tasks, {}, {}
+
+    task_totals = np.bincount(task_ids, weights=minutes, minlength=n_tasks).astype(np.int64)
+
+    first_date = int(dates.min())
+    day_offsets = dates - first_date
+    day_totals = np.bincount(day_offsets, weights=minutes).astype(np.int64)
+    day_present = np.flatnonzero(np.bincount(day_offsets))
+    date_totals = dict(zip((day_present + first_date).tolist(), day_totals[day_present].tolist()))
+
+    pair_keys, inverse = np.unique(day_offsets * n_tasks + task_ids, return_inverse=True)
+    pair_totals = np.bincount(inverse.ravel(), weights=minutes).astype(np.int64)
+    pair_dates = (pair_keys // n_tasks + first_date).tolist()
+    pair_tasks = (pair_keys % n_tasks).tolist()
+    date_task_totals = dict(zip(zip(pair_dates, pair_tasks), pair_totals.tolist()))
+
+    return task_totals.tolist(), date_totals, date_task_totals
+
+
+def weekly_totals(dates, starts, ends):
+    """
+    Returns { monday_ordinal: minutes } for the given entry columns.
+    Ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) // 7 numbers the weeks.
+    """
+    dates = np.frombuffer(dates, dtype=np.int32) if not isinstance(dates, np.ndarray) else dates
+    if len(dates) == 0:
+        return {}
+    minutes = np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+    weeks = (dates.astype(np.int64) - 1) // 7
+    first_week = int(weeks.min())
+    week_offsets = weeks - first_week
+    totals = np.bincount(week_offsets, weights=minutes).astype(np.int64)
+    present = np.flatnonzero(np.bincount(week_offsets))
+    return dict(zip(((present + first_week) * 7 + 1).tolist(), totals[present].tolist()))
@@ -0,0 +1,97 @@
+"""
+Parallel full parse of very large time logs.
+The file is split into byte ranges that end on newlines, every range is parsed into its own
+LogIndex in a worker process, and the partial indexes are merged back in file order.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from src.log_index import LogIndex
+from src import log_numpy
+
+# Upper bound on worker processes; parsing is also bound by disk reads.
+MAX_WORKERS = 8
+
+
+def worker_count():
+    return min(os.cpu_count() or 1, MAX_WORKERS)
+
+
+def split_byte_ranges(log_path, size, n_chunks):
+    """
+    Splits the first size bytes of log_path into at most n_chunks (start, end) ranges.
+    Every range except the last ends right after a newline, so no line is cut in two.
+    """
+    ranges = []
+    start = 0
+    with open(log_path, "rb") as f:
+        for i in range(1, n_chunks):
+            target = size * i // n_chunks
+            if target <= start:
+                continue
+            f.seek(target)
+            f.readline()  # move to the start of the next line
+            end = min(f.tell(), size)
+            if end >= size:
+                break
+            ranges.append((start, end))
+            start = end
+    ranges.append((start, size))
+    return ranges
+
+
+def parse_chunk(log_path, start, end, parse_line, use_numpy):
+    """
+    Parses bytes [start, end) of log_path into a LogIndex and returns its to_snapshot() data.
+    Runs in a worker process.
+    """
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    index = LogIndex()
+    if use_numpy and log_numpy.is_available():
+        index.add_columns(*log_numpy.parse_log_bytes(data, parse_line))
+    else:
+        for raw_line in data.split(b"\n"):
+            parsed = parse_line(raw_line.decode("utf-8", errors="replace"))
+            if parsed is not None:
+                index.add(parsed)
+    return index.to_snapshot()
+
+
+def parse_file_parallel(log_path, size, parse_line, use_numpy=True):
+    """
+    Parses the first size bytes of log_path across worker processes.
+    :param parse_line: module-level function str -> LogEntry or None (must be picklable)
+    Returns the partial to_snapshot() results in file order, or None if the
+    worker processes could not be started; the caller should then parse sequentially.
+    """
+    n_workers = worker_count()
+    ranges = split_byte_ranges(log_path, size, n_workers)
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(parse_chunk, log_path, start, end, parse_line, use_numpy)
+                for start, end in ranges
+            ]
+            return [future.result() for future in futures]
+    except (OSError, RuntimeError, ImportError):
+        # No process support here (e.g. restricted environment); BrokenProcessPool is a RuntimeError.
+        return None
+
+
+def parse_files_parallel(log_paths, parse_line, use_numpy=True):
+    """
+    Parses every file in log_paths in its own worker process.
+    Returns the to_snapshot() results in the order of log_paths, or None if the
+    worker processes could not be started; the caller should then parse sequentially.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=min(worker_count(), len(log_paths))) as executor:
+            futures = [
+                executor.submit(parse_chunk, log_path, 0, os.path.getsize(log_path), parse_line, use_numpy)
+                for log_path in log_paths
+            ]
+            return [future.result() for future in futures]
+    except (OSError, RuntimeError, ImportError):
+        return None
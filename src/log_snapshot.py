@@ -0,0 +1,195 @@
+"""
+The parse snapshot (time_log.cache) and the file format it shares with the archive cache
+(time_log_archive.cache): a signature (magic bytes and a version byte), the length of a JSON
+header, the header, then the raw bytes of the entry columns of every stored index.
+Reading one never runs code from the file: every header field is type-checked and the column
+sizes are checked against the header, so a damaged or foreign file is rejected with ValueError.
+"""
+import os
+import sys
+import json
+import struct
+import hashlib
+from array import array
+
+# Bumped whenever the layout of the stored data changes; older snapshots are ignored.
+SNAPSHOT_VERSION = 5
+SNAPSHOT_MAGIC = b"WOGSNAP"
+
+# How many leading bytes of the log file are hashed into the snapshot key.
+PREFIX_HASH_BYTES = 65536
+
+# Type codes of the LogIndex columns (dates, starts, ends, task_ids), in to_snapshot() order.
+COLUMN_TYPECODES = ("i", "H", "H", "I")
+# Largest JSON header accepted when reading, so a foreign file cannot make us allocate gigabytes.
+MAX_HEADER_BYTES = 256 * 1024 * 1024
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+def prefix_hash(log_path, size):
+    """
+    Returns a hash of the first PREFIX_HASH_BYTES bytes (at most size bytes) of log_path.
+    """
+    with open(log_path, "rb") as f:
+        return hashlib.sha1(f.read(min(size, PREFIX_HASH_BYTES))).hexdigest()
+
+
+def _check(condition):
+    if not condition:
+        raise ValueError("malformed data file")
+
+
+def _is_int(value):
+    return type(value) is int
+
+
+def _is_minutes_dict(value):
+    return isinstance(value, dict) and all(
+        isinstance(name, str) and _is_int(minutes) for name, minutes in value.items()
+    )
+
+
+def _index_header(index_data):
+    """
+    Returns the JSON-compatible part of LogIndex.to_snapshot() data (everything but the columns).
+    Date ordinals become [ordinal, value] pairs, as JSON object keys can only be strings.
+    """
+    return {
+        "task_minutes": index_data["task_minutes"],
+        "task_minutes_ci": index_data["task_minutes_ci"],
+        "date_minutes": list(index_data["date_minutes"].items()),
+        "date_task_minutes": list(index_data["date_task_minutes"].items()),
+        "task_names": index_data["task_names"],
+        "entries": len(index_data["columns"][0]),
+    }
+
+
+def _read_index_data(header, f, swap_bytes):
+    """
+    Returns LogIndex.to_snapshot() data from a header written by _index_header()
+    and the column bytes that follow in f. Raises ValueError if anything does not fit.
+    """
+    _check(isinstance(header, dict))
+    task_names = header.get("task_names")
+    _check(isinstance(task_names, list) and all(isinstance(name, str) for name in task_names))
+    _check(_is_minutes_dict(header.get("task_minutes")) and _is_minutes_dict(header.get("task_minutes_ci")))
+    date_minutes = header.get("date_minutes")
+    _check(isinstance(date_minutes, list) and all(
+        isinstance(pair, list) and len(pair) == 2 and _is_int(pair[0]) and _is_int(pair[1])
+        for pair in date_minutes
+    ))
+    date_task_minutes = header.get("date_task_minutes")
+    _check(isinstance(date_task_minutes, list) and all(
+        isinstance(pair, list) and len(pair) == 2 and _is_int(pair[0]) and _is_minutes_dict(pair[1])
+        for pair in date_task_minutes
+    ))
+    count = header.get("entries")
+    _check(_is_int(count) and count >= 0)
+
+    columns = []
+    for typecode in COLUMN_TYPECODES:
+        column = array(typecode)
+        size = count * column.itemsize
+        data = f.read(size)
+        _check(len(data) == size)
+        column.frombytes(data)
+        if swap_bytes:
+            column.byteswap()
+        columns.append(column)
+    task_ids = columns[3]
+    _check(not task_ids or max(task_ids) < len(task_names))
+
+    return {
+        "task_minutes": header["task_minutes"],
+        "task_minutes_ci": header["task_minutes_ci"],
+        "date_minutes": dict(date_minutes),
+        "date_task_minutes": dict(date_task_minutes),
+        "task_names": task_names,
+        "columns": tuple(columns),
+    }
+
+
+def write_data_file(path, signature, meta, index_datas):
+    """
+    Writes meta (any JSON-compatible value) and a list of LogIndex.to_snapshot() data to path.
+    The file is written next to the target and renamed, so a crash never leaves a half-written file.
+    """
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "meta": meta,
+        "indexes": [_index_header(index_data) for index_data in index_datas],
+    }).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(signature)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for index_data in index_datas:
+            for typecode, column in zip(COLUMN_TYPECODES, index_data["columns"]):
+                if column.typecode != typecode:
+                    column = array(typecode, column)
+                f.write(column.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_data_file(path, signature):
+    """
+    Returns (meta, [LogIndex.to_snapshot() data]) from a file written by write_data_file().
+    Raises OSError if it cannot be read, ValueError if it is not such a file or is damaged.
+    """
+    with open(path, "rb") as f:
+        _check(f.read(len(signature)) == signature)
+        raw_length = f.read(_HEADER_LENGTH.size)
+        _check(len(raw_length) == _HEADER_LENGTH.size)
+        (length,) = _HEADER_LENGTH.unpack(raw_length)
+        _check(length <= MAX_HEADER_BYTES)
+        raw_header = f.read(length)
+        _check(len(raw_header) == length)
+        try:
+            header = json.loads(raw_header.decode("utf-8"))
+        except RecursionError:
+            raise ValueError("malformed data file")
+        _check(isinstance(header, dict) and isinstance(header.get("indexes"), list))
+        _check(header.get("byteorder") in ("little", "big"))
+        swap_bytes = header["byteorder"] != sys.byteorder
+        index_datas = [_read_index_data(index_header, f, swap_bytes) for index_header in header["indexes"]]
+        _check(f.read(1) == b"")
+    return header.get("meta"), index_datas
+
+
+def save_snapshot(snapshot_path, log_path, state, index_data):
+    """
+    Writes the parsed state of log_path to snapshot_path.
+    :param state: (offset, size, mtime, inode, tail_bytes, checksum) of the parse
+    :param index_data: the output of LogIndex.to_snapshot()
+    """
+    offset, size, mtime, inode, tail_bytes, checksum = state
+    meta = {
+        "state": [offset, size, mtime, inode, tail_bytes.hex(), checksum],
+        "prefix_hash": prefix_hash(log_path, offset),
+    }
+    write_data_file(snapshot_path, SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]), meta, [index_data])
+
+
+def load_snapshot(snapshot_path, log_path):
+    """
+    Returns (state, index_data) from snapshot_path if it still describes the beginning of log_path,
+    i.e. log_path is at least as large as when the snapshot was written and starts with the same bytes.
+    Returns None if there is no usable snapshot.
+    """
+    try:
+        meta, index_datas = read_data_file(snapshot_path, SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]))
+        _check(isinstance(meta, dict) and len(index_datas) == 1)
+        state = meta.get("state")
+        _check(isinstance(state, list) and len(state) == 6)
+        offset, size, mtime, inode, tail_hex, checksum = state
+        _check(all(_is_int(value) for value in (offset, size, mtime, checksum)))
+        _check(inode is None or _is_int(inode))
+        _check(isinstance(tail_hex, str))
+        state = (offset, size, mtime, inode, bytes.fromhex(tail_hex), checksum)
+        st = os.stat(log_path)
+        if st.st_size < offset or prefix_hash(log_path, offset) != meta.get("prefix_hash"):
+            return None
+    except (OSError, ValueError):
+        return None
+    return state, index_datas[0]
@@ -0,0 +1,76 @@
+import threading
+from src.time_logger import CHANGE_APPEND, CHANGE_REWRITE
+
+# How often (ms) the log file is checked for changes made outside of wogger.
+WATCH_INTERVAL_MS = 1000
+
+
+class LogWatcher:
+    """
+    Notices when the time log is edited outside of wogger (e.g. by hand) and brings the
+    TimeLogger up to date without anyone pressing refresh.
+    Every WATCH_INTERVAL_MS the Tk loop runs TimeLogger.poll_external_changes(), which
+    costs an os.stat. Appended lines are tail-parsed right away; a rewritten file is
+    re-parsed on a worker thread while the UI keeps showing the previous totals, and the
+    new index is swapped in on the Tk thread once it is ready.
+    """
+
+    def __init__(self, root, time_logger, on_change=None, interval_ms=WATCH_INTERVAL_MS):
+        """
+        :param root: The Tk root, used for after() scheduling
+        :param time_logger: A TimeLogger instance
+        :param on_change: Called on the Tk thread after the logger picked up a change
+        """
+        self.root = root
+        self.time_logger = time_logger
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self._after_id = None
+        self._rebuild_thread = None
+        self._rebuild_result = None
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self._check()
+        finally:
+            self.start()
+
+    def _check(self):
+        if self._rebuild_thread is not None:
+            if self._rebuild_thread.is_alive():
+                return
+            self._rebuild_thread = None
+            rebuilt, self._rebuild_result = self._rebuild_result, None
+            if rebuilt is not None:
+                self.time_logger.install_rebuilt_index(rebuilt)
+                self._notify()
+            return
+
+        change = self.time_logger.poll_external_changes()
+        if change == CHANGE_APPEND or (change == CHANGE_REWRITE and not self.time_logger.can_rebuild_in_background):
+            self.time_logger.reload_time_log()
+            self._notify()
+        elif change == CHANGE_REWRITE:
+            self._rebuild_thread = threading.Thread(target=self._rebuild, name="wogger-rebuild", daemon=True)
+            self._rebuild_thread.start()
+
+    def _rebuild(self):
+        try:
+            self._rebuild_result = self.time_logger.build_rebuilt_index()
+        except OSError:
+            # The file vanished or was locked mid-parse; the next check will see it again.
+            self._rebuild_result = None
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
@@ -0,0 +1,167 @@
+"""
+Appends lines to a time log through a file handle that stays open between writes.
+
+Durability modes (what survives once append() returned):
+  - "flush":    the data was handed to the OS; it survives the app crashing, not a power loss
+                until the handle is closed.
+  - "fsync":    the data was also fsynced; it survives a power loss.
+  - "interval": like "flush", and an fsync follows within fsync_interval_ms, so a power loss
+                loses at most that much of the most recent data.
+In every mode a single append() is one write() of whole lines, so the log never ends in a line
+that was cut off by the app crashing in between two lines of the same batch. Closing the handle
+(close(), or the idle close) always fsyncs data that is not yet synced.
+If the file already ends in a cut-off line when it is opened (e.g. after a power loss), the first
+append starts on a new line, so the cut-off line does not swallow the appended one.
+"""
+import os
+import time
+import threading
+
+DURABILITY_FLUSH = "flush"
+DURABILITY_FSYNC = "fsync"
+DURABILITY_INTERVAL = "interval"
+DURABILITY_MODES = (DURABILITY_FLUSH, DURABILITY_FSYNC, DURABILITY_INTERVAL)
+
+# An idle handle is closed after this many seconds, so the file can be edited, renamed or
+# deleted by hand (Windows refuses that while the file is open).
+IDLE_CLOSE_S = 30.0
+
+
+class LogWriter:
+    """
+    Appends to log_path. The handle is opened on the first append, reopened if the file was
+    replaced or removed behind our back, and closed again after IDLE_CLOSE_S without writes.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, log_path, durability=DURABILITY_FLUSH, fsync_interval_ms=1000):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability!r}")
+        self.log_path = log_path
+        self.durability = durability
+        self.fsync_interval_ms = fsync_interval_ms
+        self._lock = threading.Lock()
+        self._file = None
+        self._inode = None          # st_ino of the open file
+        self._needs_newline = False  # True if the open file ends in a cut-off line
+        self._unsynced = False      # True if written data still waits for an fsync
+        self._last_sync = 0.0       # time.monotonic() of the last fsync
+        self._last_write = 0.0      # time.monotonic() of the last append
+        self._timer = None          # pending threading.Timer for the deferred fsync / idle close
+        self._timer_due = 0.0       # time.monotonic() at which _timer fires
+
+    def append(self, data):
+        """
+        Appends data (bytes of whole lines) with one write and makes it durable per the mode.
+        Returns (end_offset, st): the file size right after the write and the os.fstat() result.
+        end_offset - len(data) is only where data starts if nothing was written before it, i.e.
+        if the file did not end in a cut-off line.
+        """
+        with self._lock:
+            f = self._open()
+            if self._needs_newline:
+                data = os.linesep.encode("ascii") + data
+                self._needs_newline = False
+            f.write(data)
+            f.flush()
+            now = time.monotonic()
+            self._last_write = now
+            if self.durability == DURABILITY_FSYNC:
+                self._fsync(now)
+            else:
+                self._unsynced = True
+                if self.durability == DURABILITY_INTERVAL and (now - self._last_sync) * 1000 >= self.fsync_interval_ms:
+                    self._fsync(now)
+            st = os.fstat(f.fileno())
+            end_offset = f.tell()
+            self._schedule_timer()
+            return end_offset, st
+
+    def sync(self):
+        """
+        Fsyncs everything written so far.
+        """
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._fsync(time.monotonic())
+
+    def close(self):
+        """
+        Fsyncs pending data and closes the handle. The writer can still be used afterwards;
+        the next append() reopens the file.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._close_file()
+
+    def _open(self):
+        if self._file is not None:
+            try:
+                replaced = os.stat(self.log_path).st_ino != self._inode
+            except OSError:
+                replaced = True
+            if replaced:
+                self._close_file()
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            self._file = open(self.log_path, "ab")
+            st = os.fstat(self._file.fileno())
+            self._inode = st.st_ino
+            self._needs_newline = st.st_size > 0 and self._last_byte() != b"\n"
+        return self._file
+
+    def _last_byte(self):
+        with open(self.log_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        try:
+            if self._unsynced:
+                self._fsync(time.monotonic())
+        finally:
+            self._file.close()
+            self._file = None
+            self._inode = None
+
+    def _fsync(self, now):
+        os.fsync(self._file.fileno())
+        self._unsynced = False
+        self._last_sync = now
+
+    def _schedule_timer(self):
+        """
+        Makes sure a timer runs for the next deferred fsync or idle close.
+        """
+        if self._file is None:
+            return
+        now = time.monotonic()
+        due = self._last_write + IDLE_CLOSE_S
+        if self._unsynced and self.durability == DURABILITY_INTERVAL:
+            due = min(due, self._last_sync + self.fsync_interval_ms / 1000)
+        if self._timer is not None:
+            if self._timer_due <= due:
+                return
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = threading.Timer(max(0.0, due - now), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if self._file is None:
+                return
+            now = time.monotonic()
+            if now - self._last_write >= IDLE_CLOSE_S:
+                self._close_file()
+                return
+            if (self._unsynced and self.durability == DURABILITY_INTERVAL
+                    and (now - self._last_sync) * 1000 >= self.fsync_interval_ms):
+                self._fsync(now)
+            self._schedule_timer()
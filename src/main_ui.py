@@ -1,13 +1,22 @@
 import tkinter as tk
-from tkinter import ttk
 import datetime
+import bisect
 
 from src.tooltip import ToolTip
 from src.utils import open_folder
 from src.time_logger import TimeLogger
 from src.manual_entry_window import ManualEntryWindow
+from src.bulk_import_window import BulkImportWindow
 from src.app_fonts import FONT_LARGE
 from src.week_overview import WeekOverview
+from src.export_worker import ExportJob
+from src.virtual_task_table import VirtualTaskTable
+from src.log_events import EntriesAppended
+
+# How often (ms) the progress of a running export is polled.
+EXPORT_POLL_MS = 200
+# How long (s) closing the app waits for a cancelled export to clean up.
+EXPORT_CANCEL_WAIT_S = 2
 
 class MainUI:
     """
@@ -27,8 +36,17 @@ class MainUI:
         self.on_reset_callback = on_reset_callback
         self.on_settings_callback = on_settings_callback
         self.app_settings = app_settings
-        
+        self._export_job = None  # the running ExportJob, if any
+
+        # What the table shows, kept up to date by _on_log_event() without asking the logger again
+        self._table_date = None    # "YYYY-MM-DD" in today-only mode, None when all tasks are shown
+        self._task_totals = {}     # { task_name: minutes } of the shown rows
+        self._sorted_tasks = []    # sorted keys of _task_totals
+        self._total_minutes = 0    # "Total in time_log.txt" of the label
+        self._today_minutes = 0    # "Today so far" of the label
+
         self._build_ui()
+        self.time_logger.subscribe(self._on_log_event)
 
     def _build_ui(self):
         main_frame = tk.Frame(self.root)
@@ -47,6 +65,19 @@ class MainUI:
         # Place it at the top/left
         show_today_cb.pack(anchor="w", pady=(0, 5))
 
+        #
+        # Checkbutton to include the archived (reset) time logs in every total
+        #
+        self.all_history_var = tk.BooleanVar(value=False)
+        all_history_cb = tk.Checkbutton(
+            main_frame,
+            text="Include Archived Logs",
+            variable=self.all_history_var,
+            command=self.on_toggle_all_history
+        )
+        all_history_cb.pack(anchor="w", pady=(0, 5))
+        ToolTip(all_history_cb, "Also count the time_log.txt.bak files left behind by resets")
+
         #
         # Top-right frame for trash, open-folder, and settings buttons
         #
@@ -66,6 +97,19 @@ class MainUI:
         manual_insert_button.pack(side="right", anchor="e")
         ToolTip(manual_insert_button, "Manually insert a task")
 
+        # BULK IMPORT BUTTON
+        bulk_import_button = tk.Button(
+            top_right_frame,
+            text="📥",
+            command=self.on_click_bulk_import,
+            relief=tk.FLAT,
+            bd=1,
+            cursor="hand2",
+            font=FONT_LARGE
+        )
+        bulk_import_button.pack(side="right", anchor="e")
+        ToolTip(bulk_import_button, "Import many log lines at once")
+
         # TRASH BUTTON
         trash_button = tk.Button(
             top_right_frame,
@@ -134,25 +178,30 @@ class MainUI:
         ToolTip(export_button, "Export work log as CSV")
 
         #
-        # TreeView etc.
+        # Task table; only the rows on screen exist as Treeview items
         #
-        columns = ("task", "file_minutes", "total_pretty")
-        self.tree = ttk.Treeview(main_frame, columns=columns, show="headings", height=10)
-        self.tree.heading("task", text="Task")
-        self.tree.heading("file_minutes", text="Total (min)")
-        self.tree.heading("total_pretty", text="Total (pretty)")
-        self.tree.column("task", width=200, anchor="w")
-        self.tree.column("file_minutes", width=120, anchor="center")
-        self.tree.column("total_pretty", width=120, anchor="center")
-        self.tree.pack(fill="both", expand=True)
-
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.task_table = VirtualTaskTable(main_frame, height=10)
+        self.task_table.pack(fill="both", expand=True)
+        self.tree = self.task_table.tree
 
         self.totals_label = tk.Label(main_frame, text="", font=("TkDefaultFont", 9, "italic"))
         self.totals_label.pack(pady=(5, 0))
 
+        # Export progress, only shown while an export runs
+        self.export_frame = tk.Frame(main_frame)
+        self.export_label = tk.Label(self.export_frame, text="", font=("TkDefaultFont", 9, "italic"))
+        self.export_label.pack(side="left")
+        self.export_cancel_button = tk.Button(
+            self.export_frame,
+            text="✖",
+            command=self.cancel_export,
+            relief=tk.FLAT,
+            bd=1,
+            cursor="hand2"
+        )
+        self.export_cancel_button.pack(side="left", padx=(5, 0))
+        ToolTip(self.export_cancel_button, "Cancel the export")
+
         # --- Week Overview Component ---
         self.week_overview = WeekOverview(main_frame, self.time_logger, self.app_settings)
         # self.week_overview.pack(fill="x", pady=(10, 0))
@@ -174,24 +223,69 @@ class MainUI:
         """
         ManualEntryWindow(self.root, self.time_logger, on_save_callback=self._after_manual_entry_save)
 
+    def on_click_bulk_import(self):
+        """
+        Opens a window for pasting or loading many log lines at once.
+        """
+        BulkImportWindow(self.root, self.time_logger, on_save_callback=self._after_manual_entry_save)
+
     def _after_manual_entry_save(self, success):
         """
         Callback invoked after user tries to save a manual log line.
-        If success == True, refresh the tree view.
+        Saved lines reach the tree view through _on_log_event().
         """
-        if success:
-            self.refresh_main_tree()
-        else:
-            # Optionally show an error dialog or do nothing.
-            pass
+        pass
 
     def on_click_export(self):
         """
-        Exports the time log as CSV and displays a prompt with the output path.
+        Starts exporting the time log as CSV on a worker thread and shows its progress
+        below the totals. A prompt with the output path is shown once it is done.
+        """
+        if self._export_job is not None:
+            return  # one export at a time
+
+        incremental = self.app_settings is not None and self.app_settings.incremental_export
+        self._export_job = ExportJob(self.time_logger, export_format="csv", incremental=incremental)
+        self._export_job.start()
+        self.export_label.config(text="Exporting...")
+        self.export_cancel_button.config(state="normal")
+        self.export_frame.pack(pady=(5, 0), after=self.totals_label)
+        self.root.after(EXPORT_POLL_MS, self._poll_export)
+
+    def cancel_export(self, wait=False):
+        """
+        Asks the running export (if any) to stop.
+        With wait=True, also gives it a moment to remove its partial file (used when the app exits).
         """
-        export_path = self.time_logger.export_time_log_as_csv()
+        job = self._export_job
+        if job is None:
+            return
+        job.cancel()
+        if wait:
+            job.join(EXPORT_CANCEL_WAIT_S)
+            return
+        self.export_label.config(text="Cancelling export...")
+        self.export_cancel_button.config(state="disabled")
+
+    def _poll_export(self):
+        job = self._export_job
+        if job is None:
+            return
+        if not job.done:
+            if not job.cancel_requested:
+                self.export_label.config(
+                    text=f"Exporting... {job.rows_written} rows, {job.bytes_written / 1024:.0f} KB written"
+                )
+            self.root.after(EXPORT_POLL_MS, self._poll_export)
+            return
+
+        self._export_job = None
+        self.export_frame.pack_forget()
         import tkinter.messagebox as messagebox
-        messagebox.showinfo("Export Complete", f"A new export was generated:\n{export_path}")
+        if job.error is not None:
+            messagebox.showerror("Export Failed", f"The export could not be written:\n{job.error}")
+        elif not job.cancelled:
+            messagebox.showinfo("Export Complete", f"A new export was generated:\n{job.export_path}")
 
     def on_click_reset(self):
         if self.on_reset_callback:
@@ -215,60 +309,82 @@ class MainUI:
         """
         Refresh the treeview with the latest data.
         """
-        # Trigger a reload of the log file
-        self.time_logger.reload_time_log()
+        # Trigger a reload of the log file; a changed file refreshes through _on_log_event()
+        if not self.time_logger.reload_time_log():
+            self.refresh_main_tree()
+
+    def on_toggle_all_history(self):
+        self.time_logger.set_all_history(self.all_history_var.get())
         self.refresh_main_tree()
 
     def refresh_main_tree(self):
-        # Clear existing rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        """
+        Rebuilds the table, the totals label and the week overview from the logger.
+        """
+        self._load_table()
+        self.week_overview.refresh_week_view()
 
+    def _load_table(self):
         today_str = datetime.datetime.now().strftime("%Y-%m-%d")
-        show_today_only = self.show_today_only_var.get()
 
-        if show_today_only:
-            tasks_to_display = self.time_logger.get_tasks_for_today()
+        # All per-task totals come from the index in one call; the table formats only the visible rows.
+        if self.show_today_only_var.get():
+            self._table_date = today_str
+            self._task_totals = self.time_logger.get_task_totals(today_str)
+            pretty_for = lambda task: self.time_logger.get_pretty_total_for_date_and_task(today_str, task)
         else:
-            tasks_to_display = self.time_logger.get_all_tasks()
-
-        # Re-populate the tree
-        sorted_tasks = sorted(tasks_to_display)
-        total_across_all_displayed = 0  # We'll sum up to show in the label
-
-        for task in sorted_tasks:
-            if show_today_only:
-                # Show only today's minutes
-                file_total = self.time_logger.get_logged_minutes_for_date_and_task(today_str, task)
-                total_pretty_formatted = self.time_logger.get_pretty_total_for_date_and_task(today_str, task)
-            else:
-                # Show entire file's minutes
-                file_total = self.time_logger.get_file_total_minutes(task_name=task)
-                total_pretty_formatted = self.time_logger.get_pretty_total(task_name=task)
-
-            total_across_all_displayed += file_total
-
-            self.tree.insert(
-                "",
-                tk.END,
-                iid=task,
-                values=(task, file_total, total_pretty_formatted)
-            )
+            self._table_date = None
+            self._task_totals = self.time_logger.get_task_totals()
+            self._total_minutes = self.time_logger.get_overall_file_minutes()
+            self._today_minutes = self.time_logger.get_logged_minutes_for_date(today_str)
+            pretty_for = lambda task: self.time_logger.get_pretty_total(task_name=task)
+
+        self._sorted_tasks = sorted(self._task_totals)
+        self.task_table.set_rows(self._sorted_tasks, self._task_totals, pretty_for)
+        self._update_totals_label(today_str)
 
-        # Summaries
+    def _update_totals_label(self, today_str):
         # Adjust the summary text at the bottom according to whether we are in "today only" mode
-        if show_today_only:
-            # total_across_all_displayed is effectively the sum of today's tasks
-            summary_text = f"Total for {today_str}: {total_across_all_displayed} min"
+        if self._table_date is not None:
+            summary_text = f"Total for {self._table_date}: {sum(self._task_totals.values())} min"
         else:
-            total_in_file = self.time_logger.get_overall_file_minutes()
-            logged_today = self.time_logger.get_logged_minutes_for_date(today_str)
+            source = "all logs" if self.time_logger.all_history else "time_log.txt"
             summary_text = (
-                f"Total in time_log.txt: {total_in_file} min | "
-                f"Today so far: {logged_today} min"
+                f"Total in {source}: {self._total_minutes} min | "
+                f"Today so far: {self._today_minutes} min"
             )
-
         self.totals_label.config(text=summary_text)
 
-        # Refresh the week overview if you want it updated as well
-        self.week_overview.refresh_week_view()
+    def _on_log_event(self, event):
+        """
+        Keeps the window in sync with the log. Appended entries only touch the rows and
+        day cells they belong to; a reloaded or reset log rebuilds everything.
+        """
+        if not isinstance(event, EntriesAppended):
+            self.refresh_main_tree()
+            return
+
+        today_str = datetime.datetime.now().strftime("%Y-%m-%d")
+        if self._table_date is not None and self._table_date != today_str:
+            self._load_table()  # the day changed since the table was built
+        elif self._table_date is not None:
+            if any(entry.date == today_str for entry in event.entries):
+                # Only today's few tasks are asked for again; the names are matched case-insensitively.
+                self._task_totals.clear()
+                self._task_totals.update(self.time_logger.get_task_totals(today_str))
+                self._sorted_tasks[:] = sorted(self._task_totals)
+                self.task_table.refresh()
+                self._update_totals_label(today_str)
+        else:
+            for entry in event.entries:
+                if entry.task not in self._task_totals:
+                    bisect.insort(self._sorted_tasks, entry.task)
+                    self._task_totals[entry.task] = 0
+                self._task_totals[entry.task] += entry.duration
+                self._total_minutes += entry.duration
+                if entry.date == today_str:
+                    self._today_minutes += entry.duration
+            self.task_table.refresh()
+            self._update_totals_label(today_str)
+
+        self.week_overview.on_entries_appended(event.entries)
@@ -1,11 +1,14 @@
 import tkinter as tk
 import datetime
+from src.task_suggestion_list import TaskSuggestionList
 
 class ManualEntryWindow:
     """
     A small window for manually inserting a single line of text in the format:
        YYYY-MM-DD HH:MM - HH:MM | Task Name
     The Submit button stays disabled until the input is valid.
+    While typing the task (after the "|"), matching previous tasks are suggested;
+    picking one (double-click, or Up/Down and Enter) completes the task name.
     """
     def __init__(self, parent, time_logger, on_save_callback):
         """
@@ -43,6 +46,14 @@ class ManualEntryWindow:
         self.entry.pack(side="left")
         self.entry.focus_set()
 
+        # Suggestions for the task part of the line
+        self.suggestion_list = TaskSuggestionList(self.top, self.time_logger.suggest_tasks, height=5, width=50)
+        self.suggestion_list.pack(padx=10, pady=(0, 5), fill="x")
+        self.entry.bind("<Down>", lambda event: self.suggestion_list.move(1))
+        self.entry.bind("<Up>", lambda event: self.suggestion_list.move(-1))
+        self.entry.bind("<Return>", self._on_pick_suggestion)
+        self.suggestion_list.bind("<Double-Button-1>", self._on_pick_suggestion)
+
         # Submit & Cancel buttons at the bottom
         btn_frame = tk.Frame(self.top)
         btn_frame.pack(padx=10, pady=10, fill="x", expand=True)
@@ -61,14 +72,29 @@ class ManualEntryWindow:
 
     def _on_input_changed(self, *args):
         """
-        Called whenever the entry changes. We check if it's valid.
+        Called whenever the entry changes. We check if it's valid and update the task suggestions.
         """
+        _, bar, task_part = self.line_var.get().partition("|")
+        self.suggestion_list.update_prefix(task_part.lstrip() if bar else None)
+
         line_text = self.line_var.get().strip()
         if self.time_logger.is_valid_manual_log_line(line_text):
             self.submit_btn.config(state=tk.NORMAL)
         else:
             self.submit_btn.config(state=tk.DISABLED)
 
+    def _on_pick_suggestion(self, event=None):
+        """
+        Replaces the task part of the line with the selected suggestion.
+        """
+        task_name = self.suggestion_list.selected()
+        if task_name is None:
+            return "break"
+        head = self.line_var.get().partition("|")[0].rstrip()
+        self.line_var.set(f"{head} | {task_name}")
+        self.entry.icursor(tk.END)
+        return "break"
+
     def on_submit(self):
         """
         If valid, append to time_log.txt via time_logger and close.
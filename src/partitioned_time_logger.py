@@ -0,0 +1,453 @@
+"""
+Month-partitioned storage: one log file per month (time_log-YYYY-MM.txt) plus a small manifest.
+Date and week queries only parse the months they touch; task totals of months that were not
+opened come from the manifest. Run `python -m src.partitioned_time_logger` to split an existing
+time_log.txt into monthly segments and switch the app to this layout.
+"""
+import os
+import re
+import json
+import datetime
+from src.settings_manager import AppSettings
+from src.time_logger import TimeLogger, CHANGE_NONE, CHANGE_APPEND, CHANGE_REWRITE
+from src.log_line_parser import parse_log_line, date_str_to_ordinal, ordinal_to_date_str
+from src.log_events import LogReloaded
+
+MANIFEST_FILE_NAME = "time_log_manifest.json"
+MANIFEST_VERSION = 2
+_SEGMENT_PATTERN = re.compile(r"time_log-([0-9]{4}-[0-9]{2})\.txt")
+
+
+def segment_file_name(month_key):
+    """
+    "2025-02" -> "time_log-2025-02.txt"
+    """
+    return f"time_log-{month_key}.txt"
+
+
+def month_key_for_ordinal(date_ordinal):
+    """
+    Returns the "YYYY-MM" segment key for a date ordinal.
+    """
+    return ordinal_to_date_str(date_ordinal)[:7]
+
+
+def find_segments(data_folder):
+    """
+    Returns { month_key: file name } for every segment file in data_folder.
+    """
+    try:
+        names = os.listdir(data_folder)
+    except OSError:
+        return {}
+    segments = {}
+    for name in names:
+        match = _SEGMENT_PATTERN.fullmatch(name)
+        if match:
+            segments[match.group(1)] = name
+    return segments
+
+
+class LogSegment(TimeLogger):
+    """
+    A TimeLogger over the log file of a single month.
+    Segments are small, so they are parsed directly and keep no snapshot of their own.
+    """
+
+    def __init__(self, app_settings: AppSettings, month_key):
+        self.month_key = month_key
+        super().__init__(app_settings)
+
+    def _get_log_path(self):
+        return os.path.join(self.app_settings.data_folder, segment_file_name(self.month_key))
+
+    def _load_time_log(self):
+        self._parse_time_log_file()
+
+    def _save_parse_snapshot(self):
+        pass
+
+    def summary(self):
+        """
+        Returns the manifest record of this segment, or None if its file was not parsed.
+        The size and mtime are those of the last parse, so a file edited since then
+        no longer matches its record and gets parsed again.
+        """
+        state = self._log_state
+        if state is None:
+            return None
+        return {
+            "size": state.size,
+            "mtime": state.mtime,
+            "task_minutes": dict(self._index.task_minutes),
+            "task_last_dates": self._index.task_last_dates(),
+        }
+
+
+class _PartitionedIndex:
+    """
+    Answers the LogIndex queries of a PartitionedTimeLogger by asking only the segments involved.
+    """
+
+    def __init__(self, logger):
+        self._logger = logger
+        self._task_totals = None     # merged { task_name: minutes } over all months, None if stale
+        self._task_totals_ci = None  # the same with lowercased names
+
+    def clear(self):
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Drops the merged task totals; called whenever any segment changes.
+        """
+        self._task_totals = None
+        self._task_totals_ci = None
+
+    def _merged_totals(self):
+        if self._task_totals is None:
+            totals = {}
+            totals_ci = {}
+            for task_minutes in self._logger._iter_segment_task_minutes():
+                for name, minutes in task_minutes.items():
+                    totals[name] = totals.get(name, 0) + minutes
+                    task_key = name.lower()
+                    totals_ci[task_key] = totals_ci.get(task_key, 0) + minutes
+            self._task_totals = totals
+            self._task_totals_ci = totals_ci
+        return self._task_totals
+
+    def tasks(self):
+        return self._merged_totals().keys()
+
+    def total_minutes(self):
+        return sum(self._merged_totals().values())
+
+    def task_totals(self):
+        return dict(self._merged_totals())
+
+    def minutes_for_task(self, task_name):
+        return self._merged_totals().get(task_name, 0)
+
+    def minutes_for_task_ci(self, task_name):
+        self._merged_totals()
+        return self._task_totals_ci.get(task_name.lower(), 0)
+
+    def task_last_dates(self):
+        # Months are visited in order, so a later month's date replaces an earlier one.
+        last_dates = {}
+        for task_last_dates in self._logger._iter_segment_task_last_dates():
+            last_dates.update(task_last_dates)
+        return last_dates
+
+    def _segment_index(self, date_str):
+        date_ordinal = date_str_to_ordinal(date_str)
+        if date_ordinal is None:
+            return None
+        segment = self._logger._get_segment(month_key_for_ordinal(date_ordinal))
+        return segment._index if segment is not None else None
+
+    def minutes_for_date(self, date_str):
+        index = self._segment_index(date_str)
+        return index.minutes_for_date(date_str) if index is not None else 0
+
+    def tasks_for_date(self, date_str):
+        index = self._segment_index(date_str)
+        return index.tasks_for_date(date_str) if index is not None else set()
+
+    def minutes_for_date_and_task(self, date_str, task_name):
+        index = self._segment_index(date_str)
+        return index.minutes_for_date_and_task(date_str, task_name) if index is not None else 0
+
+    def minutes_by_date(self, first_ordinal, last_ordinal):
+        # Only the segments of the months in the range are asked.
+        days = {}
+        date_ordinal = first_ordinal
+        while date_ordinal <= last_ordinal:
+            date = datetime.date.fromordinal(date_ordinal)
+            next_month = datetime.date(date.year + date.month // 12, date.month % 12 + 1, 1).toordinal()
+            segment = self._logger._get_segment(month_key_for_ordinal(date_ordinal))
+            if segment is not None:
+                days.update(segment._index.minutes_by_date(date_ordinal, min(last_ordinal, next_month - 1)))
+            date_ordinal = next_month
+        return days
+
+    def minutes_by_week(self):
+        # A week can span two months, so the weekly totals of the segments are added up.
+        weeks = {}
+        for segment in self._logger._iter_segments():
+            for monday, minutes in segment._index.minutes_by_week().items():
+                weeks[monday] = weeks.get(monday, 0) + minutes
+        return weeks
+
+    def iter_entries(self):
+        for segment in self._logger._iter_segments():
+            yield from segment._index.iter_entries()
+
+
+class PartitionedTimeLogger(TimeLogger):
+    """
+    A TimeLogger that stores every month in its own time_log-YYYY-MM.txt.
+    Appends go to the segment of the entry's date; a segment is only parsed once a query
+    needs its entries. time_log_manifest.json remembers the size, mtime and task totals
+    of every segment, so the task list and totals are available without parsing old months.
+    """
+
+    # Segments are small; a rewritten one is simply re-parsed by reload_time_log().
+    can_rebuild_in_background = False
+
+    def __init__(self, app_settings: AppSettings):
+        """
+        :param app_settings: An instance of AppSettings
+        """
+        self._segments = {}   # { month_key: LogSegment } of the parsed months
+        self._summaries = {}  # { month_key: manifest record } of the months that were not parsed
+        super().__init__(app_settings)
+
+    def _create_index(self):
+        return _PartitionedIndex(self)
+
+    def _get_manifest_path(self):
+        return os.path.join(self.app_settings.data_folder, MANIFEST_FILE_NAME)
+
+    def _load_time_log(self):
+        """
+        Splits a leftover time_log.txt into segments, then takes the summary of every
+        unchanged segment from the manifest. Segments that changed since are parsed.
+        """
+        if os.path.isfile(self._get_log_path()):
+            migrate_to_monthly_segments(self.app_settings)
+
+        try:
+            with open(self._get_manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION:
+                manifest = {}
+        except (OSError, ValueError):
+            manifest = {}
+        records = manifest.get("segments", {})
+
+        self._segments.clear()
+        self._summaries.clear()
+        self._index.invalidate()
+        for month_key, name in find_segments(self.app_settings.data_folder).items():
+            record = records.get(month_key)
+            if record is not None and self._record_matches(record, name):
+                self._summaries[month_key] = record
+            else:
+                self._load_segment(month_key)
+
+    def _record_matches(self, record, name):
+        try:
+            st = os.stat(os.path.join(self.app_settings.data_folder, name))
+        except OSError:
+            return False
+        return st.st_size == record.get("size") and st.st_mtime_ns == record.get("mtime")
+
+    def _save_manifest(self):
+        records = dict(self._summaries)
+        for month_key, segment in self._segments.items():
+            record = segment.summary()
+            if record is not None:
+                records[month_key] = record
+        manifest_path = self._get_manifest_path()
+        tmp_path = manifest_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "segments": records}, f)
+            os.replace(tmp_path, manifest_path)
+        except OSError:
+            pass
+
+    def close(self):
+        for segment in self._segments.values():
+            segment.close()
+        self._save_manifest()
+
+    def _load_segment(self, month_key):
+        segment = self._segments[month_key] = LogSegment(self.app_settings, month_key)
+        self._summaries.pop(month_key, None)
+        self._index.invalidate()
+        return segment
+
+    def _get_segment(self, month_key, create=False):
+        """
+        Returns the parsed LogSegment of month_key, parsing it on first use.
+        Returns None if the month has no file, unless create is True.
+        """
+        segment = self._segments.get(month_key)
+        if segment is not None:
+            return segment
+        if month_key in self._summaries or create:
+            return self._load_segment(month_key)
+        return None
+
+    def _iter_segments(self):
+        """
+        Yields every segment in month order, parsing the ones that were not needed yet.
+        """
+        for month_key in sorted(set(self._segments) | set(self._summaries)):
+            segment = self._get_segment(month_key)
+            if segment is not None:
+                yield segment
+
+    def _iter_segment_task_minutes(self):
+        for segment in self._segments.values():
+            yield segment._index.task_minutes
+        for record in self._summaries.values():
+            yield record["task_minutes"]
+
+    def _iter_segment_task_last_dates(self):
+        """
+        Yields { task_name: last date ordinal } of every month in month order, without parsing any segment.
+        """
+        for month_key in sorted(set(self._segments) | set(self._summaries)):
+            segment = self._segments.get(month_key)
+            if segment is not None:
+                yield segment._index.task_last_dates()
+            else:
+                yield self._summaries[month_key]["task_last_dates"]
+
+    def _get_export_log_paths(self):
+        data_folder = self.app_settings.data_folder
+        return [os.path.join(data_folder, name) for _, name in sorted(find_segments(data_folder).items())]
+
+    def _parse_time_log_file(self):
+        """
+        Forgets every parsed segment and rebuilds from the files on disk.
+        """
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        self._summaries.clear()
+        self._index.invalidate()
+        for month_key in find_segments(self.app_settings.data_folder):
+            self._load_segment(month_key)
+
+    def reload_time_log(self):
+        """
+        Picks up segment files that were added, edited or removed on disk.
+        Parsed segments reload incrementally; unparsed ones are only re-checked against the manifest.
+        Returns True (and publishes LogReloaded) if any segment changed.
+        """
+        self._invalidate_archive()
+        on_disk = find_segments(self.app_settings.data_folder)
+        changed = False
+        for month_key in list(self._segments):
+            if month_key in on_disk:
+                changed = self._segments[month_key].reload_time_log() or changed
+            else:
+                self._segments.pop(month_key).close()
+                changed = True
+        for month_key in list(self._summaries):
+            if month_key not in on_disk or not self._record_matches(self._summaries[month_key], on_disk[month_key]):
+                del self._summaries[month_key]
+        for month_key in on_disk:
+            if month_key not in self._segments and month_key not in self._summaries:
+                self._load_segment(month_key)
+                changed = True
+        if not changed:
+            return False
+        self._index.invalidate()
+        self._publish(LogReloaded())
+        return True
+
+    def poll_external_changes(self):
+        """
+        Checks every segment file for changes made by someone else: one listdir plus one os.stat per segment.
+        """
+        on_disk = find_segments(self.app_settings.data_folder)
+        if set(on_disk) != set(self._segments) | set(self._summaries):
+            return CHANGE_REWRITE
+        change = CHANGE_NONE
+        for segment in self._segments.values():
+            segment_change = segment.poll_external_changes()
+            if segment_change == CHANGE_REWRITE:
+                return CHANGE_REWRITE
+            if segment_change == CHANGE_APPEND:
+                change = CHANGE_APPEND
+        for month_key, record in self._summaries.items():
+            if not self._record_matches(record, on_disk[month_key]):
+                return CHANGE_REWRITE
+        return change
+
+    def _append_entries(self, line_strs, entries):
+        """
+        Writes every line to the segment of its entry's month, one batch per month.
+        """
+        months = {}  # { month_key: ([line_str], [entry]) }
+        for line_str, entry in zip(line_strs, entries):
+            month_lines, month_entries = months.setdefault(month_key_for_ordinal(entry.date_ordinal), ([], []))
+            month_lines.append(line_str)
+            month_entries.append(entry)
+        for month_key, (month_lines, month_entries) in sorted(months.items()):
+            self._get_segment(month_key, create=True)._append_entries(month_lines, month_entries)
+        self._index.invalidate()
+
+    def _reset_storage(self):
+        """
+        Moves every segment file to a backup and clears in-memory data.
+        """
+        for segment in self._segments.values():
+            segment.close()
+        now_str = datetime.datetime.now().strftime("%Y%m%d%H%M")
+        data_folder = self.app_settings.data_folder
+        for name in find_segments(data_folder).values():
+            path = os.path.join(data_folder, name)
+            os.rename(path, f"{path}.bak{now_str}")
+        try:
+            os.remove(self._get_manifest_path())
+        except OSError:
+            pass
+
+        self._segments.clear()
+        self._summaries.clear()
+        self._index.invalidate()
+
+
+def migrate_to_monthly_segments(app_settings: AppSettings):
+    """
+    Splits time_log.txt into time_log-YYYY-MM.txt segments (appending to segments that already
+    exist), moves it aside as time_log.txt.migratedYYYYMMDDHHMM and switches app_settings to the
+    monthly layout. Lines that are not valid log lines are kept only in the moved-aside file.
+    Returns (lines moved, lines skipped).
+    """
+    data_folder = app_settings.data_folder
+    log_path = os.path.join(data_folder, "time_log.txt")
+    if not os.path.isfile(log_path):
+        return 0, 0
+
+    months = {}  # { month_key: [raw line bytes] }
+    skipped = 0
+    newline = os.linesep.encode("ascii")
+    with open(log_path, "rb") as f:
+        for raw_line in f:
+            entry = parse_log_line(raw_line.decode("utf-8", errors="replace"))
+            if entry is None:
+                skipped += bool(raw_line.strip())
+                continue
+            if not raw_line.endswith(b"\n"):
+                raw_line += newline
+            months.setdefault(month_key_for_ordinal(entry.date_ordinal), []).append(raw_line)
+
+    for month_key, lines in months.items():
+        segment_path = os.path.join(data_folder, segment_file_name(month_key))
+        with open(segment_path, "ab") as f:
+            f.writelines(lines)
+
+    now_str = datetime.datetime.now().strftime("%Y%m%d%H%M")
+    os.rename(log_path, os.path.join(data_folder, f"time_log.txt.migrated{now_str}"))
+    try:
+        os.remove(os.path.join(data_folder, "time_log.cache"))
+    except OSError:
+        pass
+
+    if app_settings.log_layout != "monthly":
+        app_settings.log_layout = "monthly"
+        app_settings.save()
+    return sum(len(lines) for lines in months.values()), skipped
+
+
+if __name__ == "__main__":
+    moved, skipped = migrate_to_monthly_segments(AppSettings())
+    print(f"Moved {moved} lines into monthly segments, skipped {skipped} invalid lines.")
@@ -0,0 +1,174 @@
+import time
+import datetime
+from collections import deque
+from src.cron import parse_cron, CronError
+
+# Longest time (ms) between two checks of the clock, however far away the next popup is.
+TICK_MS = 5000
+# How far (s) wall-clock and monotonic time may drift apart between two checks before the
+# scheduler treats it as a suspend/hibernate or a changed system clock.
+DRIFT_TOLERANCE_S = 30
+# How many upcoming fire times are computed ahead.
+UPCOMING_FIRES = 8
+# Used while the configured expression is invalid (e.g. after a hand edit of the settings file).
+FALLBACK_CRON_EXPR = "0,15,30,45 * * * *"
+
+
+def next_fire_time(cron_expr, after):
+    """
+    Returns the first fire time of cron_expr after the datetime after.
+    """
+    return parse_cron(cron_expr).next(after)
+
+
+def prev_fire_time(cron_expr, before):
+    """
+    Returns the last fire time of cron_expr before the datetime before.
+    """
+    return parse_cron(cron_expr).prev(before)
+
+
+class SystemClock:
+    """
+    The real clocks. PopupScheduler takes any object with the same two methods,
+    so simulated time can be used instead.
+    """
+
+    def now(self):
+        return datetime.datetime.now()
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+class PopupScheduler:
+    """
+    Calls on_fire(interval_start, interval_end) whenever a fire time of the popup cron
+    expression has passed.
+    Instead of one long timer, the clock is checked at least every TICK_MS, so a timer
+    that fires late after the machine slept does not matter. Every fire time that passed
+    since the last check is reported together as one range from the end of the last
+    reported interval: nothing is lost and nothing is reported twice. If the wall clock
+    goes back (the user changed the time), the schedule starts over from the new time,
+    skipping the time that was already reported.
+    """
+
+    def __init__(self, root, get_cron_expr, on_fire, clock=None, tick_ms=TICK_MS):
+        """
+        :param root: The Tk root, used for after() scheduling
+        :param get_cron_expr: Returns the current cron expression (it can change in the settings)
+        :param on_fire: f(interval_start, interval_end), called on the Tk thread
+        :param clock: An object with now() and monotonic(), SystemClock() by default
+        """
+        self.root = root
+        self.get_cron_expr = get_cron_expr
+        self.on_fire = on_fire
+        self.clock = clock or SystemClock()
+        self.tick_ms = tick_ms
+        self._after_id = None
+        self._cron_expr = None
+        self._interval_start = None  # where the next reported interval starts
+        self._reported_until = None  # end of the last reported interval
+        self._upcoming = deque()     # the next fire times, oldest first
+        self._last_wall = None
+        self._last_monotonic = None
+
+    def start(self):
+        if self._cron_expr is None:
+            self._resync()
+        self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _resync(self):
+        """
+        Starts the schedule over from the current time, e.g. at startup, after the cron
+        expression changed or after the wall clock went back.
+        """
+        now = self.clock.now()
+        self._cron_expr = self._current_cron_expr()
+        self._upcoming.clear()
+        self._upcoming.append(next_fire_time(self._cron_expr, now))
+        self._interval_start = prev_fire_time(self._cron_expr, self._upcoming[0])
+        if self._reported_until is not None and self._interval_start < self._reported_until:
+            # The clock went back into time that was already reported; start after it.
+            self._interval_start = self._reported_until
+        self._fill_upcoming()
+        self._last_wall = now
+        self._last_monotonic = self.clock.monotonic()
+
+    def interval_ends(self, interval_start, interval_end):
+        """
+        Returns the fire times from after interval_start up to interval_end, i.e. the ends of
+        the single intervals in a reported range. The last one is always interval_end.
+        """
+        ends = list(parse_cron(self._cron_expr).fire_times(interval_start, interval_end))
+        if not ends or ends[-1] != interval_end:
+            ends.append(interval_end)  # the cron expression changed in between
+        return ends
+
+    def _current_cron_expr(self):
+        cron_expr = self.get_cron_expr()
+        try:
+            parse_cron(cron_expr)
+        except CronError:
+            return FALLBACK_CRON_EXPR
+        return cron_expr
+
+    def _fill_upcoming(self):
+        while len(self._upcoming) < UPCOMING_FIRES:
+            self._upcoming.append(next_fire_time(self._cron_expr, self._upcoming[-1]))
+
+    def _schedule(self):
+        """
+        Checks again in tick_ms, or right at the next fire time if that comes first.
+        """
+        until_next = (self._upcoming[0] - self.clock.now()).total_seconds() * 1000
+        delay = max(0, min(self.tick_ms, int(until_next) + 1))
+        self._after_id = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.check()
+        finally:
+            self._schedule()
+
+    def check(self):
+        """
+        Reports the fire times that passed since the last check, if any.
+        """
+        now = self.clock.now()
+        monotonic = self.clock.monotonic()
+        drift = (now - self._last_wall).total_seconds() - (monotonic - self._last_monotonic)
+        self._last_wall = now
+        self._last_monotonic = monotonic
+
+        if self._current_cron_expr() != self._cron_expr:
+            self._resync()
+            return
+        if drift < -DRIFT_TOLERANCE_S:
+            # The clock was set back; the interval in progress no longer makes sense.
+            self._resync()
+            return
+        # A forward jump (drift > DRIFT_TOLERANCE_S, i.e. a suspend or a clock set forward)
+        # needs no special care: every fire time up to now is simply caught up below.
+
+        interval_end = None
+        while self._upcoming and self._upcoming[0] <= now:
+            interval_end = self._upcoming.popleft()
+        if interval_end is None:
+            return
+        if not self._upcoming:
+            # Slept past every precomputed fire time: find the last one that passed directly.
+            interval_end = prev_fire_time(self._cron_expr, now + datetime.timedelta(seconds=1))
+            self._upcoming.append(next_fire_time(self._cron_expr, interval_end))
+        self._fill_upcoming()
+        if interval_end <= self._interval_start:
+            return  # already reported before the clock went back
+        interval_start, self._interval_start = self._interval_start, interval_end
+        self._reported_until = interval_end
+        self.on_fire(interval_start, interval_end)
@@ -1,85 +1,211 @@
+import time
+import logging
+import datetime
 import tkinter as tk
 from tkinter import ttk
 import winsound
 from src.settings_manager import AppSettings
 from src.utils import resource_path
+from src.task_suggestion_list import TaskSuggestionList
+
+# Most time (ms) from a timer fire until the popup is on screen; slower shows are logged (debug level).
+POPUP_LATENCY_TARGET_MS = 100
+
+_log = logging.getLogger(__name__)
+
 
 class PopupWindow:
     """
     Represents the 15-minute "What did you work on?" popup.
+    The window is built once and hidden; show() only updates the interval label and the
+    task suggestions and brings it back, so popping up costs almost nothing.
+    Typing a task filters the suggestions (ranked by frecency) by prefix.
+    Intervals that end while it is still open are added to it with extend(), so one
+    popup covers the whole unanswered span. The "Log until" choice splits the span:
+    the task is logged up to the chosen time and the popup stays open for the rest.
+    It starts at the last interval end of the day the span starts on, so a span left open
+    overnight is not logged as one task unless the user picks a later end.
     """
-    def __init__(self, parent, interval_start, interval_end, known_tasks, on_submit, sound_on=True):
+    def __init__(self, parent, suggest_tasks, on_submit, sound_on=True):
         """
         :param parent: The parent window (or root)
-        :param interval_start: datetime for the start of the interval
-        :param interval_end: datetime for the end of the interval
-        :param known_tasks: List or set of existing tasks (for combobox)
+        :param suggest_tasks: Function (prefix, limit) -> task names, e.g. TimeLogger.suggest_tasks
         :param on_submit: Callback when the user clicks submit, signature: f(task_name, start_dt, end_dt)
         :param sound_on: Whether to play a sound on popup
         """
         self.parent = parent
-        self.interval_start = interval_start
-        self.interval_end = interval_end
-        self.known_tasks = sorted(known_tasks)
+        self.interval_start = None
+        self.interval_end = None
+        self.interval_ends = []  # the end of every interval in the span, in order
+        self._chosen_split = None  # index into interval_ends picked in "Log until", None until the user picks one
+        self.is_open = False
+        self.suggest_tasks = suggest_tasks
         self.on_submit = on_submit
         self.sound_on = sound_on
+        self.wav_path = resource_path("wogger.wav")
+
+        self._shown_at = None       # time.perf_counter() of the fire being shown, until it is on screen
+        self.last_latency_ms = None  # fire-to-screen time of the last show()
 
-        # Create the top-level popup window
+        # Create the top-level popup window, hidden until the first show()
         self.popup = tk.Toplevel(self.parent)
+        self.popup.withdraw()
         self.popup.title("Time Tracking")
         self.popup.attributes("-topmost", True)
-        
-        # Play wogger.wav sound if sound is enabled.
-        if self.sound_on:
-            wav_path = resource_path("wogger.wav")
-            winsound.PlaySound(wav_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        self.popup.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.popup.bind("<Map>", self._on_map)
 
         self._build_ui()
 
     def _build_ui(self):
         # Show the interval label
-        interval_label = f"{self.interval_start.strftime('%H:%M')} - {self.interval_end.strftime('%H:%M')}"
-        tk.Label(
-            self.popup,
-            text=f"What did you work on during {interval_label}?",
-            font=("TkDefaultFont", 10, "bold")
-        ).pack(padx=10, pady=10)
+        self.interval_label = tk.Label(self.popup, text="", font=("TkDefaultFont", 10, "bold"))
+        self.interval_label.pack(padx=10, pady=10)
 
         frame = tk.Frame(self.popup)
         frame.pack(padx=10, pady=5)
 
-        # A combobox for selecting existing tasks
-        tk.Label(frame, text="Select a previous task:").grid(row=0, column=0, sticky="w")
-        self.combo_var = tk.StringVar()
-        combo = ttk.Combobox(
-            frame,
-            textvariable=self.combo_var,
-            values=self.known_tasks,
-            state="readonly"
-        )
-        combo.grid(row=0, column=1, padx=5, pady=5)
-
-        # An entry for new tasks
-        tk.Label(frame, text="Or type a new task:").grid(row=1, column=0, sticky="w")
+        # An entry for the task, with the matching previous tasks listed below it
+        tk.Label(frame, text="Task (type to filter):").grid(row=0, column=0, sticky="w")
         self.new_task_var = tk.StringVar()
-        new_task_entry = tk.Entry(frame, textvariable=self.new_task_var, width=30)
-        new_task_entry.grid(row=1, column=1, padx=5, pady=5)
-        new_task_entry.focus()  # Focus on the new-task entry by default
+        self.new_task_entry = tk.Entry(frame, textvariable=self.new_task_var, width=30)
+        self.new_task_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        self.suggestion_list = TaskSuggestionList(frame, self.suggest_tasks, height=6, width=30)
+        self.suggestion_list.grid(row=1, column=1, padx=5, sticky="ew")
+        self.new_task_var.trace_add("write", self._on_task_typed)
+        self.new_task_entry.bind("<Down>", lambda event: self.suggestion_list.move(1))
+        self.new_task_entry.bind("<Up>", lambda event: self.suggestion_list.move(-1))
+        self.new_task_entry.bind("<Return>", lambda event: self._on_submit())
+        self.suggestion_list.bind("<Double-Button-1>", lambda event: self._on_submit())
+
+        # Where to split the span; only shown once it covers more than one interval
+        self.until_label = tk.Label(frame, text="Log until:")
+        self.until_var = tk.StringVar()
+        self.until_combo = ttk.Combobox(frame, textvariable=self.until_var, state="readonly", width=12)
+        self.until_combo.bind("<<ComboboxSelected>>", self._on_until_selected)
 
         submit_btn = tk.Button(self.popup, text="Submit", command=self._on_submit)
         submit_btn.pack(pady=5)
 
+    def _on_task_typed(self, *args):
+        self.suggestion_list.update_prefix(self.new_task_var.get().lstrip())
+
+    def show(self, interval_start, interval_ends, fired_at=None):
+        """
+        Asks about the span from interval_start to the last of interval_ends, or adds
+        interval_ends to the span if the popup is still open.
+        :param fired_at: time.perf_counter() of the timer fire, to measure the popup latency
+        """
+        if self.is_open:
+            self.extend(interval_ends)
+            return
+        self._shown_at = fired_at if fired_at is not None else time.perf_counter()
+        self.is_open = True
+        self.interval_start = interval_start
+        self.interval_ends = list(interval_ends)
+        self.interval_end = self.interval_ends[-1]
+        self._chosen_split = None
+        self.new_task_var.set("")  # also shows the top suggestions
+        self._update_span()
+
+        self.popup.deiconify()
+        self.popup.lift()
+        self.new_task_entry.focus_force()  # Focus on the new-task entry by default
+
+        # Play wogger.wav sound if sound is enabled.
+        if self.sound_on:
+            winsound.PlaySound(self.wav_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+
+    def _on_map(self, event):
+        """
+        Records how long the popup took from the timer fire to the screen.
+        """
+        if event.widget is not self.popup or self._shown_at is None:
+            return
+        self.last_latency_ms = (time.perf_counter() - self._shown_at) * 1000
+        self._shown_at = None
+        if self.last_latency_ms > POPUP_LATENCY_TARGET_MS:
+            _log.debug("Popup took %.0f ms to show (target %d ms)", self.last_latency_ms, POPUP_LATENCY_TARGET_MS)
+
+    def _format_time(self, dt):
+        if dt.date() == self.interval_start.date():
+            return dt.strftime("%H:%M")
+        return dt.strftime("%a %H:%M")
+
+    def _on_until_selected(self, event):
+        self._chosen_split = self.until_combo.current()
+
+    def _default_split(self):
+        """
+        Returns the index of the interval end that "Log until" starts at: the last one up to the
+        midnight after interval_start, but at least the first.
+        """
+        day_end = datetime.datetime.combine(self.interval_start.date() + datetime.timedelta(days=1), datetime.time())
+        split = 0
+        for i, end in enumerate(self.interval_ends):
+            if end <= day_end:
+                split = i
+        return split
+
+    def _update_span(self):
+        """
+        Shows the current span in the label and its interval ends in the "Log until" choice,
+        keeping the end the user picked, if any.
+        """
+        interval_label = f"{self._format_time(self.interval_start)} - {self._format_time(self.interval_end)}"
+        self.interval_label.config(text=f"What did you work on during {interval_label}?")
+        if len(self.interval_ends) > 1:
+            values = [self._format_time(end) for end in self.interval_ends]
+            self.until_combo.config(values=values)
+            self.until_combo.current(self._default_split() if self._chosen_split is None else self._chosen_split)
+            self.until_label.grid(row=2, column=0, sticky="w")
+            self.until_combo.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        else:
+            self.until_label.grid_remove()
+            self.until_combo.grid_remove()
+
+    def extend(self, interval_ends):
+        """
+        Adds the intervals that ended at interval_ends (in order) to the span and brings the popup to the front.
+        """
+        self.interval_ends.extend(interval_ends)
+        self.interval_end = self.interval_ends[-1]
+        self._update_span()
+        self.popup.lift()
+
+    def _hide(self):
+        self.is_open = False
+        self.popup.withdraw()
+
+    def _on_close(self):
+        self._hide()
+
     def _on_submit(self):
-        selected = self.combo_var.get().strip()
+        selected = self.suggestion_list.selected()
         typed = self.new_task_var.get().strip()
 
-        if typed:
-            task_name = typed
-        elif selected:
+        if selected:
             task_name = selected
+        elif typed:
+            task_name = typed
         else:
             task_name = "Unspecified"
 
+        # Log up to the chosen interval end; the rest of the span stays open
+        split = self.until_combo.current() if len(self.interval_ends) > 1 else -1
+        if split < 0:
+            split = len(self.interval_ends) - 1
+        end = self.interval_ends[split]
+
         # Callback to the outside world
-        self.on_submit(task_name, self.interval_start, self.interval_end)
-        self.popup.destroy()
+        self.on_submit(task_name, self.interval_start, end)
+
+        if split == len(self.interval_ends) - 1:
+            self._hide()
+            return
+        self.interval_start = end
+        self.interval_ends = self.interval_ends[split + 1:]
+        self._chosen_split = None
+        self.new_task_var.set("")
+        self._update_span()
@@ -42,7 +42,13 @@ class AppSettings:
             "standart_work_day": 450,
             "standart_days_in_week": 5,
             "wogger_mode": False,
-            "show_week_overview": False
+            "show_week_overview": False,
+            "storage_backend": "text",  # "text" (time_log.txt) or "sqlite" (time_log.sqlite3)
+            "sqlite_mirror_text_log": True,
+            "log_layout": "single",  # "single" (time_log.txt) or "monthly" (time_log-YYYY-MM.txt)
+            "incremental_export": False,  # True: the export button only writes rows added since the last export
+            "log_durability": "flush",  # "flush", "fsync" (every write) or "interval" (see log_writer.py)
+            "log_fsync_interval_ms": 1000  # fsync interval of the "interval" durability mode
         }
 
         self._settings_data = {}
@@ -155,3 +161,51 @@ class AppSettings:
     @show_week_overview.setter
     def show_week_overview(self, value: bool):
         self._settings_data["show_week_overview"] = bool(value)
+
+    @property
+    def storage_backend(self):
+        return self._settings_data.get("storage_backend", "text")
+
+    @storage_backend.setter
+    def storage_backend(self, backend: str):
+        self._settings_data["storage_backend"] = backend
+
+    @property
+    def sqlite_mirror_text_log(self):
+        return self._settings_data.get("sqlite_mirror_text_log", True)
+
+    @sqlite_mirror_text_log.setter
+    def sqlite_mirror_text_log(self, value: bool):
+        self._settings_data["sqlite_mirror_text_log"] = bool(value)
+
+    @property
+    def log_layout(self):
+        return self._settings_data.get("log_layout", "single")
+
+    @log_layout.setter
+    def log_layout(self, layout: str):
+        self._settings_data["log_layout"] = layout
+
+    @property
+    def incremental_export(self):
+        return self._settings_data.get("incremental_export", False)
+
+    @incremental_export.setter
+    def incremental_export(self, value: bool):
+        self._settings_data["incremental_export"] = bool(value)
+
+    @property
+    def log_durability(self):
+        return self._settings_data.get("log_durability", "flush")
+
+    @log_durability.setter
+    def log_durability(self, mode: str):
+        self._settings_data["log_durability"] = mode
+
+    @property
+    def log_fsync_interval_ms(self):
+        return self._settings_data.get("log_fsync_interval_ms", 1000)
+
+    @log_fsync_interval_ms.setter
+    def log_fsync_interval_ms(self, interval_ms: int):
+        self._settings_data["log_fsync_interval_ms"] = int(interval_ms)
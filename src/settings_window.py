@@ -5,6 +5,7 @@ import winsound
 from src.main_ui import MainUI
 from src.settings_manager import AppSettings
 from src.utils import resource_path
+from src.cron import parse_cron, CronError
 
 class SettingsWindow:
     """
@@ -52,7 +53,13 @@ class SettingsWindow:
         # --- Popup Interval ---
         tk.Label(frame, text="⌛ Popup Schedule (cron expression):", font=FONT).grid(row=2, column=0, sticky="e", padx=(0,5))
         self.popup_cron_var = tk.StringVar(value=str(self.app_settings.popup_cron))
-        tk.Entry(frame, textvariable=self.popup_cron_var, width=40).grid(row=2, column=1, pady=5, sticky="w")
+        cron_frame = tk.Frame(frame)
+        cron_frame.grid(row=2, column=1, pady=5, sticky="w")
+        tk.Entry(cron_frame, textvariable=self.popup_cron_var, width=40).pack(anchor="w")
+        self.cron_info_label = tk.Label(cron_frame, text="", font=FONT)
+        self.cron_info_label.pack(anchor="w")
+        self.popup_cron_var.trace_add("write", self._update_cron_info)
+        self._update_cron_info()
 
         # --- Work Schedule (minutes per day) ---
         schedule_frame = tk.LabelFrame(frame, text="Minutes to Work Each Day 📆", font=FONT)
@@ -153,11 +160,12 @@ class SettingsWindow:
 
         # Retrieve and validate the cron expression from the UI.
         cron_expr = str(self.popup_cron_var.get()).strip()
-        if not self._is_valid_cron(cron_expr):
+        error = self._cron_error(cron_expr)
+        if error:
             tk.messagebox.showerror(
                 "Invalid Cron Expression",
                 (
-                    "The cron expression is invalid. A valid cron expression should have 5 fields separated by spaces.\n"
+                    f"The cron expression is invalid: {error}.\n"
                     "Example: '0,15,30,45 * * * *' for every 15 minutes.\n"
                     "Please refer to online documentation for more details."
                 )
@@ -187,17 +195,24 @@ class SettingsWindow:
         """
         self.window.destroy()
 
-    def _is_valid_cron(self, cron_expr):
+    def _cron_error(self, cron_expr):
         """
-        Validate a cron expression. A valid cron expression has 5 fields separated by spaces.
-        This function now accepts fields that contain only the allowed characters.
+        Returns why cron_expr is not a valid cron expression, or None if it is valid.
         """
-        parts = cron_expr.split()
-        if len(parts) != 5:
-            return False
-        for part in parts:
-            cleaned = part.replace('*', '').replace(',', '').replace('-', '')
-            # If 'cleaned' is empty, it means the part contained only allowed characters.
-            if cleaned and not cleaned.isdigit():
-                return False
-        return True
+        try:
+            parse_cron(cron_expr)
+        except CronError as e:
+            return str(e)
+        return None
+
+    def _update_cron_info(self, *args):
+        """
+        Shows the expected number of popups per week for the typed cron expression, or what is wrong with it.
+        """
+        cron_expr = str(self.popup_cron_var.get()).strip()
+        try:
+            fires = parse_cron(cron_expr).fires_per_week()
+        except CronError as e:
+            self.cron_info_label.config(text=str(e), fg="red")
+            return
+        self.cron_info_label.config(text=f"≈ {fires} popups per week", fg="gray")
@@ -0,0 +1,407 @@
+import os
+import json
+import sqlite3
+import threading
+import contextlib
+import datetime
+from src.settings_manager import AppSettings
+from src.time_logger import TimeLogger, _LogFileState, CHANGE_NONE
+from src.log_line_parser import (
+    LogEntry, hhmm_to_minute_of_day, date_str_to_ordinal, ordinal_to_date_str, minute_of_day_to_hhmm
+)
+
+DB_FILE_NAME = "time_log.sqlite3"
+# Rows fetched at a time by SqliteLogIndex.iter_entries()
+ITER_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    minutes INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    task_lower TEXT NOT NULL,
+    from_text_log INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date);
+CREATE INDEX IF NOT EXISTS idx_entries_task ON entries(task);
+CREATE INDEX IF NOT EXISTS idx_entries_task_lower ON entries(task_lower);
+CREATE INDEX IF NOT EXISTS idx_entries_date_task ON entries(date, task_lower);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB
+);
+"""
+
+
+class SqliteLogIndex:
+    """
+    Same interface as LogIndex, but the entries live in an SQLite table
+    and every query is an indexed SQL aggregate.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        # isolation_level=None: single statements autocommit, bulk work uses transaction().
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "from_text_log" not in columns:
+            # Databases created before the column existed only held entries from time_log.txt.
+            self._conn.execute("ALTER TABLE entries ADD COLUMN from_text_log INTEGER NOT NULL DEFAULT 1")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Groups everything done inside the with-block into one transaction.
+        Nested blocks join the outer transaction.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _scalar(self, sql, params=()):
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def clear_text_log_entries(self):
+        """
+        Deletes the entries that came from (or were mirrored to) time_log.txt,
+        keeping the ones that only exist in the database.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE from_text_log = 1")
+
+    def add(self, entry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (date, start_time, end_time, minutes, task, task_lower) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.date, entry.start_time, entry.end_time, entry.duration, entry.task, entry.task.lower())
+            )
+
+    def add_entries(self, entries, from_text_log=True):
+        """
+        Inserts many LogEntry objects with one executemany().
+        :param from_text_log: False for entries that were not written to time_log.txt
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO entries (date, start_time, end_time, minutes, task, task_lower, from_text_log) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (entry.date, entry.start_time, entry.end_time, entry.duration, entry.task, entry.task.lower(),
+                     int(from_text_log))
+                    for entry in entries
+                )
+            )
+
+    def add_columns(self, dates, starts, ends, task_ids, task_names):
+        """
+        Inserts many entries at once, as produced by log_numpy.parse_log_bytes().
+        The columns may be NumPy arrays or array.array objects.
+        """
+        rows = (
+            (
+                ordinal_to_date_str(date_ordinal),
+                minute_of_day_to_hhmm(start),
+                minute_of_day_to_hhmm(end),
+                end - start,
+                task_names[task_id],
+                task_names[task_id].lower()
+            )
+            for date_ordinal, start, end, task_id in zip(
+                dates.tolist(), starts.tolist(), ends.tolist(), task_ids.tolist()
+            )
+        )
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO entries (date, start_time, end_time, minutes, task, task_lower) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def merge_snapshot(self, data):
+        """
+        Inserts the entries of a LogIndex, given as its to_snapshot() data.
+        """
+        dates, starts, ends, task_ids = data["columns"]
+        self.add_columns(dates, starts, ends, task_ids, data["task_names"])
+
+    def minutes_by_date(self, first_ordinal, last_ordinal):
+        """
+        Returns { date_ordinal: minutes } for the days from first_ordinal to last_ordinal
+        (inclusive) that have entries, in one query.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, SUM(minutes) FROM entries WHERE date BETWEEN ? AND ? GROUP BY date",
+                (ordinal_to_date_str(first_ordinal), ordinal_to_date_str(last_ordinal))
+            ).fetchall()
+        days = {}
+        for date_str, minutes in rows:
+            date_ordinal = date_str_to_ordinal(date_str)
+            if date_ordinal is not None:
+                days[date_ordinal] = minutes
+        return days
+
+    def minutes_by_week(self):
+        """
+        Returns { monday_ordinal: minutes } over all entries.
+        """
+        weeks = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT date, SUM(minutes) FROM entries GROUP BY date").fetchall()
+        for date_str, minutes in rows:
+            date_ordinal = date_str_to_ordinal(date_str)
+            monday = date_ordinal - (date_ordinal - 1) % 7
+            weeks[monday] = weeks.get(monday, 0) + minutes
+        return weeks
+
+    def archive_entries(self, table_name):
+        """
+        Copies every entry into a new backup table named table_name, or table_name with
+        a "_<n>" suffix if that table already exists. Returns the name of the table.
+        """
+        with self._lock:
+            name, counter = table_name, 1
+            while self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone():
+                name = f"{table_name}_{counter}"
+                counter += 1
+            self._conn.execute(f'CREATE TABLE "{name}" AS SELECT * FROM entries')
+        return name
+
+    def tasks(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT task FROM entries").fetchall()
+        return [row[0] for row in rows]
+
+    def total_minutes(self):
+        return self._scalar("SELECT SUM(minutes) FROM entries")
+
+    def task_totals(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT task, SUM(minutes) FROM entries GROUP BY task").fetchall()
+        return dict(rows)
+
+    def task_last_dates(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT task, MAX(date) FROM entries GROUP BY task").fetchall()
+        last_dates = {}
+        for task, date_str in rows:
+            date_ordinal = date_str_to_ordinal(date_str)
+            if date_ordinal is not None:
+                last_dates[task] = date_ordinal
+        return last_dates
+
+    def minutes_for_task(self, task_name):
+        return self._scalar("SELECT SUM(minutes) FROM entries WHERE task = ?", (task_name,))
+
+    def minutes_for_task_ci(self, task_name):
+        return self._scalar("SELECT SUM(minutes) FROM entries WHERE task_lower = ?", (task_name.lower(),))
+
+    def minutes_for_date(self, date_str):
+        return self._scalar("SELECT SUM(minutes) FROM entries WHERE date = ?", (date_str,))
+
+    def tasks_for_date(self, date_str):
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT task FROM entries WHERE date = ?", (date_str,)).fetchall()
+        return {row[0] for row in rows}
+
+    def minutes_for_date_and_task(self, date_str, task_name):
+        return self._scalar(
+            "SELECT SUM(minutes) FROM entries WHERE date = ? AND task_lower = ?",
+            (date_str, task_name.lower())
+        )
+
+    def iter_entries(self):
+        # Fetched in batches so that walking a large table does not load it all at once.
+        with self._lock:
+            cursor = self._conn.execute("SELECT date, start_time, end_time, task FROM entries ORDER BY id")
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(ITER_BATCH_SIZE)
+            if not rows:
+                return
+            for date_str, start_time, end_time, task in rows:
+                yield LogEntry(
+                    date_str_to_ordinal(date_str),
+                    hhmm_to_minute_of_day(start_time),
+                    hhmm_to_minute_of_day(end_time),
+                    task
+                )
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class SqliteTimeLogger(TimeLogger):
+    """
+    A TimeLogger that keeps its entries in time_log.sqlite3 (WAL mode) instead of in memory.
+    An existing time_log.txt is imported on first use. While app_settings.sqlite_mirror_text_log
+    is on, every entry is also appended to time_log.txt and hand edits to that file are
+    picked up on reload; with it off, the database is the only store.
+    """
+
+    # Rewrites are re-imported inside a database transaction, not into a separate index.
+    can_rebuild_in_background = False
+
+    def __init__(self, app_settings: AppSettings):
+        """
+        :param app_settings: An instance of AppSettings
+        """
+        self.app_settings = app_settings
+        os.makedirs(self.app_settings.data_folder, exist_ok=True)
+        super().__init__(app_settings)
+
+    def _get_db_path(self):
+        return os.path.join(self.app_settings.data_folder, DB_FILE_NAME)
+
+    def _create_index(self):
+        return SqliteLogIndex(self._get_db_path())
+
+    @property
+    def mirror_text_log(self):
+        return self.app_settings.sqlite_mirror_text_log
+
+    def close(self):
+        super().close()
+        self._index.close()
+
+    def _load_time_log(self):
+        """
+        Imports time_log.txt the first time the database is used; afterwards only
+        what changed in the text file since the last run (if mirroring) is imported.
+        """
+        if self._index.get_meta("text_log_imported") is None:
+            self._parse_time_log_file()
+            self._index.set_meta("text_log_imported", 1)
+            return
+        if self.mirror_text_log:
+            self._log_state = self._load_log_state()
+            self.reload_time_log()
+
+    def _save_parse_snapshot(self):
+        """
+        The database already persists the parsed entries; no snapshot is needed.
+        """
+        pass
+
+    def _parse_time_log_file(self):
+        """
+        (Re-)imports time_log.txt. Only the entries that came from the text file are replaced;
+        entries added while mirroring was off are not in it and are kept.
+        """
+        with self._index.transaction():
+            self._index.clear_text_log_entries()
+            self._log_state = None
+            log_path = self._get_log_path()
+            if os.path.isfile(log_path):
+                self._log_state = self._parse_into(self._index, log_path, None)
+            self._save_log_state()
+
+    def _parse_from_offset(self, log_path, state):
+        with self._index.transaction():
+            appended = super()._parse_from_offset(log_path, state)
+            if appended is not None:
+                self._save_log_state()
+        return appended
+
+    def poll_external_changes(self):
+        """
+        Without mirroring, time_log.txt is not read, so edits to it never count as changes.
+        """
+        if self.mirror_text_log:
+            return super().poll_external_changes()
+        return CHANGE_NONE
+
+    def reload_time_log(self):
+        """
+        Re-imports hand edits of time_log.txt. Without mirroring the database is
+        the only store, so there is nothing to reload.
+        A missing or unreadable mirror leaves the database alone; the parse state is dropped,
+        so the file is imported again once it can be read.
+        """
+        if not self.mirror_text_log:
+            return False
+        try:
+            os.stat(self._get_log_path())
+            return super().reload_time_log()
+        except OSError:
+            self._log_state = None
+            self._save_log_state()
+            return False
+
+    def _get_export_log_paths(self):
+        """
+        Without mirroring, time_log.txt is not kept up to date; exports then read the database.
+        """
+        if self.mirror_text_log:
+            return super()._get_export_log_paths()
+        return None
+
+    def _append_entries(self, line_strs, entries):
+        if self.mirror_text_log:
+            self._append_log_lines(line_strs)
+        with self._index.transaction():
+            self._index.add_entries(entries, from_text_log=self.mirror_text_log)
+            self._save_log_state()
+
+    def _reset_storage(self):
+        """
+        Moves time_log.txt to a backup and the database entries to a backup table.
+        """
+        now_str = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        with self._index.transaction():
+            self._index.archive_entries(f"entries_bak{now_str}")
+            super()._reset_storage()
+            self._save_log_state()
+
+    def _save_log_state(self):
+        """
+        Stores the text-file parse state next to the entries, so the next
+        start only has to import what was appended since.
+        """
+        state = self._log_state
+        if state is None:
+            self._index.set_meta("log_state", None)
+            return
+        self._index.set_meta("log_state", json.dumps([state.offset, state.size, state.mtime, state.inode, state.checksum]))
+        self._index.set_meta("log_state_tail", state.tail_bytes)
+
+    def _load_log_state(self):
+        raw = self._index.get_meta("log_state")
+        if not raw:
+            return None
+        values = json.loads(raw)
+        if len(values) != 5:
+            return None  # stored before the checksum was kept; the text log is imported again
+        offset, size, mtime, inode, checksum = values
+        return _LogFileState(offset, size, mtime, inode, self._index.get_meta("log_state_tail", b""), checksum)
@@ -0,0 +1,56 @@
+import tkinter as tk
+
+
+class TaskSuggestionList(tk.Listbox):
+    """
+    A short list of ranked task names for type-ahead under an Entry.
+    update_prefix() is called on every keystroke; it asks suggest(prefix, limit)
+    (e.g. TimeLogger.suggest_tasks) for at most `height` names and only touches
+    the Listbox when they differ from the ones shown.
+    """
+
+    def __init__(self, parent, suggest, height=6, **kwargs):
+        """
+        :param parent: The parent widget
+        :param suggest: Function (prefix, limit) -> list of task names, best first
+        :param height: Number of suggestions shown
+        """
+        super().__init__(parent, height=height, exportselection=False, activestyle="none", **kwargs)
+        self.suggest = suggest
+        self._limit = height
+        self._names = []
+
+    def update_prefix(self, prefix):
+        """
+        Shows the suggestions for prefix, or none if prefix is None. Clears the selection.
+        """
+        names = self.suggest(prefix, self._limit) if prefix is not None else []
+        if names != self._names:
+            self._names = names
+            self.delete(0, tk.END)
+            if names:
+                self.insert(tk.END, *names)
+        self.selection_clear(0, tk.END)
+
+    def selected(self):
+        """
+        Returns the selected task name, or None.
+        """
+        selection = self.curselection()
+        return self._names[selection[0]] if selection else None
+
+    def move(self, delta):
+        """
+        Moves the selection by delta rows (for the Up/Down keys of the Entry).
+        """
+        if self._names:
+            selection = self.curselection()
+            if selection:
+                i = selection[0] + delta
+            else:
+                i = 0 if delta > 0 else len(self._names) - 1
+            i = max(0, min(i, len(self._names) - 1))
+            self.selection_clear(0, tk.END)
+            self.selection_set(i)
+            self.see(i)
+        return "break"
@@ -0,0 +1,154 @@
+"""
+Ranked task-name suggestions for type-ahead in the popup and the manual entry window.
+Every task gets a "frecency" score: every ENTRY_MINUTES logged count 1 (an entry at least 1),
+halved for every HALF_LIFE_DAYS they lie in the past, so tasks used often and recently come first.
+Names are kept in a radix trie (case-insensitive) whose nodes remember the best TOP_K
+names below them, so a lookup costs O(len(prefix) + TOP_K) however many tasks there are.
+The index is seeded from per-task totals (from_totals), so building it never walks the entries.
+"""
+import math
+
+HALF_LIFE_DAYS = 30
+# Logged minutes that count 1 towards a score (the default popup interval).
+ENTRY_MINUTES = 15
+# How many ranked names every trie node keeps, i.e. the most suggestions a lookup returns.
+TOP_K = 20
+
+
+def _minutes_log2(minutes):
+    """
+    Returns log2 of what minutes logged count towards a score; never less than 0.
+    """
+    return math.log2(max(minutes, ENTRY_MINUTES) / ENTRY_MINUTES)
+
+
+def _add_log2(a, b):
+    """
+    Returns log2(2**a + 2**b) without overflowing for large a and b.
+    """
+    if a < b:
+        a, b = b, a
+    return a + math.log2(1 + 2 ** (b - a))
+
+
+class _Node:
+    __slots__ = ("label", "children", "top")
+
+    def __init__(self, label):
+        self.label = label    # the (lowercase) characters on the edge from the parent
+        self.children = {}    # { first character of the child's label: child }
+        self.top = []         # best names in this subtree, highest score first, at most TOP_K
+
+
+class TaskSuggestionIndex:
+    """
+    A prefix trie of task names ranked by frecency. Scores only ever grow (add()), which
+    keeps the per-node top lists exact without looking at the rest of the subtree.
+    """
+
+    def __init__(self):
+        self._root = _Node("")
+        # { task name: log2 of the summed entry weights, with weights counted from day 0 };
+        # comparing these ranks tasks exactly like the weights relative to today would.
+        self._scores = {}
+
+    @classmethod
+    def from_totals(cls, task_minutes, last_dates):
+        """
+        Builds the index from { task name: minutes } and { task name: date ordinal of its last entry }
+        (an index's task_totals() and task_last_dates()), in O(number of tasks).
+        All minutes of a task count as if they were logged on the day it was last used;
+        entries added later with add() count on their own dates.
+        """
+        index = cls()
+        for task_name, minutes in task_minutes.items():
+            last_date = last_dates.get(task_name)
+            if last_date is not None:
+                index._scores[task_name] = last_date / HALF_LIFE_DAYS + _minutes_log2(minutes)
+        for task_name in sorted(index._scores, key=index._scores.get, reverse=True):
+            for node in index._path(task_name.lower()):
+                if len(node.top) < TOP_K:
+                    node.top.append(task_name)  # inserted best first, so no reordering needed
+        return index
+
+    def add(self, task_name, date_ordinal, minutes=ENTRY_MINUTES):
+        """
+        Counts one more entry of task_name, of minutes on date_ordinal.
+        """
+        score = date_ordinal / HALF_LIFE_DAYS + _minutes_log2(minutes)
+        old = self._scores.get(task_name)
+        if old is not None:
+            score = _add_log2(old, score)
+        self._scores[task_name] = score
+        for node in self._path(task_name.lower()):
+            self._promote(node.top, task_name, score)
+
+    def add_entries(self, entries):
+        for entry in entries:
+            self.add(entry.task, entry.date_ordinal, entry.duration)
+
+    def _promote(self, top, task_name, score):
+        """
+        Moves task_name up to its place in a node's top list after its score grew.
+        """
+        if task_name in top:
+            top.remove(task_name)
+        elif len(top) >= TOP_K and score <= self._scores[top[-1]]:
+            return
+        i = 0
+        while i < len(top) and self._scores[top[i]] >= score:
+            i += 1
+        top.insert(i, task_name)
+        del top[TOP_K:]
+
+    def _path(self, key):
+        """
+        Returns the nodes from the root to the node of key, creating and splitting nodes as needed.
+        """
+        node = self._root
+        path = [node]
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                child = _Node(key[i:])
+                node.children[key[i]] = child
+                path.append(child)
+                return path
+            label = child.label
+            j = 1
+            while j < len(label) and i + j < len(key) and label[j] == key[i + j]:
+                j += 1
+            if j < len(label):
+                # Split the edge: the new node covers the same subtree, so it starts with the same top list.
+                middle = _Node(label[:j])
+                middle.top = list(child.top)
+                child.label = label[j:]
+                middle.children[child.label[0]] = child
+                node.children[key[i]] = middle
+                child = middle
+            path.append(child)
+            node = child
+            i += j
+        return path
+
+    def suggest(self, prefix="", limit=10):
+        """
+        Returns up to limit task names starting with prefix (case-insensitive), best ranked first.
+        """
+        key = prefix.lower()
+        node = self._root
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                return []
+            label = child.label
+            if key.startswith(label, i):
+                i += len(label)
+            elif label.startswith(key[i:]):
+                return child.top[:limit]
+            else:
+                return []
+            node = child
+        return node.top[:limit]
@@ -1,21 +1,230 @@
 import os
+import zlib
 import datetime
+from itertools import chain
 from src.settings_manager import AppSettings
-from src.utils import compute_minutes_between, format_minutes_pretty
+from src.utils import format_minutes_pretty
+from src.log_index import LogIndex
+from src.log_archive import LogArchive, HistoryIndex, find_archive_files
+from src.log_line_parser import LogEntry, END_OF_DAY, parse_log_line, date_str_to_ordinal, ordinal_to_date_str
+from src import log_snapshot
+from src import log_numpy
+from src import log_parallel
+from src import log_export
+from src.log_writer import LogWriter
+from src.log_events import EntriesAppended, LogReloaded, LogReset
+from src.task_suggestions import TaskSuggestionIndex
+
+# How many bytes before the last parsed offset are remembered, for a quick check that the end of
+# the already-parsed data was not edited (the checksum of the whole range is compared after it).
+TAIL_CHECK_BYTES = 4096
+
+# Block size for computing the checksum of the already-parsed part of the log file.
+CHECKSUM_BLOCK_BYTES = 1024 * 1024
+
+# Full parses of files at least this large use the NumPy bulk parser, if NumPy is installed.
+BULK_PARSE_MIN_BYTES = 256 * 1024
+
+# Full parses of files at least this large are split across worker processes.
+PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024
+
+# Results of TimeLogger.poll_external_changes()
+CHANGE_NONE = "none"
+CHANGE_APPEND = "append"
+CHANGE_REWRITE = "rewrite"
+
+
+def _checksum_range(f, start, end, checksum=0):
+    """
+    Returns the CRC-32 of the bytes from start to end of the binary file f, continuing from checksum.
+    """
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(remaining, CHECKSUM_BLOCK_BYTES))
+        if not block:
+            break
+        checksum = zlib.crc32(block, checksum)
+        remaining -= len(block)
+    return checksum
+
+
+class _LogFileState:
+    """
+    Remembers how far time_log.txt was parsed, so a reload can tell
+    an append-only change apart from a truncation or a rewrite.
+    """
+    __slots__ = ("offset", "size", "mtime", "inode", "tail_bytes", "checksum", "verified_stat")
+
+    def __init__(self, offset, size, mtime, inode, tail_bytes, checksum):
+        self.offset = offset          # bytes parsed so far
+        self.size = size              # file size at the last parse
+        self.mtime = mtime            # st_mtime_ns at the last parse
+        self.inode = inode            # st_ino at the last parse
+        self.tail_bytes = tail_bytes  # the last TAIL_CHECK_BYTES bytes before offset
+        self.checksum = checksum      # CRC-32 of the bytes before offset
+        # (offset, st_size, st_mtime_ns, st_ino) of the file when matches_file() last read the
+        # whole parsed range and found it unchanged; not stored in snapshots.
+        self.verified_stat = None
+
+    def matches_file(self, f):
+        """
+        Returns True if the bytes before offset in the binary file f are still the ones that were parsed.
+        Reads the whole parsed range, but only when the quick check of the tail passes and the file
+        was modified since the last successful check (so a poll followed by a reload reads it once).
+        """
+        st = os.fstat(f.fileno())
+        stat_key = (self.offset, st.st_size, st.st_mtime_ns, st.st_ino)
+        if stat_key == self.verified_stat:
+            return True
+        f.seek(self.offset - len(self.tail_bytes))
+        if f.read(len(self.tail_bytes)) != self.tail_bytes:
+            return False
+        if _checksum_range(f, 0, self.offset) != self.checksum:
+            return False
+        self.verified_stat = stat_key
+        return True
+
+    @property
+    def ends_with_newline(self):
+        return not self.tail_bytes or self.tail_bytes.endswith(b"\n")
+
 
 class TimeLogger:
     """
     Handles reading/writing the time_log.txt file and tracking minutes per task.
     """
 
+    # Set to False to always use the pure-Python line parser (e.g. for benchmarking).
+    use_numpy = True
+    # Set to False to never parse in worker processes.
+    use_parallel_parse = True
+    # True if build_rebuilt_index() may run on a worker thread; otherwise rewrites are reloaded in place.
+    can_rebuild_in_background = True
+
     def __init__(self, app_settings: AppSettings):
         """
         :param app_settings: An instance of AppSettings
         """
         self.app_settings = app_settings
-        self.log_task_minutes = {}     # { task_name: total_minutes_in_file }
+        self._index = self._create_index()
+        self._log_state = None  # _LogFileState of the last parse, None if nothing was parsed
+        self._snapshot_key = None  # (offset, mtime, inode) stored in the snapshot file, None if unknown
+        self.all_history = False  # True: queries also cover the archived logs
+        self._archive = None  # LogArchive over data_folder, created on the first all-history query
+        self._writer = None  # LogWriter that appends to the log file, created on the first append
+        self._subscribers = []  # callbacks that receive the log_events published by this logger
+        self._suggestions = None  # TaskSuggestionIndex, seeded on the first suggest_tasks()
+
+        self._load_time_log()
+
+    def subscribe(self, callback):
+        """
+        Registers callback(event) to be called after every change of the log, with one of the
+        events from src.log_events: EntriesAppended, LogReloaded or LogReset.
+        Callbacks run on the thread that made the change.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, event):
+        if self._suggestions is not None:
+            if isinstance(event, EntriesAppended):
+                self._suggestions.add_entries(event.entries)
+            elif isinstance(event, LogReloaded) and event.appended is not None:
+                self._suggestions.add_entries(event.appended)
+            elif isinstance(event, LogReset):
+                self._suggestions = TaskSuggestionIndex()
+            else:
+                self._suggestions = None  # seeded again from the index totals when next needed
+        for callback in list(self._subscribers):
+            callback(event)
+
+    def _create_index(self):
+        """
+        Returns the index that stores the parsed entries and answers every query.
+        """
+        return LogIndex()
 
-        self._parse_time_log_file()
+    def set_all_history(self, enabled):
+        """
+        Turns "all history" mode on or off. While on, every query also covers the
+        archived logs that reset_time_log() left behind, merged with the live log.
+        """
+        self.all_history = bool(enabled)
+        self._invalidate_archive()
+
+    def _invalidate_archive(self):
+        """
+        Makes the next all-history query look for added or removed archives.
+        """
+        if self._archive is not None:
+            self._archive.invalidate()
+
+    def _query_index(self):
+        """
+        Returns the index that queries are answered from: the live index,
+        or in all-history mode the live index merged with the archives.
+        """
+        if not self.all_history:
+            return self._index
+        if self._archive is None or self._archive.data_folder != self.app_settings.data_folder:
+            self._archive = LogArchive(self.app_settings.data_folder)
+            self._archive.use_numpy = self.use_numpy
+            self._archive.use_parallel_parse = self.use_parallel_parse
+        return HistoryIndex([self._archive.get_index(), self._index])
+
+    def _load_time_log(self):
+        """
+        Brings the index up to date with time_log.txt at startup.
+        Starts from the parse snapshot of the previous run if it still matches the file,
+        so only the bytes appended since then have to be parsed.
+        """
+        log_path = self._get_log_path()
+        snapshot = log_snapshot.load_snapshot(self._get_snapshot_path(), log_path)
+        if snapshot is None:
+            self._parse_time_log_file()
+            self._save_parse_snapshot()
+        else:
+            state, index_data = snapshot
+            self._index.load_snapshot(index_data)
+            self._log_state = _LogFileState(*state)
+            self._snapshot_key = (self._log_state.offset, self._log_state.mtime, self._log_state.inode)
+            self.reload_time_log()
+
+    def _get_snapshot_path(self):
+        """
+        Returns the path of the parse snapshot that sits next to time_log.txt.
+        """
+        return os.path.join(self.app_settings.data_folder, "time_log.cache")
+
+    def _save_parse_snapshot(self):
+        """
+        Writes the current parse state to the snapshot file, unless it is already up to date.
+        """
+        state = self._log_state
+        if state is None or (state.offset, state.mtime, state.inode) == self._snapshot_key:
+            return
+        try:
+            log_snapshot.save_snapshot(
+                self._get_snapshot_path(),
+                self._get_log_path(),
+                (state.offset, state.size, state.mtime, state.inode, state.tail_bytes, state.checksum),
+                self._index.to_snapshot()
+            )
+        except OSError:
+            return
+        self._snapshot_key = (state.offset, state.mtime, state.inode)
+
+    def close(self):
+        """
+        Releases files and connections held by the logger. Call before the app exits.
+        """
+        self._close_writer()
+        self._save_parse_snapshot()
 
     def _get_log_path(self):
         """
@@ -25,126 +234,288 @@ class TimeLogger:
 
     def _parse_time_log_file(self):
         """
-        Reads time_log.txt if it exists.
+        Reads time_log.txt if it exists and builds the in-memory index
+        (by task, by date and by date+task) that every query is answered from.
         """
+        self._index.clear()
+        self._log_state = None
+
         log_path = self._get_log_path()
         if not os.path.isfile(log_path):
             return
 
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                if "|" not in line:
-                    continue
-                time_part, task_part = line.split("|", 1)
-                task_name = task_part.strip()
-
-                # Example line: "2025-02-05 12:00 - 12:15 | Some Task"
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-                hhmm_start = parts[1]
-                hhmm_end = parts[3]
-
-                try:
-                    minutes_diff = compute_minutes_between(hhmm_start, hhmm_end)
-                except:
-                    continue
-
-                self.log_task_minutes[task_name] = self.log_task_minutes.get(task_name, 0) + minutes_diff
+        self._log_state = self._parse_into(self._index, log_path, None)
+
+    def _parse_from_offset(self, log_path, state):
+        """
+        Parses what was appended to time_log.txt since the parse that state describes and indexes it.
+        Returns a LogIndex of just the appended lines, or None if the already-parsed part of the
+        file no longer matches state (it was edited); nothing is indexed then.
+        """
+        appended = LogIndex()
+        new_state = self._parse_into(appended, log_path, state)
+        if new_state is None:
+            return None
+        self._index.merge_snapshot(appended.to_snapshot())
+        self._log_state = new_state
+        return appended
+
+    def _parse_into(self, index, log_path, state):
+        """
+        Does the work of _parse_from_offset() for any index, without touching the logger's state.
+        Returns the _LogFileState after the parse, or None if the file did not match state.
+        """
+        with open(log_path, "rb") as f:
+            offset, checksum = 0, 0
+            if state is not None:
+                if not state.matches_file(f):
+                    return None
+                offset, checksum = state.offset, state.checksum
+            f.seek(offset)
+
+            size = os.fstat(f.fileno()).st_size
+            chunks = None
+            if (self.use_parallel_parse and offset == 0 and size >= PARALLEL_PARSE_MIN_BYTES
+                    and log_parallel.worker_count() > 1):
+                chunks = log_parallel.parse_file_parallel(log_path, size, parse_log_line, self.use_numpy)
+
+            if chunks is not None:
+                for chunk_data in chunks:
+                    index.merge_snapshot(chunk_data)
+                f.seek(size)
+            elif self.use_numpy and log_numpy.is_available() and size - offset >= BULK_PARSE_MIN_BYTES:
+                index.add_columns(*log_numpy.parse_log_bytes(f.read(), parse_log_line))
+            else:
+                for raw_line in f:
+                    parsed = parse_log_line(raw_line.decode("utf-8", errors="replace"))
+                    if parsed is not None:
+                        index.add(parsed)
+            end_offset = f.tell()
+            st = os.fstat(f.fileno())
+
+            checksum = _checksum_range(f, offset, end_offset, checksum)
+            f.seek(max(0, end_offset - TAIL_CHECK_BYTES))
+            tail_bytes = f.read(end_offset - f.tell())
+
+        return _LogFileState(end_offset, st.st_size, st.st_mtime_ns, st.st_ino, tail_bytes, checksum)
+
+    def poll_external_changes(self):
+        """
+        Cheaply checks whether time_log.txt was changed by someone else since it was last parsed
+        (our own appends move the parse state along, so they do not count).
+        Costs one os.stat; if the file grew, the already-parsed part is read once more to make
+        sure it was not edited along with the append. The state remembers that check, so the
+        reload_time_log() that follows only reads the new bytes.
+        Returns CHANGE_NONE, CHANGE_APPEND (only new lines at the end; reload_time_log() is cheap)
+        or CHANGE_REWRITE (the file has to be parsed from scratch).
+        """
+        state = self._log_state
+        try:
+            st = os.stat(self._get_log_path())
+        except OSError:
+            return CHANGE_NONE if state is None else CHANGE_REWRITE
+        if state is None:
+            return CHANGE_REWRITE if st.st_size else CHANGE_NONE
+        if st.st_ino != state.inode or st.st_size < state.offset:
+            return CHANGE_REWRITE
+        if st.st_size == state.offset:
+            return CHANGE_NONE if st.st_mtime_ns == state.mtime else CHANGE_REWRITE
+        if not state.ends_with_newline:
+            return CHANGE_REWRITE
+        try:
+            with open(self._get_log_path(), "rb") as f:
+                unchanged = state.matches_file(f)
+        except OSError:
+            return CHANGE_REWRITE
+        return CHANGE_APPEND if unchanged else CHANGE_REWRITE
+
+    def build_rebuilt_index(self):
+        """
+        Parses time_log.txt from scratch into a new index, leaving the live one untouched,
+        so it can run on a worker thread while the UI keeps answering from the old index.
+        Returns a value for install_rebuilt_index().
+        """
+        index = self._create_index()
+        log_path = self._get_log_path()
+        if not os.path.isfile(log_path):
+            return index, None
+        return index, self._parse_into(index, log_path, None)
+
+    def install_rebuilt_index(self, rebuilt):
+        """
+        Swaps in an index from build_rebuilt_index() (call on the thread that uses the logger),
+        then parses whatever was appended to the file while it was being built.
+        """
+        self._index, self._log_state = rebuilt
+        self._publish(LogReloaded())
+        self.reload_time_log()
 
     def reload_time_log(self):
         """
-        Reloads the time_log.txt file and re-parses it.
+        Brings the in-memory index up to date with time_log.txt.
+        If the file only grew since the last parse (the parsed part still has the same checksum),
+        just the new bytes are parsed; a truncated, replaced or edited file is re-parsed from scratch.
+        Returns True (and publishes LogReloaded) if anything changed.
         """
-        self.log_task_minutes.clear()
+        self._invalidate_archive()
+        log_path = self._get_log_path()
+        state = self._log_state
+        try:
+            st = os.stat(log_path)
+        except OSError:
+            self._index.clear()
+            self._log_state = None
+            if state is None:
+                return False
+            self._publish(LogReloaded())
+            return True
+
+        if state is not None and st.st_ino == state.inode and st.st_size >= state.offset:
+            if st.st_size == state.offset and st.st_mtime_ns == state.mtime:
+                return False  # unchanged
+            if st.st_size > state.offset and state.ends_with_newline:
+                appended = self._parse_from_offset(log_path, state)
+                if appended is not None:
+                    self._publish(LogReloaded(list(appended.iter_entries())))
+                    return True
+
         self._parse_time_log_file()
+        self._publish(LogReloaded())
+        return True
 
-    def get_logged_minutes_for_date(self, date_str: str) -> int:
+    def _get_writer(self):
         """
-        Returns the total minutes logged on a specific date (YYYY-MM-DD)
-        by scanning time_log.txt line by line.
+        Returns the LogWriter for time_log.txt, replacing it if the path or the
+        durability settings changed since it was created.
         """
         log_path = self._get_log_path()
-        if not os.path.isfile(log_path):
-            return 0
-
-        total_for_day = 0
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or "|" not in line:
-                    continue
-
-                time_part, _task_part = line.split("|", 1)
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-
-                # parts[0] is the date like "2025-03-02"
-                line_date = parts[0]
-                if line_date == date_str:
-                    hhmm_start = parts[1]
-                    hhmm_end = parts[3]
-                    try:
-                        minutes_diff = compute_minutes_between(hhmm_start, hhmm_end)
-                        total_for_day += minutes_diff
-                    except:
-                        pass
-        return total_for_day
+        durability = self.app_settings.log_durability
+        interval_ms = self.app_settings.log_fsync_interval_ms
+        writer = self._writer
+        if writer is None or (writer.log_path, writer.durability, writer.fsync_interval_ms) != (log_path, durability, interval_ms):
+            self._close_writer()
+            writer = self._writer = LogWriter(log_path, durability, interval_ms)
+        return writer
+
+    def _close_writer(self):
+        """
+        Flushes and closes the log file handle, e.g. before the file is renamed.
+        """
+        if self._writer is not None:
+            self._writer.close()
+
+    def _append_log_line(self, line_str):
+        self._append_log_lines([line_str])
+
+    def _append_log_lines(self, line_strs):
+        """
+        Appends lines to time_log.txt in a single write and, if nobody else touched the file since
+        the last parse, moves the parse state past them so a reload does not read them again.
+        """
+        data = "".join(line_str + os.linesep for line_str in line_strs).encode("utf-8")
+        end_offset, st = self._get_writer().append(data)
+
+        state = self._log_state
+        start_offset = end_offset - len(data)
+        if state is None and start_offset == 0:
+            state = self._log_state = _LogFileState(0, 0, 0, None, b"", 0)
+        if state is None or state.offset != start_offset or not state.ends_with_newline:
+            # Someone else changed the file; let the next reload rebuild from scratch.
+            self._log_state = None
+            return
+
+        state.offset = state.size = end_offset
+        state.mtime = st.st_mtime_ns
+        state.inode = st.st_ino
+        state.tail_bytes = (state.tail_bytes + data)[-TAIL_CHECK_BYTES:]
+        state.checksum = zlib.crc32(data, state.checksum)
+
+    def get_logged_minutes_for_date(self, date_str: str) -> int:
+        """
+        Returns the total minutes logged on a specific date (YYYY-MM-DD).
+        """
+        return self._query_index().minutes_for_date(date_str)
+
+    def get_logged_minutes_for_date_range(self, start_date, end_date) -> dict:
+        """
+        Returns { "YYYY-MM-DD": total minutes logged that day } for every day from
+        start_date to end_date (both "YYYY-MM-DD", inclusive), with one index query.
+        """
+        first = date_str_to_ordinal(start_date)
+        last = date_str_to_ordinal(end_date)
+        days = self._query_index().minutes_by_date(first, last)
+        return {ordinal_to_date_str(day): days.get(day, 0) for day in range(first, last + 1)}
 
     def get_tasks_for_today(self):
         """
         Returns a set of task names that were logged today (according to time_log.txt).
         """
         today_str = datetime.datetime.now().strftime("%Y-%m-%d")
-        log_path = self._get_log_path()
-        tasks_today = set()
+        return self._query_index().tasks_for_date(today_str)
 
-        if not os.path.isfile(log_path):
-            return tasks_today
-
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or "|" not in line:
-                    continue
-                
-                time_part, task_part = line.split("|", 1)
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-
-                line_date = parts[0]  # e.g. "2025-05-20"
-                if line_date == today_str:
-                    task_name = task_part.strip()
-                    tasks_today.add(task_name)
-        
-        return tasks_today
+    def get_logged_minutes_per_week(self) -> dict:
+        """
+        Returns { "YYYY-MM-DD" (the Monday of the week): total minutes logged that week },
+        for every week that has entries.
+        """
+        return {
+            ordinal_to_date_str(monday): minutes
+            for monday, minutes in sorted(self._query_index().minutes_by_week().items())
+        }
 
     def log_work_item(self, task_name, start_dt, end_dt):
         """
         Appends a line to time_log.txt and updates in-memory totals.
+        A span that crosses midnight is written as one line per day, in one append;
+        the part before midnight ends at 24:00, so no minute of the span is lost.
         """
-        log_path = self._get_log_path()
-        os.makedirs(self.app_settings.data_folder, exist_ok=True)
+        line_strs = []
+        entries = []
+        date_ordinal = start_dt.toordinal()
+        start = start_dt.hour * 60 + start_dt.minute
+        while date_ordinal <= end_dt.toordinal():
+            if date_ordinal < end_dt.toordinal():
+                end = END_OF_DAY
+            else:
+                end = end_dt.hour * 60 + end_dt.minute
+            if end > start or not entries:
+                entry = LogEntry(date_ordinal, start, end, task_name)
+                line_strs.append(f"{entry.date} {entry.start_time} - {entry.end_time} | {task_name}")
+                entries.append(entry)
+            date_ordinal += 1
+            start = 0
 
-        date_str = start_dt.strftime("%Y-%m-%d")
-        start_str = start_dt.strftime("%H:%M")
-        end_str = end_dt.strftime("%H:%M")
+        self._append_entries(line_strs, entries)
+        self._publish(EntriesAppended(entries))
 
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"{date_str} {start_str} - {end_str} | {task_name}\n")
+    def _append_entry(self, line_str, entry):
+        """
+        Writes line_str to time_log.txt, adds the matching LogEntry to the index
+        and publishes EntriesAppended.
+        """
+        self._append_entries([line_str], [entry])
+        self._publish(EntriesAppended([entry]))
 
-        diff_minutes = compute_minutes_between(start_str, end_str)
-        self.log_task_minutes[task_name] = self.log_task_minutes.get(task_name, 0) + diff_minutes
+    def _append_entries(self, line_strs, entries):
+        """
+        Writes the lines to time_log.txt in one append and adds the matching LogEntry objects to the index.
+        """
+        self._append_log_lines(line_strs)
+        self._index.add_entries(entries)
 
     def reset_time_log(self):
+        """
+        Moves the log to a backup, clears in-memory data and publishes LogReset.
+        """
+        self._reset_storage()
+        self._invalidate_archive()
+        self._publish(LogReset())
+
+    def _reset_storage(self):
         """
         Moves time_log.txt to a backup, clears in-memory data.
         """
+        self._close_writer()
         log_path = self._get_log_path()
         if os.path.exists(log_path):
             now_str = datetime.datetime.now().strftime("%Y%m%d%H%M")
@@ -152,49 +523,48 @@ class TimeLogger:
             backup_path = os.path.join(self.app_settings.data_folder, backup_name)
             os.rename(log_path, backup_path)
 
-        self.log_task_minutes.clear()
+        self._index.clear()
+        self._log_state = None
+
+    def suggest_tasks(self, prefix="", limit=10):
+        """
+        Returns up to limit task names from the live log that start with prefix (case-insensitive),
+        the most often and most recently used first. The first call seeds the suggestion index
+        from the per-task totals and last dates of the index (no entry is read); appended
+        entries, including lines appended by hand and picked up by a reload, then only update it.
+        """
+        if self._suggestions is None:
+            self._suggestions = TaskSuggestionIndex.from_totals(self._index.task_totals(), self._index.task_last_dates())
+        return self._suggestions.suggest(prefix, limit)
 
     def get_all_tasks(self):
-        return self.log_task_minutes.keys()
+        return self._query_index().tasks()
 
     def get_file_total_minutes(self, task_name):
-        return self.log_task_minutes.get(task_name, 0)
+        return self._query_index().minutes_for_task(task_name)
+
+    def get_task_totals(self, date_str=None):
+        """
+        Returns { task_name: minutes } for every task, computed from the index in one go.
+        With date_str ("YYYY-MM-DD"), only the tasks logged on that day with that day's
+        minutes (compared case-insensitively, like get_logged_minutes_for_date_and_task()).
+        """
+        index = self._query_index()
+        if date_str is None:
+            return index.task_totals()
+        return {task: index.minutes_for_date_and_task(date_str, task) for task in index.tasks_for_date(date_str)}
 
     def get_overall_file_minutes(self):
-        return sum(self.log_task_minutes.values())
+        return self._query_index().total_minutes()
     
     def is_valid_manual_log_line(self, line_str: str) -> bool:
         """
         Returns True if line_str can be parsed as:
            YYYY-MM-DD HH:MM - HH:MM | Some Task
         Otherwise False.
+        A negative duration is intentionally accepted here so that the format is accepted.
         """
-        line_str = line_str.strip()
-        if "|" not in line_str:
-            return False
-        time_part, task_part = line_str.split("|", 1)
-        task_part = task_part.strip()
-        if not task_part:
-            return False
-
-        parts = time_part.split()
-        if len(parts) < 4:
-            return False
-        date_str = parts[0]
-        hhmm_start = parts[1]
-        dash = parts[2]
-        hhmm_end = parts[3]
-        if dash != "-":
-            return False
-
-        try:
-            datetime.datetime.strptime(date_str, "%Y-%m-%d")
-            # We intentionally do not check negative difference here so that the format is accepted.
-            compute_minutes_between(hhmm_start, hhmm_end)
-        except Exception:
-            return False
-
-        return True
+        return parse_log_line(line_str) is not None
 
     def append_manual_log_line(self, line_str: str) -> bool:
         """
@@ -206,16 +576,9 @@ class TimeLogger:
             return False
 
         line_str = line_str.strip()
-        time_part, task_part = line_str.split("|", 1)
-        task_part = task_part.strip()
-
-        parts = time_part.split()
-        date_str = parts[0]
-        hhmm_start = parts[1]
-        hhmm_end = parts[3]
+        entry = parse_log_line(line_str)
 
-        minutes_diff = compute_minutes_between(hhmm_start, hhmm_end)
-        if minutes_diff < 0:
+        if entry.duration < 0:
             import tkinter.messagebox as messagebox
             messagebox.showerror(
                 "⏳ Invalid Time Interval",
@@ -230,49 +593,58 @@ class TimeLogger:
             return False
 
 
-        # Write the valid line to the log file.
-        log_path = self._get_log_path()
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(line_str + "\n")
-
-        # Update in-memory totals.
-        self.log_task_minutes[task_part] = self.log_task_minutes.get(task_part, 0) + minutes_diff
+        # Write the valid line to the log file and update in-memory totals.
+        self._append_entry(line_str, entry)
 
         return True
 
+    def validate_lines(self, lines):
+        """
+        Checks many log lines in one pass. Blank lines are ignored.
+        Returns (valid, bad):
+          - valid: [(stripped line, LogEntry)] of the lines that can be logged, in order
+          - bad: [(line number starting at 1, line, reason)] of the lines that cannot
+        """
+        valid = []
+        bad = []
+        for line_number, line in enumerate(lines, start=1):
+            line_str = line.strip()
+            if not line_str:
+                continue
+            entry = parse_log_line(line_str)
+            if entry is None:
+                bad.append((line_number, line_str, "not in the format YYYY-MM-DD HH:MM - HH:MM | Task"))
+            elif entry.duration < 0:
+                bad.append((line_number, line_str, "end time is before start time"))
+            else:
+                valid.append((line_str, entry))
+        return valid, bad
+
+    def import_lines(self, lines):
+        """
+        Imports many log lines (e.g. backfilled from another tracker) at once: every line is
+        validated first, then all valid lines are written with a single append, the
+        in-memory totals are updated once and one EntriesAppended is published.
+        Invalid lines are skipped and reported.
+        Returns (number of imported lines, bad lines as returned by validate_lines()).
+        """
+        valid, bad = self.validate_lines(lines)
+        if valid:
+            entries = [entry for _, entry in valid]
+            self._append_entries([line_str for line_str, _ in valid], entries)
+            self._publish(EntriesAppended(entries))
+        return len(valid), bad
+
     def get_pretty_total(self, task_name: str = None) -> str:
         """
         Returns a pretty-formatted string (like "1d 2h 15m") representing the total logged time.
         If task_name is provided, only entries matching that task are included; otherwise, all entries are summed.
         Uses raw logged minutes and formats them using the configured standard work day.
         """
-        total_minutes = 0
-        log_path = self._get_log_path()
-        if not os.path.isfile(log_path):
-            return "0m"
-
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or "|" not in line:
-                    continue
-
-                time_part, task_part = line.split("|", 1)
-                task_line = task_part.strip()
-                if task_name is not None and task_line.lower() != task_name.lower():
-                    continue
-
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-                # parts[1] is the start time and parts[3] is the end time in "HH:MM" format
-                hhmm_start = parts[1]
-                hhmm_end = parts[3]
-                try:
-                    entry_minutes = compute_minutes_between(hhmm_start, hhmm_end)
-                except Exception:
-                    continue
-                total_minutes += entry_minutes
+        if task_name is None:
+            total_minutes = self.get_overall_file_minutes()
+        else:
+            total_minutes = self._query_index().minutes_for_task_ci(task_name)
 
         pretty_str = format_minutes_pretty(
             total_minutes,
@@ -281,9 +653,16 @@ class TimeLogger:
         )
         return pretty_str
 
+    def iter_log_entries(self):
+        """
+        Yields every log entry as a LogEntry, in file order.
+        Cheaper than get_time_log_entries() for callers that only need to walk the entries.
+        """
+        return self._query_index().iter_entries()
+
     def get_time_log_entries(self) -> list:
         """
-        Reads time_log.txt and returns a list of dictionaries, where each dictionary
+        Returns a list of dictionaries, where each dictionary
         represents one log entry with the following keys:
         - date (str, "YYYY-MM-DD")
         - day (str, e.g., "Monday")
@@ -293,47 +672,19 @@ class TimeLogger:
         - task (str)
         """
         entries = []
-        log_path = self._get_log_path()
-        if not os.path.isfile(log_path):
-            return entries
-
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or "|" not in line:
-                    continue
-                try:
-                    time_part, task_part = line.split("|", 1)
-                except Exception:
-                    continue
-                task = task_part.strip()
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-                date_str = parts[0]
-                start_time = parts[1]
-                dash = parts[2]
-                end_time = parts[3]
-                if dash != "-":
-                    continue
-                try:
-                    duration = compute_minutes_between(start_time, end_time)
-                except Exception:
-                    duration = None
-                try:
-                    dt = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                    day_of_week = dt.strftime("%A")
-                except Exception:
-                    day_of_week = ""
-                entry = {
-                    "date": date_str,
-                    "day": day_of_week,
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "duration": duration,
-                    "task": task
-                }
-                entries.append(entry)
+        day_names = {}  # { date_ordinal: weekday name }, so each date is only formatted once
+        for entry in self.iter_log_entries():
+            day_of_week = day_names.get(entry.date_ordinal)
+            if day_of_week is None:
+                day_of_week = day_names[entry.date_ordinal] = datetime.date.fromordinal(entry.date_ordinal).strftime("%A")
+            entries.append({
+                "date": entry.date,
+                "day": day_of_week,
+                "start_time": entry.start_time,
+                "end_time": entry.end_time,
+                "duration": entry.duration,
+                "task": entry.task
+            })
         return entries
     
     # def get_time_log_as_json(self) -> str:
@@ -346,78 +697,106 @@ class TimeLogger:
     #     entries = self.get_time_log_entries()
     #     return json.dumps(entries, indent=2)
 
-    def export_time_log_as_csv(self) -> str:
+    def _get_export_log_paths(self):
+        """
+        Returns the log files that hold the live entries, in order, for streaming exports.
+        Returns None if the entries are not kept in text files.
         """
-        Exports the content of time_log.txt as a CSV file formatted for data analysis.
-        The CSV file will include the following columns:
-          - Date (YYYY-MM-DD)
-          - Day (e.g., Monday)
-          - Start Time (HH:MM)
-          - End Time (HH:MM)
-          - Duration (min)
-          - Task
+        return [self._get_log_path()]
 
-        The exported file is named "time_log_export_YYYYMMDDhhmmss.csv" and is saved in the
+    def iter_export_entries(self, start_date=None, end_date=None, tasks=None):
+        """
+        Yields LogEntry objects for an export, streamed line by line from the log files
+        (the archived logs first in all-history mode), filtered while streaming:
+        :param start_date: first date to include, "YYYY-MM-DD" (None = no lower bound)
+        :param end_date: last date to include, "YYYY-MM-DD" (None = no upper bound)
+        :param tasks: task names to include, case-insensitive (None = every task)
+        """
+        live_paths = self._get_export_log_paths()
+        if live_paths is None:
+            entries = self._index.iter_entries()
+        else:
+            entries = log_export.iter_file_entries(live_paths)
+        if self.all_history:
+            data_folder = self.app_settings.data_folder
+            archive_paths = [os.path.join(data_folder, name) for name in find_archive_files(data_folder)]
+            entries = chain(log_export.iter_file_entries(archive_paths), entries)
+        return log_export.filter_entries(entries, start_date, end_date, tasks)
+
+    def export_time_log(self, export_format="csv", start_date=None, end_date=None, tasks=None,
+                        incremental=False, progress=None) -> str:
+        """
+        Exports the time log for data analysis as "csv", "csv.gz" (gzip-compressed CSV) or "jsonl"
+        (one JSON object per line), optionally limited to a date range and a set of tasks
+        (see iter_export_entries). Rows are streamed from the log to the file, so memory use
+        stays flat however large the log is.
+        The CSV has the columns Date, Day, Start Time, End Time, Duration (min) and Task;
+        JSONL objects have the keys of get_time_log_entries().
+
+        With incremental=True only the rows appended since the last incremental export with the same
+        filters are written, and that export's watermark in time_log_export.watermark is moved past them
+        (each combination of filters keeps its own watermark). If the log was rewritten
+        or reset since, every row is written again. Archives are never part of an incremental export.
+
+        progress is passed on to log_export.write_rows(): it is called with (rows written, bytes written)
+        while the export runs and can raise log_export.ExportCancelled to abort it.
+
+        The exported file is named "time_log_export_YYYYMMDDhhmmss.<ext>" and is saved in the
         appdata folder (self.app_settings.data_folder). Any existing file with the same name is overwritten.
 
         Returns:
-            The full path to the exported CSV file.
+            The full path to the exported file.
         """
-        import csv
+        if export_format not in log_export.EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format!r}")
         now_str = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        export_filename = f"time_log_export_{now_str}.csv"
+        export_filename = f"time_log_export_{now_str}.{log_export.EXPORT_FORMATS[export_format]}"
         export_path = os.path.join(self.app_settings.data_folder, export_filename)
-        
-        entries = self.get_time_log_entries()
-        with open(export_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["Date", "Day", "Start Time", "End Time", "Duration (min)", "Task"])
-            for entry in entries:
-                writer.writerow([
-                    entry["date"],
-                    entry["day"],
-                    entry["start_time"],
-                    entry["end_time"],
-                    entry["duration"],
-                    entry["task"]
-                ])
+
+        if incremental:
+            self._export_incremental(export_path, export_format, start_date, end_date, tasks, progress)
+            return export_path
+
+        rows = log_export.iter_export_rows(self.iter_export_entries(start_date, end_date, tasks))
+        log_export.write_rows(rows, export_path, export_format, progress)
         return export_path
 
+    def _export_incremental(self, export_path, export_format, start_date, end_date, tasks, progress=None):
+        """
+        Writes the rows added since the watermark of these filters to export_path, then stores the new watermark.
+        Logs that are not kept in text files have no byte offsets to resume from, so they are exported in full.
+        """
+        log_paths = self._get_export_log_paths()
+        if log_paths is None:
+            entries = self._index.iter_entries()
+            new_watermark = None
+        else:
+            watermark_path = os.path.join(self.app_settings.data_folder, log_export.WATERMARK_FILE_NAME)
+            key = log_export.watermark_key(start_date, end_date, tasks)
+            log_ranges, new_watermark, _ = log_export.plan_incremental_export(
+                log_paths, log_export.load_watermark(watermark_path, key)
+            )
+            entries = log_export.iter_file_range_entries(log_ranges)
+
+        entries = log_export.filter_entries(entries, start_date, end_date, tasks)
+        log_export.write_rows(log_export.iter_export_rows(entries), export_path, export_format, progress)
+        if new_watermark is not None:
+            log_export.save_watermark(watermark_path, new_watermark, key)
+
+    def export_time_log_as_csv(self) -> str:
+        """
+        Exports the whole time log as a CSV file; see export_time_log().
+
+        Returns:
+            The full path to the exported CSV file.
+        """
+        return self.export_time_log("csv")
+
     def get_logged_minutes_for_date_and_task(self, date_str: str, task_name: str) -> int:
         """
-        Returns the total minutes logged on a specific date *for a given task*
-        by scanning time_log.txt line by line.
+        Returns the total minutes logged on a specific date *for a given task*.
         """
-        log_path = self._get_log_path()
-        if not os.path.isfile(log_path):
-            return 0
-
-        total_for_day_task = 0
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or "|" not in line:
-                    continue
-
-                time_part, task_part = line.split("|", 1)
-                parts = time_part.split()
-                if len(parts) < 4:
-                    continue
-
-                line_date = parts[0]
-                if line_date != date_str:
-                    continue
-
-                task_line = task_part.strip()
-                if task_line.lower() == task_name.lower():
-                    hhmm_start = parts[1]
-                    hhmm_end = parts[3]
-                    try:
-                        minutes_diff = compute_minutes_between(hhmm_start, hhmm_end)
-                        total_for_day_task += minutes_diff
-                    except:
-                        pass
-        return total_for_day_task
+        return self._query_index().minutes_for_date_and_task(date_str, task_name)
 
     def get_pretty_total_for_date_and_task(self, date_str: str, task_name: str) -> str:
         """
@@ -18,18 +18,6 @@ def resource_path(relative_path):
         return os.path.join(base_path, "resources", relative_path)
 
 
-def compute_minutes_between(hhmm_start, hhmm_end):
-    """
-    Given two strings in 'HH:MM' format (same day),
-    return the integer number of minutes between them.
-    """
-    fmt = "%H:%M"
-    t_start = datetime.datetime.strptime(hhmm_start, fmt)
-    t_end = datetime.datetime.strptime(hhmm_end, fmt)
-    delta = t_end - t_start
-    return int(delta.total_seconds() / 60)
-
-
 def next_quarter_hour(dt):
     """
     Given a datetime `dt`, return the next time that is exactly
@@ -0,0 +1,122 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Used when the ttk theme does not report a Treeview row height.
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTaskTable(tk.Frame):
+    """
+    A task table (Task | Total (min) | Total (pretty)) that stays fast for any number of tasks.
+    The rows live in a sorted in-memory model; the Treeview only ever holds the handful
+    of items that fit on screen, and those are refilled from the model on scroll or resize.
+    """
+
+    def __init__(self, parent, height=10, **kwargs):
+        """
+        :param parent: The parent widget
+        :param height: Number of rows shown before the table is resized
+        """
+        super().__init__(parent, **kwargs)
+        self._tasks = []          # sorted task names
+        self._minutes = {}        # { task_name: minutes } for the "Total (min)" column
+        self._pretty_for = None   # task_name -> "Total (pretty)" text, only called for visible rows
+        self._offset = 0          # index in _tasks of the first visible row
+        self._visible_rows = height
+
+        columns = ("task", "file_minutes", "total_pretty")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height)
+        self.tree.heading("task", text="Task")
+        self.tree.heading("file_minutes", text="Total (min)")
+        self.tree.heading("total_pretty", text="Total (pretty)")
+        self.tree.column("task", width=200, anchor="w")
+        self.tree.column("file_minutes", width=120, anchor="center")
+        self.tree.column("total_pretty", width=120, anchor="center")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_by(3))
+
+    def set_rows(self, tasks, minutes, pretty_for):
+        """
+        Replaces the model and redraws the visible rows.
+        :param tasks: task names in display order
+        :param minutes: { task_name: minutes } for the "Total (min)" column
+        :param pretty_for: function task_name -> "Total (pretty)" text
+        """
+        self._tasks = tasks
+        self._minutes = minutes
+        self._pretty_for = pretty_for
+        self._offset = min(self._offset, self._max_offset())
+        self._render()
+
+    def refresh(self):
+        """
+        Redraws the visible rows after the tasks list or minutes dict given to set_rows()
+        were changed in place (e.g. one task's total went up). Costs O(visible rows).
+        """
+        self._offset = min(self._offset, self._max_offset())
+        self._render()
+
+    def _max_offset(self):
+        return max(0, len(self._tasks) - self._visible_rows)
+
+    def _render(self):
+        """
+        Fills the on-screen items with the rows at the current offset, creating or
+        deleting items only when the number of visible rows changed.
+        """
+        visible = self._tasks[self._offset:self._offset + self._visible_rows]
+        items = self.tree.get_children()
+        for i, task in enumerate(visible):
+            values = (task, self._minutes.get(task, 0), self._pretty_for(task))
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert("", tk.END, iid=f"row{i}", values=values)
+        if len(items) > len(visible):
+            self.tree.delete(*items[len(visible):])
+
+        total = len(self._tasks)
+        if total:
+            self.scrollbar.set(self._offset / total, (self._offset + len(visible)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self._offset + rows)
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * len(self._tasks)))
+        elif args[0] == "scroll":
+            step = self._visible_rows if args[2] == "pages" else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas.
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * delta)
+
+    def _on_resize(self, event):
+        """
+        Shows as many rows as fit into the new height.
+        """
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        visible_rows = max(1, (event.height - row_height) // row_height)  # minus the heading row
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._offset = min(self._offset, self._max_offset())
+            self._render()
@@ -2,6 +2,78 @@ import tkinter as tk
 import datetime
 import random
 from src.app_fonts import FONT_SMALL, FONT, FONT_LARGE, FONT_BOLD
+from src.log_line_parser import ordinal_to_date_str
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# How many weeks of per-day totals are kept; the oldest cached week is dropped first.
+WEEK_CACHE_SIZE = 64
+
+class DayCell:
+    """
+    The widgets of one day in the week overview: day name, date, expected and logged minutes,
+    an emoji, the difference from the goal and a progress bar. They are created once and
+    reconfigured by update() for every week shown.
+    """
+    BAR_WIDTH = 95
+    BAR_HEIGHT = 8
+
+    def __init__(self, parent, day_name):
+        self.frame = tk.Frame(parent, borderwidth=1, relief="solid", padx=2, pady=2)
+
+        self.day_label = tk.Label(self.frame, text=day_name, font=FONT_BOLD)
+        self.day_label.pack()
+        self.date_label = tk.Label(self.frame, text="", font=FONT_SMALL)
+        self.date_label.pack()
+        self.expected_label = tk.Label(self.frame, text="", font=FONT_SMALL)
+        self.expected_label.pack()
+        self.logged_label = tk.Label(self.frame, text="", font=FONT_SMALL)
+        self.logged_label.pack()
+        self.emoji_label = tk.Label(self.frame, text="", font=FONT_LARGE)
+        self.emoji_label.pack()
+
+        # Container for both diff label and progress bar.
+        self.container = tk.Frame(self.frame)
+        self.container.pack(pady=(5, 0))
+        self.diff_label = tk.Label(self.container, text="", font=FONT_SMALL)
+        self.diff_label.pack(side="top", pady=(0, 2))
+
+        # The progress bar: a grey background and a green fill whose width is changed in place.
+        self.canvas = tk.Canvas(self.container, width=self.BAR_WIDTH, height=self.BAR_HEIGHT, highlightthickness=0)
+        self.canvas.pack(side="top")
+        self.canvas.create_rectangle(0, 0, self.BAR_WIDTH, self.BAR_HEIGHT, fill="#cccccc", width=0)
+        self.bar = self.canvas.create_rectangle(0, 0, 0, self.BAR_HEIGHT, fill="#4CAF50", width=0)
+
+        self._bg = None
+
+    def update(self, date_str, expected, logged, ratio, emoji, bg):
+        """
+        Shows one day. The difference (logged - expected) is colored red if negative,
+        green if positive, and black if zero.
+        """
+        if bg != self._bg:
+            self._bg = bg
+            for widget in (self.frame, self.day_label, self.date_label, self.expected_label,
+                           self.logged_label, self.emoji_label, self.container, self.diff_label):
+                widget.config(bg=bg)
+
+        diff = logged - expected
+        if diff > 0:
+            diff_color = "green"
+        elif diff < 0:
+            diff_color = "red"
+        else:
+            diff_color = "black"
+
+        self.date_label.config(text=date_str)
+        self.expected_label.config(text=f"Expected: {expected} min")
+        self.logged_label.config(text=f"Logged: {logged} min")
+        self.emoji_label.config(text=emoji)
+        self.diff_label.config(text=f"{diff:+d} min", fg=diff_color)  # plus sign for positive values
+
+        fill_ratio = min(max(ratio, 0.0), 1.0)  # Clamp between 0 and 1
+        self.canvas.coords(self.bar, 0, 0, int(self.BAR_WIDTH * fill_ratio), self.BAR_HEIGHT)
+
 
 class WeekOverview(tk.Frame):
     """
@@ -19,6 +91,9 @@ class WeekOverview(tk.Frame):
         self.time_logger = time_logger
         self.app_settings = app_settings
         self.current_week_start = self.get_week_start(datetime.datetime.now())
+        self._day_columns = {}  # { "YYYY-MM-DD": column } of the shown week
+        self._week_cache = {}  # { Monday "YYYY-MM-DD": { "YYYY-MM-DD": logged minutes } }
+        self._prefetch_job = None
         self.create_widgets()
         self.render_week()
 
@@ -50,87 +125,82 @@ class WeekOverview(tk.Frame):
         )
         self.next_button.pack(side="right")
         
-        # Frame for the daily overview grid
+        # Frame for the daily overview grid, one reusable cell per weekday
         self.days_frame = tk.Frame(self)
         self.days_frame.pack(fill="x", pady=5)
+        self._day_cells = [DayCell(self.days_frame, day) for day in DAYS]
+        for i, cell in enumerate(self._day_cells):
+            cell.frame.grid(row=0, column=i, padx=2, sticky="nsew")
+        self._default_bg = self._day_cells[0].frame.cget("bg")
 
     def render_week(self):
-        # Clear previous widgets in days_frame
-        for widget in self.days_frame.winfo_children():
-            widget.destroy()
-
+        """
+        Fills the seven day cells with the shown week. The cells are built once in
+        create_widgets(); only their texts, colours and bar widths change here.
+        """
         # Update week label
         week_end = self.current_week_start + datetime.timedelta(days=6)
         self.week_label.config(
             text=f"{self.current_week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')}"
         )
 
-        # Define the days in order
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        self._day_columns = {}
+        for i in range(len(DAYS)):
+            self._render_day(i)
+        self._schedule_prefetch()
+
+    def _get_week_minutes(self, week_start):
+        """
+        Returns { "YYYY-MM-DD": logged minutes } for the week starting at week_start,
+        from the cache or with one range query.
+        """
+        key = week_start.strftime("%Y-%m-%d")
+        minutes = self._week_cache.get(key)
+        if minutes is None:
+            week_end = (week_start + datetime.timedelta(days=6)).strftime("%Y-%m-%d")
+            minutes = self.time_logger.get_logged_minutes_for_date_range(key, week_end)
+            if len(self._week_cache) >= WEEK_CACHE_SIZE:
+                del self._week_cache[next(iter(self._week_cache))]
+            self._week_cache[key] = minutes
+        return minutes
+
+    def _schedule_prefetch(self):
+        """
+        Loads the previous and next week into the cache once Tk is idle, so paging is instant.
+        """
+        if self._prefetch_job is not None:
+            self.after_cancel(self._prefetch_job)
+        self._prefetch_job = self.after_idle(self._prefetch_adjacent_weeks)
+
+    def _prefetch_adjacent_weeks(self):
+        self._prefetch_job = None
+        for weeks in (-1, 1):
+            self._get_week_minutes(self.current_week_start + datetime.timedelta(weeks=weeks))
+
+    def _render_day(self, i):
+        """
+        Updates the cell of the i-th day (0 = Monday) of the shown week.
+        """
+        day = DAYS[i]
         today_date = datetime.datetime.now().date()
 
-        for i, day in enumerate(days):
-            # Compute the date for this day
-            day_date = self.current_week_start + datetime.timedelta(days=i)
-            date_str = day_date.strftime("%Y-%m-%d")
-
-            # Expected minutes from the app settings
-            expected = self.app_settings.work_schedule.get(day, 0)
-            # Logged minutes for this day
-            logged = self.time_logger.get_logged_minutes_for_date(date_str)
-            
-            # Build a small frame for this day
-            day_frame = tk.Frame(self.days_frame, borderwidth=1, relief="solid", padx=2, pady=2)
-            
-            # Highlight today's cell
-            if day_date.date() == today_date:
-                day_frame.config(bg="lightyellow")
-
-            day_frame.grid(row=0, column=i, padx=2, sticky="nsew")
-
-            # Day label
-            tk.Label(
-                day_frame,
-                text=day,
-                font=FONT_BOLD,
-                bg=day_frame.cget("bg")
-            ).pack()
-
-            # Date label
-            tk.Label(
-                day_frame,
-                text=date_str,
-                font=FONT_SMALL,
-                bg=day_frame.cget("bg")
-            ).pack()
-
-            # Expected vs. Logged
-            tk.Label(
-                day_frame,
-                text=f"Expected: {expected} min",
-                font=FONT_SMALL,
-                bg=day_frame.cget("bg")
-            ).pack()
-            tk.Label(
-                day_frame,
-                text=f"Logged: {logged} min",
-                font=FONT_SMALL,
-                bg=day_frame.cget("bg")
-            ).pack()
-
-            # Choose a random emoji for that day based on ratio
-            ratio = (logged / expected) if expected else 0
-            emoji = self.choose_emoji(day, ratio)
-
-            tk.Label(
-                day_frame,
-                text=emoji,
-                font=FONT_LARGE,
-                bg=day_frame.cget("bg")
-            ).pack()
-
-            # Draw a progress bar
-            self.draw_progress_bar(day_frame, ratio, expected, logged)
+        # Compute the date for this day
+        day_date = self.current_week_start + datetime.timedelta(days=i)
+        date_str = day_date.strftime("%Y-%m-%d")
+        self._day_columns[date_str] = i
+
+        # Expected minutes from the app settings
+        expected = self.app_settings.work_schedule.get(day, 0)
+        # Logged minutes for this day
+        logged = self._get_week_minutes(self.current_week_start)[date_str]
+
+        # Choose a random emoji for that day based on ratio
+        ratio = (logged / expected) if expected else 0
+        emoji = self.choose_emoji(day, ratio)
+
+        # Highlight today's cell
+        bg = "lightyellow" if day_date.date() == today_date else self._default_bg
+        self._day_cells[i].update(date_str, expected, logged, ratio, emoji, bg)
 
     def choose_emoji(self, day_name, ratio):
         """
@@ -183,51 +253,6 @@ class WeekOverview(tk.Frame):
             return random.choice(struggling_pool)
 
 
-    def draw_progress_bar(self, parent, ratio, expected, logged):
-        """
-        Draws a small horizontal progress bar showing ratio progress,
-        with a label above it that displays the difference (logged - expected).
-        The difference is colored red if negative, green if positive, and black if zero.
-        """
-        bar_width = 95
-        bar_height = 8
-
-        # Calculate the difference and choose a color.
-        diff = logged - expected
-        if diff > 0:
-            diff_color = "green"
-        elif diff < 0:
-            diff_color = "red"
-        else:
-            diff_color = "black"
-
-        # Container for both diff label and progress bar.
-        container = tk.Frame(parent, bg=parent.cget("bg"))
-        container.pack(pady=(5, 0))
-
-        # Create and pack the difference label above the progress bar.
-        diff_label = tk.Label(
-            container,
-            text=f"{diff:+d} min",  # plus sign for positive values
-            fg=diff_color,
-            font=FONT_SMALL,
-            bg=parent.cget("bg")
-        )
-        diff_label.pack(side="top", pady=(0, 2))
-
-        # Create a canvas to draw the progress bar.
-        canvas = tk.Canvas(container, width=bar_width, height=bar_height, highlightthickness=0)
-        canvas.pack(side="top")
-
-        # Draw the background of the progress bar.
-        canvas.create_rectangle(0, 0, bar_width, bar_height, fill="#cccccc", width=0)
-
-        # Calculate filled portion.
-        fill_ratio = min(max(ratio, 0.0), 1.0)  # Clamp between 0 and 1
-        fill_width = int(bar_width * fill_ratio)
-        canvas.create_rectangle(0, 0, fill_width, bar_height, fill="#4CAF50", width=0)  # Green fill
-
-
     def prev_week(self):
         self.current_week_start -= datetime.timedelta(weeks=1)
         self.render_week()
@@ -238,4 +263,23 @@ class WeekOverview(tk.Frame):
 
     def refresh_week_view(self):
         """Re-renders the week view with updated data."""
-        self.render_week()
\ No newline at end of file
+        self._week_cache.clear()
+        self.render_week()
+
+    def on_entries_appended(self, entries):
+        """
+        Updates only the cells of the shown week that the new entries were logged on,
+        and adds the new minutes to the cached weeks.
+        """
+        for entry in entries:
+            monday = entry.date_ordinal - (entry.date_ordinal - 1) % 7
+            minutes = self._week_cache.get(ordinal_to_date_str(monday))
+            if minutes is not None:
+                minutes[entry.date] += entry.duration
+        for date_str in {entry.date for entry in entries}:
+            if date_str in self._day_columns:
+                self.refresh_day(date_str)
+
+    def refresh_day(self, date_str):
+        """Re-renders the cell of one day of the shown week."""
+        self._render_day(self._day_columns[date_str])
@@ -0,0 +1,33 @@
+import shutil
+import tempfile
+
+
+class StubSettings:
+    """
+    Stands in for AppSettings: the default values, a temporary data folder and no config file.
+    """
+
+    def __init__(self, data_folder, **overrides):
+        self.data_folder = data_folder
+        self.standart_work_day = 450
+        self.standart_days_in_week = 5
+        self.storage_backend = "text"
+        self.sqlite_mirror_text_log = True
+        self.log_layout = "single"
+        self.incremental_export = False
+        self.log_durability = "flush"
+        self.log_fsync_interval_ms = 1000
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+    def save(self):
+        pass
+
+
+def make_data_folder(test_case):
+    """
+    Returns a new temporary folder that is removed when test_case finishes.
+    """
+    folder = tempfile.mkdtemp(prefix="wogger-test-")
+    test_case.addCleanup(shutil.rmtree, folder, True)
+    return folder
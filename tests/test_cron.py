@@ -0,0 +1,113 @@
+import datetime
+import unittest
+from src.cron import CronError, parse_cron
+
+D = datetime.datetime
+
+# (expression, start, the next three fire times after start, the three fire times before it),
+# as computed by croniter 6.2.
+KNOWN_SCHEDULES = [
+    ("*/15 9-17 * * mon-fri", D(2025, 3, 7, 17, 50),
+     [D(2025, 3, 10, 9, 0), D(2025, 3, 10, 9, 15), D(2025, 3, 10, 9, 30)],
+     [D(2025, 3, 7, 17, 45), D(2025, 3, 7, 17, 30), D(2025, 3, 7, 17, 15)]),
+    ("0,30 8-10/2 * * *", D(2025, 3, 3, 10, 30),
+     [D(2025, 3, 4, 8, 0), D(2025, 3, 4, 8, 30), D(2025, 3, 4, 10, 0)],
+     [D(2025, 3, 3, 10, 0), D(2025, 3, 3, 8, 30), D(2025, 3, 3, 8, 0)]),
+    ("10-20/5 * * * *", D(2025, 3, 3, 23, 59),
+     [D(2025, 3, 4, 0, 10), D(2025, 3, 4, 0, 15), D(2025, 3, 4, 0, 20)],
+     [D(2025, 3, 3, 23, 20), D(2025, 3, 3, 23, 15), D(2025, 3, 3, 23, 10)]),
+    ("5 4 * jan,jul sun", D(2025, 1, 26, 4, 5),
+     [D(2025, 7, 6, 4, 5), D(2025, 7, 13, 4, 5), D(2025, 7, 20, 4, 5)],
+     [D(2025, 1, 19, 4, 5), D(2025, 1, 12, 4, 5), D(2025, 1, 5, 4, 5)]),
+    ("0 0 * * 7", D(2025, 3, 4, 0, 0),
+     [D(2025, 3, 9, 0, 0), D(2025, 3, 16, 0, 0), D(2025, 3, 23, 0, 0)],
+     [D(2025, 3, 2, 0, 0), D(2025, 2, 23, 0, 0), D(2025, 2, 16, 0, 0)]),
+    ("0 12 1,15 * *", D(2025, 3, 15, 12, 0),
+     [D(2025, 4, 1, 12, 0), D(2025, 4, 15, 12, 0), D(2025, 5, 1, 12, 0)],
+     [D(2025, 3, 1, 12, 0), D(2025, 2, 15, 12, 0), D(2025, 2, 1, 12, 0)]),
+    # Both day fields restricted: the 13th or any Friday
+    ("0 9 13 * fri", D(2025, 6, 1, 0, 0),
+     [D(2025, 6, 6, 9, 0), D(2025, 6, 13, 9, 0), D(2025, 6, 20, 9, 0)],
+     [D(2025, 5, 30, 9, 0), D(2025, 5, 23, 9, 0), D(2025, 5, 16, 9, 0)]),
+    ("0 0 1 */3 *", D(2025, 11, 15, 0, 0),
+     [D(2026, 1, 1, 0, 0), D(2026, 4, 1, 0, 0), D(2026, 7, 1, 0, 0)],
+     [D(2025, 10, 1, 0, 0), D(2025, 7, 1, 0, 0), D(2025, 4, 1, 0, 0)]),
+    ("59 23 31 12 *", D(2025, 12, 31, 23, 59),
+     [D(2026, 12, 31, 23, 59), D(2027, 12, 31, 23, 59), D(2028, 12, 31, 23, 59)],
+     [D(2024, 12, 31, 23, 59), D(2023, 12, 31, 23, 59), D(2022, 12, 31, 23, 59)]),
+    ("0 0 29 2 *", D(2025, 3, 1, 0, 0),
+     [D(2028, 2, 29, 0, 0), D(2032, 2, 29, 0, 0), D(2036, 2, 29, 0, 0)],
+     [D(2024, 2, 29, 0, 0), D(2020, 2, 29, 0, 0), D(2016, 2, 29, 0, 0)]),
+    # Seconds are ignored: prev() of 10:00:30 is 10:00, next() is a week later
+    ("0 10 * * 1", D(2025, 3, 3, 10, 0, 30),
+     [D(2025, 3, 10, 10, 0), D(2025, 3, 17, 10, 0), D(2025, 3, 24, 10, 0)],
+     [D(2025, 3, 3, 10, 0), D(2025, 2, 24, 10, 0), D(2025, 2, 17, 10, 0)]),
+]
+
+
+class KnownScheduleTests(unittest.TestCase):
+    def test_next_and_prev_match_croniter(self):
+        for expr, start, expected_next, expected_prev in KNOWN_SCHEDULES:
+            with self.subTest(expr=expr):
+                schedule = parse_cron(expr)
+                t, fired = start, []
+                for _ in expected_next:
+                    t = schedule.next(t)
+                    fired.append(t)
+                self.assertEqual(fired, expected_next)
+                t, fired = start, []
+                for _ in expected_prev:
+                    t = schedule.prev(t)
+                    fired.append(t)
+                self.assertEqual(fired, expected_prev)
+
+    def test_fire_times_exclude_start_and_include_end(self):
+        schedule = parse_cron("0,30 * * * *")
+        self.assertEqual(
+            list(schedule.fire_times(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 10, 0))),
+            [D(2025, 3, 3, 9, 30), D(2025, 3, 3, 10, 0)]
+        )
+        self.assertEqual(list(schedule.fire_times(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 9, 29))), [])
+        self.assertEqual(schedule.count_fire_times(D(2025, 3, 3, 23, 0), D(2025, 3, 4, 1, 0)), 4)
+
+    def test_prev_of_a_fire_time_is_the_one_before(self):
+        schedule = parse_cron("0,30 * * * *")
+        self.assertEqual(schedule.prev(D(2025, 3, 3, 9, 30)), D(2025, 3, 3, 9, 0))
+        self.assertEqual(schedule.prev(D(2025, 3, 3, 9, 30, 1)), D(2025, 3, 3, 9, 30))
+        self.assertEqual(schedule.prev(D(2025, 1, 1, 0, 0)), D(2024, 12, 31, 23, 30))
+
+    def test_names_are_case_insensitive(self):
+        self.assertEqual(parse_cron("0 9 * JAN Mon").next(D(2025, 3, 1)), D(2026, 1, 5, 9, 0))
+
+
+class MalformedExpressionTests(unittest.TestCase):
+    def test_malformed_fields_raise_cron_error(self):
+        for expr in (
+            "* * * *",          # too few fields
+            "* * * * * *",      # too many fields
+            "60 * * * *",       # minute out of range
+            "0 24 * * *",       # hour out of range
+            "0 0 0 * *",        # day-of-month out of range
+            "0 0 * 13 *",       # month out of range
+            "0 0 * * 8",        # day-of-week out of range
+            "5-1 * * * *",      # backwards range
+            "*/0 * * * *",      # zero step
+            "*/x * * * *",      # step is not a number
+            "1,,2 * * * *",     # empty list item
+            "0 0 * foo *",      # unknown name
+            "0 0 * * mon-",     # open range
+            "0 0 31 2 *",       # never fires
+        ):
+            with self.subTest(expr=expr):
+                with self.assertRaises(CronError):
+                    parse_cron(expr)
+
+    def test_non_ascii_digits_raise_cron_error(self):
+        for expr in ("² * * * *", "*/² * * * *", "0 ٣ * * *", "0-5/١ * * * *"):
+            with self.subTest(expr=expr):
+                with self.assertRaises(CronError):
+                    parse_cron(expr)
+
+
+if __name__ == "__main__":
+    unittest.main()
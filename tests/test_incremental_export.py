@@ -0,0 +1,43 @@
+import csv
+import unittest
+from src.time_logger import TimeLogger
+from tests.helpers import StubSettings, make_data_folder
+
+
+class IncrementalExportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = TimeLogger(StubSettings(make_data_folder(self)))
+        self.addCleanup(self.logger.close)
+        self.logger.import_lines([
+            "2025-03-03 09:00 - 10:00 | Meeting",
+            "2025-03-03 10:00 - 12:00 | Review",
+            "2025-03-04 09:00 - 11:30 | Review",
+        ])
+
+    def export(self, **filters):
+        path = self.logger.export_time_log("csv", incremental=True, **filters)
+        with open(path, newline="", encoding="utf-8") as f:
+            return [(row[0], row[2], row[5]) for row in list(csv.reader(f))[1:]]
+
+    def test_filtered_export_does_not_move_the_unfiltered_watermark(self):
+        self.assertEqual(self.export(tasks=["review"]), [
+            ("2025-03-03", "10:00", "Review"),
+            ("2025-03-04", "09:00", "Review"),
+        ])
+        self.assertEqual(len(self.export()), 3)
+
+    def test_each_filter_resumes_from_its_own_watermark(self):
+        self.assertEqual(len(self.export(start_date="2025-03-04")), 1)
+        self.assertEqual(len(self.export()), 3)
+        self.logger.import_lines(["2025-03-05 09:00 - 09:30 | Meeting"])
+        self.assertEqual(self.export(start_date="2025-03-04"), [("2025-03-05", "09:00", "Meeting")])
+        self.assertEqual(self.export(), [("2025-03-05", "09:00", "Meeting")])
+        self.assertEqual(self.export(tasks=["Meeting"]), [
+            ("2025-03-03", "09:00", "Meeting"),
+            ("2025-03-05", "09:00", "Meeting"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
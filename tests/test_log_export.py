@@ -0,0 +1,59 @@
+import os
+import gzip
+import unittest
+from unittest import mock
+from src import log_export
+from tests.helpers import make_data_folder
+
+ROW = ("2025-03-03", "Monday", "09:00", "10:00", 60, "Meeting")
+
+
+class WriteRowsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data_folder = make_data_folder(self)
+
+    def test_cancel_closes_every_stream_and_removes_the_file(self):
+        def cancel(rows, size):
+            raise log_export.ExportCancelled()
+
+        opened = []
+
+        class RecordingGzipFile(gzip.GzipFile):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                opened.append(self)
+
+        for export_format in log_export.EXPORT_FORMATS:
+            path = os.path.join(self.data_folder, "export." + log_export.EXPORT_FORMATS[export_format])
+            cancelled = None
+            with mock.patch.object(log_export.gzip, "GzipFile", RecordingGzipFile):
+                try:
+                    log_export.write_rows(iter([ROW] * (log_export.PROGRESS_EVERY_ROWS + 1)), path, export_format, cancel)
+                except log_export.ExportCancelled as error:
+                    cancelled = error  # its traceback keeps write_rows' streams alive, as a caller's would
+            self.assertIsNotNone(cancelled, export_format)
+            self.assertFalse(os.path.exists(path), export_format)
+            # Left open, a GzipFile would write its trailer into the closed file once collected
+            self.assertTrue(all(gzip_file.closed for gzip_file in opened), export_format)
+        self.assertEqual(len(opened), 1)
+
+    def test_failure_removes_the_partial_file(self):
+        def rows():
+            yield ROW
+            raise OSError("log file went away")
+
+        path = os.path.join(self.data_folder, "export.csv.gz")
+        with self.assertRaises(OSError):
+            log_export.write_rows(rows(), path, "csv.gz")
+        self.assertFalse(os.path.exists(path))
+
+    def test_complete_export_is_kept(self):
+        path = os.path.join(self.data_folder, "export.jsonl")
+        self.assertEqual(log_export.write_rows(iter([ROW, ROW]), path, "jsonl"), 2)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
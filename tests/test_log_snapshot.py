@@ -0,0 +1,87 @@
+import os
+import pickle
+import unittest
+from src import log_snapshot
+from src.log_index import LogIndex
+from src.log_archive import LogArchive
+from src.log_line_parser import parse_log_line
+from tests.helpers import make_data_folder
+
+LINES = [
+    "2025-03-03 09:00 - 10:00 | Meeting",
+    "2025-03-03 10:00 - 12:00 | Review",
+    "2025-03-04 09:00 - 11:30 | review",
+]
+
+
+class _Payload:
+    executed = False
+
+    def __reduce__(self):
+        return (setattr, (_Payload, "executed", True))
+
+
+class SnapshotTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data_folder = make_data_folder(self)
+        self.log_path = os.path.join(self.data_folder, "time_log.txt")
+        self.snapshot_path = os.path.join(self.data_folder, "time_log.cache")
+        with open(self.log_path, "wb") as f:
+            f.write("".join(line + "\n" for line in LINES).encode("utf-8"))
+        self.index = LogIndex()
+        self.index.add_entries(parse_log_line(line) for line in LINES)
+        self.state = (os.path.getsize(self.log_path), 0, 0, 1, LINES[-1].encode("utf-8") + b"\n", 1234)
+
+    def test_round_trip(self):
+        log_snapshot.save_snapshot(self.snapshot_path, self.log_path, self.state, self.index.to_snapshot())
+        state, index_data = log_snapshot.load_snapshot(self.snapshot_path, self.log_path)
+        self.assertEqual(state, self.state)
+        loaded = LogIndex()
+        loaded.load_snapshot(index_data)
+        self.assertEqual(loaded.task_totals(), self.index.task_totals())
+        self.assertEqual(loaded.date_task_minutes, self.index.date_task_minutes)
+        self.assertEqual(list(loaded.iter_entries()), list(self.index.iter_entries()))
+
+    def test_pickle_payload_is_not_loaded(self):
+        with open(self.snapshot_path, "wb") as f:
+            f.write(log_snapshot.SNAPSHOT_MAGIC + bytes([log_snapshot.SNAPSHOT_VERSION]))
+            pickle.dump(_Payload(), f)
+        self.assertIsNone(log_snapshot.load_snapshot(self.snapshot_path, self.log_path))
+        self.assertFalse(_Payload.executed)
+
+    def test_damaged_file_is_rejected(self):
+        log_snapshot.save_snapshot(self.snapshot_path, self.log_path, self.state, self.index.to_snapshot())
+        with open(self.snapshot_path, "rb") as f:
+            data = f.read()
+        for damaged in (data[:-1], data + b"\0", data.replace(b'"task_names"', b'"task_nameX"')):
+            with open(self.snapshot_path, "wb") as f:
+                f.write(damaged)
+            self.assertIsNone(log_snapshot.load_snapshot(self.snapshot_path, self.log_path))
+
+    def test_out_of_range_task_id_is_rejected(self):
+        data = self.index.to_snapshot()
+        data["task_names"] = data["task_names"][:1]
+        log_snapshot.save_snapshot(self.snapshot_path, self.log_path, self.state, data)
+        self.assertIsNone(log_snapshot.load_snapshot(self.snapshot_path, self.log_path))
+
+
+class ArchiveCacheTests(unittest.TestCase):
+
+    def test_cached_archives_are_read_back(self):
+        data_folder = make_data_folder(self)
+        with open(os.path.join(data_folder, "time_log.txt.bak202501010000"), "wb") as f:
+            f.write("".join(line + "\n" for line in LINES).encode("utf-8"))
+        archive = LogArchive(data_folder)
+        archive.use_parallel_parse = False
+        totals = archive.get_index().task_totals()
+
+        cache = LogArchive(data_folder)._load_cache()
+        self.assertEqual(list(cache), ["time_log.txt.bak202501010000"])
+        archive.invalidate()
+        archive._parse_files = None  # a second build must come from the cache alone
+        self.assertEqual(archive.get_index().task_totals(), totals)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import datetime
+import unittest
+from src.time_logger import TimeLogger
+from src.log_line_parser import parse_log_line, END_OF_DAY
+from tests.helpers import StubSettings, make_data_folder
+
+
+class LogWorkItemTests(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = StubSettings(make_data_folder(self))
+        self.logger = TimeLogger(self.settings)
+        self.addCleanup(self.logger.close)
+
+    def test_span_until_midnight_keeps_every_minute(self):
+        self.logger.log_work_item("Deploy", datetime.datetime(2025, 3, 3, 23, 45), datetime.datetime(2025, 3, 4, 0, 0))
+        self.assertEqual(self.logger.get_file_total_minutes("Deploy"), 15)
+
+    def test_span_across_midnight_is_split_per_day(self):
+        self.logger.log_work_item("Deploy", datetime.datetime(2025, 3, 3, 23, 30), datetime.datetime(2025, 3, 4, 0, 30))
+        self.assertEqual(self.logger.get_logged_minutes_for_date("2025-03-03"), 30)
+        self.assertEqual(self.logger.get_logged_minutes_for_date("2025-03-04"), 30)
+
+        # The lines read back the same after a restart
+        self.logger.close()
+        logger = TimeLogger(self.settings)
+        self.addCleanup(logger.close)
+        self.assertEqual(logger.get_file_total_minutes("Deploy"), 60)
+
+    def test_end_of_day_is_only_an_end_time(self):
+        self.assertEqual(parse_log_line("2025-03-03 23:45 - 24:00 | Deploy").end, END_OF_DAY)
+        self.assertIsNone(parse_log_line("2025-03-03 24:00 - 24:00 | Deploy"))
+        self.assertIsNone(parse_log_line("2025-03-03 23:45 - 24:01 | Deploy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
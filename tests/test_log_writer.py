@@ -0,0 +1,71 @@
+import os
+import sys
+import subprocess
+import unittest
+from unittest import mock
+from src import log_writer
+from src.log_writer import LogWriter
+from src.time_logger import TimeLogger
+from tests.helpers import StubSettings, make_data_folder
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Appends two lines through a LogWriter that has not fsynced yet, writes the first half of a
+# third line the way a write cut off by a power loss would leave it, then dies without
+# closing anything (no fsync, no atexit handlers).
+CRASHING_WRITER = """
+import os, sys
+from src.log_writer import LogWriter
+writer = LogWriter(sys.argv[1], "interval", fsync_interval_ms=60000)
+writer.append(b"2025-03-03 09:00 - 10:00 | Meeting\\n")
+writer.append(b"2025-03-03 10:00 - 11:00 | Meeting\\n")
+with open(sys.argv[1], "ab") as f:
+    f.write(b"2025-03-03 11:00 - 1")
+os._exit(9)
+"""
+
+
+class LogWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data_folder = make_data_folder(self)
+        self.log_path = os.path.join(self.data_folder, "time_log.txt")
+
+    def test_close_fsyncs_in_every_mode(self):
+        for durability in log_writer.DURABILITY_MODES:
+            writer = LogWriter(self.log_path, durability, fsync_interval_ms=60000)
+            writer.append(b"2025-03-03 09:00 - 10:00 | Meeting\n")
+            with mock.patch.object(log_writer.os, "fsync", wraps=os.fsync) as fsync:
+                writer.append(b"2025-03-03 10:00 - 11:00 | Meeting\n")
+                writer.close()
+            self.assertTrue(fsync.called, durability)
+
+    def test_append_after_a_cut_off_line_starts_a_new_line(self):
+        with open(self.log_path, "wb") as f:
+            f.write(b"2025-03-03 09:00 - 10:00 | Meeting\n2025-03-03 10:00 - 1")
+        writer = LogWriter(self.log_path)
+        writer.append(b"2025-03-03 12:00 - 13:00 | Review\n")
+        writer.close()
+        with open(self.log_path, "rb") as f:
+            self.assertEqual(f.read().splitlines()[-1], b"2025-03-03 12:00 - 13:00 | Review")
+
+    def test_restart_after_a_crash_between_write_and_fsync(self):
+        result = subprocess.run([sys.executable, "-c", CRASHING_WRITER, self.log_path], cwd=REPO_ROOT)
+        self.assertEqual(result.returncode, 9)
+
+        # What was written before the crash is kept; the cut-off line is ignored
+        logger = TimeLogger(StubSettings(self.data_folder))
+        self.assertEqual(logger.get_file_total_minutes("Meeting"), 120)
+
+        # The next entry is not glued onto the cut-off line, and survives a restart
+        logger.import_lines(["2025-03-03 12:00 - 13:00 | Review"])
+        self.assertEqual(logger.get_file_total_minutes("Review"), 60)
+        logger.close()
+        logger = TimeLogger(StubSettings(self.data_folder))
+        self.addCleanup(logger.close)
+        self.assertEqual(logger.get_file_total_minutes("Meeting"), 120)
+        self.assertEqual(logger.get_file_total_minutes("Review"), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import datetime
+import unittest
+from unittest import mock
+from src.popup_scheduler import PopupScheduler, FALLBACK_CRON_EXPR, TICK_MS
+
+D = datetime.datetime
+
+
+class FakeClock:
+    """
+    Wall-clock and monotonic time that only move when a test moves them.
+    """
+
+    def __init__(self, wall):
+        self.wall = wall
+        self.mono = 1000.0
+
+    def now(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def advance(self, seconds):
+        self.wall += datetime.timedelta(seconds=seconds)
+        self.mono += seconds
+
+    def suspend(self, seconds):
+        # The monotonic clock does not count the time the machine was asleep.
+        self.wall += datetime.timedelta(seconds=seconds)
+
+    def set_wall(self, wall):
+        self.wall = wall
+
+
+class FakeRoot:
+    """
+    Records after() callbacks instead of running a Tk loop.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.delays = []
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = callback
+        self.delays.append(delay)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def run_pending(self):
+        callbacks, self.pending = list(self.pending.values()), {}
+        for callback in callbacks:
+            callback()
+
+
+class PopupSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(D(2025, 3, 3, 9, 7))
+        self.root = FakeRoot()
+        self.cron_expr = "*/15 * * * *"
+        self.fired = []
+        self.scheduler = PopupScheduler(
+            self.root, lambda: self.cron_expr, lambda start, end: self.fired.append((start, end)), clock=self.clock
+        )
+        self.scheduler.start()
+
+    def tick_at(self, wall):
+        """
+        Moves the clock forward to wall (both clocks advance) and runs the pending tick.
+        """
+        self.clock.advance((wall - self.clock.wall).total_seconds())
+        self.root.run_pending()
+
+    def test_fires_once_per_passed_fire_time(self):
+        self.assertEqual(self.root.delays, [TICK_MS])
+        self.tick_at(D(2025, 3, 3, 9, 14, 59))
+        self.assertEqual(self.fired, [])
+        self.tick_at(D(2025, 3, 3, 9, 15))
+        self.tick_at(D(2025, 3, 3, 9, 15, 5))
+        self.tick_at(D(2025, 3, 3, 9, 30))
+        self.assertEqual(self.fired, [
+            (D(2025, 3, 3, 9, 0), D(2025, 3, 3, 9, 15)),
+            (D(2025, 3, 3, 9, 15), D(2025, 3, 3, 9, 30)),
+        ])
+        self.assertEqual(len(self.root.pending), 1)
+
+    def test_next_tick_is_due_at_the_next_fire_time(self):
+        self.tick_at(D(2025, 3, 3, 9, 14, 58))
+        self.assertEqual(self.root.delays[-1], 2001)
+
+    def test_stop_cancels_the_pending_tick(self):
+        self.scheduler.stop()
+        self.assertEqual(self.root.pending, {})
+
+    def test_resume_after_suspend_reports_one_range(self):
+        self.clock.suspend(2 * 3600 - 7 * 60 + 30)  # wakes at 11:00:30
+        self.root.run_pending()
+        self.assertEqual(self.fired, [(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 11, 0))])
+        ends = self.scheduler.interval_ends(*self.fired[0])
+        self.assertEqual(len(ends), 8)
+        self.assertEqual((ends[0], ends[-1]), (D(2025, 3, 3, 9, 15), D(2025, 3, 3, 11, 0)))
+
+        self.tick_at(D(2025, 3, 3, 11, 15))
+        self.assertEqual(self.fired[-1], (D(2025, 3, 3, 11, 0), D(2025, 3, 3, 11, 15)))
+
+    def test_resume_after_more_than_the_precomputed_fire_times(self):
+        self.clock.suspend(3 * 24 * 3600)  # wakes on Thursday at 09:07
+        self.root.run_pending()
+        self.assertEqual(self.fired, [(D(2025, 3, 3, 9, 0), D(2025, 3, 6, 9, 0))])
+        self.tick_at(D(2025, 3, 6, 9, 15))
+        self.assertEqual(self.fired[-1], (D(2025, 3, 6, 9, 0), D(2025, 3, 6, 9, 15)))
+
+    def test_only_a_large_backward_drift_resyncs(self):
+        with mock.patch.object(self.scheduler, "_resync", wraps=self.scheduler._resync) as resync:
+            self.clock.set_wall(self.clock.wall - datetime.timedelta(seconds=20))  # an NTP correction
+            self.clock.advance(1)
+            self.scheduler.check()
+            self.assertEqual(resync.call_count, 0)
+            self.clock.suspend(600)  # forward drift: caught up, not resynced
+            self.scheduler.check()
+            self.assertEqual(resync.call_count, 0)
+            self.clock.set_wall(self.clock.wall - datetime.timedelta(seconds=60))
+            self.clock.advance(1)
+            self.scheduler.check()
+            self.assertEqual(resync.call_count, 1)
+        self.assertEqual(self.fired, [(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 9, 15))])
+
+    def test_wall_clock_set_back_does_not_report_twice(self):
+        self.tick_at(D(2025, 3, 3, 9, 20))
+        self.assertEqual(self.fired, [(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 9, 15))])
+        self.clock.set_wall(D(2025, 3, 3, 8, 20))
+        self.clock.advance(1)
+        self.root.run_pending()
+        self.tick_at(D(2025, 3, 3, 8, 30))
+        self.tick_at(D(2025, 3, 3, 9, 15))
+        self.assertEqual(len(self.fired), 1)
+        self.tick_at(D(2025, 3, 3, 9, 30))
+        self.assertEqual(self.fired[-1], (D(2025, 3, 3, 9, 15), D(2025, 3, 3, 9, 30)))
+
+    def test_invalid_cron_falls_back_to_quarter_hours(self):
+        self.cron_expr = "0 9 * * ²"
+        self.tick_at(D(2025, 3, 3, 9, 8))  # the changed expression resyncs
+        self.assertEqual(self.scheduler._cron_expr, FALLBACK_CRON_EXPR)
+        self.tick_at(D(2025, 3, 3, 9, 15))
+        self.assertEqual(self.fired, [(D(2025, 3, 3, 9, 0), D(2025, 3, 3, 9, 15))])
+
+        self.cron_expr = "0 * * * *"
+        self.tick_at(D(2025, 3, 3, 9, 16))
+        self.tick_at(D(2025, 3, 3, 9, 45))
+        self.assertEqual(len(self.fired), 1)
+        self.tick_at(D(2025, 3, 3, 10, 0))
+        self.assertEqual(self.fired[-1], (D(2025, 3, 3, 9, 15), D(2025, 3, 3, 10, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import unittest
+from src.time_logger import TimeLogger
+from src.sqlite_time_logger import SqliteTimeLogger
+from src.partitioned_time_logger import PartitionedTimeLogger
+from src.task_suggestions import TaskSuggestionIndex
+from tests.helpers import StubSettings, make_data_folder
+
+LINES = [
+    "2025-01-06 09:00 - 09:15 | Migration",
+    "2025-02-03 09:00 - 09:15 | Mail",
+    "2025-03-03 09:00 - 09:30 | Meeting",
+    "2025-03-04 09:00 - 09:30 | Meeting",
+]
+
+
+class TaskSuggestionIndexTests(unittest.TestCase):
+
+    def test_seeded_from_totals(self):
+        index = TaskSuggestionIndex.from_totals(
+            {"Meeting": 60, "Mail": 15, "Migration": 180, "Review": 30},
+            {"Meeting": 739314, "Mail": 739285, "Migration": 739257, "Review": 739314}
+        )
+        # Three hours a month and a half ago still beat a quarter hour a month ago
+        self.assertEqual(index.suggest("m"), ["Meeting", "Migration", "Mail"])
+        self.assertEqual(index.suggest(""), ["Meeting", "Migration", "Review", "Mail"])
+        index.add("Migration", 739320)
+        self.assertEqual(index.suggest("mi"), ["Migration"])
+        self.assertEqual(index.suggest("m")[0], "Migration")
+
+
+class TimeLoggerSuggestionTests(unittest.TestCase):
+    logger_class = TimeLogger
+
+    def setUp(self):
+        self.settings = StubSettings(make_data_folder(self))
+        self.logger = self.logger_class(self.settings)
+        self.logger.import_lines(LINES)
+        self.logger.close()
+        self.logger = self.logger_class(self.settings)
+        self.addCleanup(self.logger.close)
+
+    def test_suggestions_rank_recent_tasks_first(self):
+        self.assertEqual(self.logger.suggest_tasks("m"), ["Meeting", "Mail", "Migration"])
+
+    def test_reload_of_an_append_updates_the_seeded_index(self):
+        self.logger.suggest_tasks()
+        suggestions = self.logger._suggestions
+        with open(os.path.join(self.settings.data_folder, self.logger._get_log_path()), "ab") as f:
+            f.write(b"2025-03-05 09:00 - 12:00 | Migration\n")
+        self.assertTrue(self.logger.reload_time_log())
+        self.assertIs(self.logger._suggestions, suggestions)
+        self.assertEqual(self.logger.suggest_tasks("m")[0], "Migration")
+
+    def test_reset_leaves_no_suggestions(self):
+        self.logger.suggest_tasks()
+        self.logger.reset_time_log()
+        self.assertEqual(self.logger.suggest_tasks(), [])
+
+
+class SqliteSuggestionTests(TimeLoggerSuggestionTests):
+    logger_class = SqliteTimeLogger
+
+
+class PartitionedSuggestionTests(unittest.TestCase):
+
+    def test_seeded_without_parsing_segments(self):
+        settings = StubSettings(make_data_folder(self), log_layout="monthly")
+        logger = PartitionedTimeLogger(settings)
+        logger.import_lines(LINES)
+        logger.close()
+
+        logger = PartitionedTimeLogger(settings)
+        self.addCleanup(logger.close)
+        self.assertEqual(logger.suggest_tasks("m"), ["Meeting", "Mail", "Migration"])
+        self.assertEqual(logger._segments, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
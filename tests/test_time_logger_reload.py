@@ -0,0 +1,116 @@
+import os
+import datetime
+import unittest
+from unittest import mock
+from src import time_logger
+from src.time_logger import TimeLogger, CHANGE_APPEND, CHANGE_REWRITE
+from src.sqlite_time_logger import SqliteTimeLogger
+from tests.helpers import StubSettings, make_data_folder
+
+LINES = [
+    "2025-03-03 09:00 - 10:00 | Meeting",
+    "2025-03-03 10:00 - 12:00 | Review",
+    "2025-03-04 09:00 - 11:30 | Review",
+]
+# Enough lines after the edited one that it lies outside the TAIL_CHECK_BYTES before the end
+FILLER_LINES = ["2025-03-04 12:00 - 12:15 | Filler"] * 200
+
+
+class ReloadTests(unittest.TestCase):
+    logger_class = TimeLogger
+
+    def setUp(self):
+        self.data_folder = make_data_folder(self)
+        self.log_path = os.path.join(self.data_folder, "time_log.txt")
+        with open(self.log_path, "w", encoding="utf-8", newline="") as f:
+            f.write("".join(line + "\n" for line in LINES + FILLER_LINES))
+        self.logger = self.logger_class(StubSettings(self.data_folder))
+        self.addCleanup(self.logger.close)
+
+    def rewrite_middle_line(self, old, new):
+        # Same length, same inode, so only the content tells the edit apart
+        self.assertEqual(len(old), len(new))
+        with open(self.log_path, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(old.encode("utf-8")))
+            f.write(new.encode("utf-8"))
+
+    def append(self, line):
+        with open(self.log_path, "ab") as f:
+            f.write((line + "\n").encode("utf-8"))
+
+    def test_append_is_parsed(self):
+        self.append("2025-03-05 09:00 - 09:30 | Meeting")
+        self.assertEqual(self.logger.poll_external_changes(), CHANGE_APPEND)
+        self.assertTrue(self.logger.reload_time_log())
+        self.assertEqual(self.logger.get_file_total_minutes("Meeting"), 90)
+
+    def test_poll_then_reload_reads_the_parsed_part_once(self):
+        self.append("2025-03-05 09:00 - 09:30 | Meeting")
+        with mock.patch.object(time_logger, "_checksum_range", wraps=time_logger._checksum_range) as checksum_range:
+            self.assertEqual(self.logger.poll_external_changes(), CHANGE_APPEND)
+            self.assertTrue(self.logger.reload_time_log())
+        prefix_reads = [c for c in checksum_range.call_args_list if c.args[1] == 0]
+        self.assertEqual(len(prefix_reads), 1)
+        self.assertEqual(self.logger.get_file_total_minutes("Meeting"), 90)
+
+    def test_edit_in_the_middle_then_append_rebuilds(self):
+        self.rewrite_middle_line("10:00 - 12:00 | Review", "10:00 - 11:00 | Review")
+        self.append("2025-03-05 09:00 - 09:30 | Meeting")
+        self.assertEqual(self.logger.poll_external_changes(), CHANGE_REWRITE)
+        self.assertTrue(self.logger.reload_time_log())
+        self.assertEqual(self.logger.get_file_total_minutes("Review"), 210)
+        self.assertEqual(self.logger.get_file_total_minutes("Meeting"), 90)
+
+    def test_own_appends_keep_the_checksum(self):
+        self.logger.import_lines(["2025-03-05 09:00 - 09:30 | Meeting"])
+        self.rewrite_middle_line("10:00 - 12:00 | Review", "10:00 - 11:00 | Review")
+        self.append("2025-03-06 09:00 - 09:30 | Meeting")
+        self.assertTrue(self.logger.reload_time_log())
+        self.assertEqual(self.logger.get_file_total_minutes("Review"), 210)
+        self.assertEqual(self.logger.get_file_total_minutes("Meeting"), 120)
+
+    def test_edit_before_restart_is_not_taken_from_the_snapshot(self):
+        self.logger.close()
+        self.rewrite_middle_line("10:00 - 12:00 | Review", "10:00 - 11:00 | Review")
+        self.append("2025-03-05 09:00 - 09:30 | Meeting")
+        logger = self.logger_class(StubSettings(self.data_folder))
+        self.addCleanup(logger.close)
+        self.assertEqual(logger.get_file_total_minutes("Review"), 210)
+
+
+class SqliteReloadTests(ReloadTests):
+    logger_class = SqliteTimeLogger
+
+    def test_missing_mirror_keeps_the_database(self):
+        os.remove(self.log_path)
+        self.assertFalse(self.logger.reload_time_log())
+        self.assertEqual(self.logger.get_file_total_minutes("Review"), 270)
+        self.logger.close()
+        logger = self.logger_class(StubSettings(self.data_folder))
+        self.addCleanup(logger.close)
+        self.assertEqual(logger.get_file_total_minutes("Review"), 270)
+
+    def test_rewritten_mirror_keeps_entries_added_without_mirroring(self):
+        self.logger.app_settings.sqlite_mirror_text_log = False
+        self.logger.import_lines(["2025-03-05 09:00 - 09:30 | Database only"])
+        self.logger.app_settings.sqlite_mirror_text_log = True
+        self.rewrite_middle_line("10:00 - 12:00 | Review", "10:00 - 11:00 | Review")
+        self.assertTrue(self.logger.reload_time_log())
+        self.assertEqual(self.logger.get_file_total_minutes("Review"), 210)
+        self.assertEqual(self.logger.get_file_total_minutes("Database only"), 30)
+
+    def test_resets_in_the_same_second_keep_both_backups(self):
+        with mock.patch("src.sqlite_time_logger.datetime") as fake_datetime:
+            fake_datetime.datetime.now.return_value = datetime.datetime(2025, 3, 6, 12, 0, 0)
+            self.logger.reset_time_log()
+            self.logger.import_lines(["2025-03-06 09:00 - 09:30 | Meeting"])
+            self.logger.reset_time_log()
+        backups = self.logger._index._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'entries_bak%' ORDER BY name"
+        ).fetchall()
+        self.assertEqual(backups, [("entries_bak20250306120000",), ("entries_bak20250306120000_1",)])
+
+
+if __name__ == "__main__":
+    unittest.main()